@@ -6,6 +6,19 @@
 #              Don't modify the contents of this file.
 
 
+import hashlib
+import itertools
+import pickle
+import struct
+import sys
+
+# NumPy is optional; without it, batch operations hash keys one at a time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
 class DynamicArrayException(Exception):
@@ -19,6 +32,8 @@ class DynamicArray:
     append, pop, swap, get_at_index, set_at_index, length
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
@@ -77,6 +92,10 @@ class DynamicArray:
         """Return length of array."""
         return len(self._data)
 
+    def __sizeof__(self) -> int:
+        """Return the size of the array in bytes, including its underlying list (for sys.getsizeof)."""
+        return object.__sizeof__(self) + sys.getsizeof(self._data)
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -96,18 +115,321 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+_FNV_OFFSET_BASIS = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def hash_function_fnv1a(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the key's UTF-8 bytes.
+    Well distributed and stable across processes, unlike the built-in hash.
+    """
+    hash = _FNV_OFFSET_BASIS
+    for byte in key.encode() if isinstance(key, str) else key:
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK_64
+    return hash
+
+
+def hash_function_builtin(key: str) -> int:
+    """
+    Python's built-in hash, as an unsigned 64-bit integer.
+    The fastest option, but str hashes are randomized per process
+    (see PYTHONHASHSEED), so its values must not be persisted.
+    """
+    return hash(key) & _MASK_64
+
+
+def seeded_hash_function(seed: int) -> callable:
+    """
+    Return a keyed 64-bit hash function (BLAKE2b, computed in C) for the
+    given seed. Like SipHash, a secret seed makes collisions hard to force.
+    """
+    hash_key = seed.to_bytes(16, 'little')
+
+    def hash_function_blake2b(key: str) -> int:
+        """Keyed 64-bit BLAKE2b hash of the key's UTF-8 bytes"""
+        digest = hashlib.blake2b(key.encode() if isinstance(key, str) else key, digest_size=8, key=hash_key)
+        return int.from_bytes(digest.digest(), 'little')
+
+    hash_function_blake2b.seed = seed
+    return hash_function_blake2b
+
+
+hash_function_blake2b = seeded_hash_function(0)
+
+HASH_FUNCTIONS = {
+    function.__name__: function
+    for function in (hash_function_1, hash_function_2, hash_function_fnv1a,
+                     hash_function_builtin, hash_function_blake2b)
+}
+
+
+def mix_hash(hash: int) -> int:
+    """
+    Fibonacci hashing: multiply by 2^64 / golden ratio and fold the high half
+    of the product into the low half. Every input bit then affects the low
+    bits, which are all a power-of-two capacity indexes with. A single
+    multiply keeps it cheap next to the hash function itself.
+    """
+    hash = (hash * 0x9e3779b97f4a7c15) & _MASK_64
+    return hash ^ (hash >> 32)
+
+
+def sizeof_unique(objects, seen: set) -> int:
+    """
+    Return the total sys.getsizeof of the given objects, skipping those whose
+    id is in seen and adding the ids of the rest, so that an object shared by
+    several entries (or reachable twice) is only counted once
+    """
+    total = 0
+    for obj in objects:
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+    return total
+
+
+def hash_function_int(key: int) -> int:
+    """
+    64-bit hash of an integer key, such as a numeric ID: the key's 64-bit
+    two's complement value, mixed with mix_hash. With NumPy installed,
+    hash_function_int.vectorized hashes a whole integer array at once.
+    """
+    return mix_hash(key & _MASK_64)
+
+
+def hash_many(function: callable, keys, mix: bool = False) -> tuple:
+    """
+    Hash every key with the given hash function, then with mix_hash if mix is
+    True. If NumPy is installed, keys is a NumPy array and the function has
+    a vectorized version, all the hashes are computed in one vectorized call.
+    Return the keys as a list of Python objects, and their hashes as a NumPy
+    uint64 array or a list.
+    """
+    if np is not None and isinstance(keys, np.ndarray) and hasattr(function, 'vectorized'):
+        hashes = function.vectorized(keys)
+        return keys.tolist(), mix_hash.vectorized(hashes) if mix else hashes
+
+    keys = as_list(keys)
+    if mix:
+        return keys, [mix_hash(function(key)) for key in keys]
+    return keys, [function(key) for key in keys]
+
+
+def bucket_indices(hashes, capacity: int) -> list:
+    """
+    Return the bucket index (hash modulo capacity) of each hash, in one
+    vectorized call if the hashes are a NumPy array
+    """
+    if np is not None and isinstance(hashes, np.ndarray):
+        return (hashes % np.uint64(capacity)).tolist()
+    return [hash % capacity for hash in hashes]
+
+
+def as_list(values) -> list:
+    """
+    Return the items of an iterable as a list, converting the items of a
+    NumPy array to Python objects
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        return values.tolist()
+    return values if isinstance(values, list) else list(values)
+
+
+if np is not None:
+    def _mix_hash_vectorized(hashes: "np.ndarray") -> "np.ndarray":
+        """mix_hash of every item of a uint64 array; uint64 arithmetic wraps modulo 2^64"""
+        hashes = hashes * np.uint64(0x9e3779b97f4a7c15)
+        return hashes ^ (hashes >> np.uint64(32))
+
+    def _hash_function_int_vectorized(keys: "np.ndarray") -> "np.ndarray":
+        """hash_function_int of every item of an integer array"""
+        if keys.dtype != np.uint64:
+            keys = keys.astype(np.int64, copy=False).view(np.uint64)
+        return _mix_hash_vectorized(keys)
+
+    def _hash_function_fnv1a_vectorized(keys: "np.ndarray") -> "np.ndarray":
+        """hash_function_fnv1a of every item of a str or bytes array, one byte column at a time"""
+        if keys.dtype.kind == 'U':
+            keys = np.char.encode(keys, 'utf-8')
+        lengths = np.char.str_len(keys)
+        columns = keys.view(np.uint8).reshape(len(keys), keys.dtype.itemsize)
+        hashes = np.full(len(keys), _FNV_OFFSET_BASIS, dtype=np.uint64)
+        for i in range(columns.shape[1]):
+            # Keys shorter than the array's item size end in padding, which is not hashed
+            hashed = (hashes ^ columns[:, i]) * np.uint64(_FNV_PRIME)
+            hashes = np.where(i < lengths, hashed, hashes)
+        return hashes
+
+    mix_hash.vectorized = _mix_hash_vectorized
+    hash_function_int.vectorized = _hash_function_int_vectorized
+    hash_function_fnv1a.vectorized = _hash_function_fnv1a_vectorized
+
+
+def next_power_of_two(capacity: int) -> int:
+    """
+    Return the smallest power of two that is at least capacity (and at least 2)
+    """
+    return 1 << max(1, (capacity - 1).bit_length())
+
+
+def is_prime(capacity: int) -> bool:
+    """
+    Determine if given integer is a prime number and return boolean
+    """
+    if capacity == 2 or capacity == 3:
+        return True
+
+    if capacity == 1 or capacity % 2 == 0:
+        return False
+
+    factor = 3
+    while factor ** 2 <= capacity:
+        if capacity % factor == 0:
+            return False
+        factor += 2
+
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    Increment from given number to find the closest prime number
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
+def round_capacity(capacity: int, power_of_two: bool) -> int:
+    """
+    Return the smallest valid capacity of at least capacity for a quadratic
+    probing table: the next prime number, or the next power of two in
+    power-of-two mode
+    """
+    if power_of_two:
+        return next_power_of_two(capacity)
+    if is_prime(capacity):
+        return capacity
+    return next_prime(capacity)
+
+
+def grown_capacity(capacity: int, growth_factor: float) -> int:
+    """
+    Return the capacity a table of the given capacity grows to, always at
+    least one more (before rounding to a valid capacity)
+    """
+    return max(capacity + 1, int(capacity * growth_factor))
+
+
+def full_hash(function: callable, key: str, power_of_two: bool) -> int:
+    """
+    Return the full hash of key as an unsigned 64-bit integer, so that it fits
+    an array('Q') of stored hashes; in power-of-two mode the hash function's
+    value is mixed first
+    """
+    if power_of_two:
+        return mix_hash(function(key))
+    return function(key) & _MASK_64
+
+
+def probe_offset(probe: int, power_of_two: bool) -> int:
+    """
+    Return how far the given probe of a quadratic probe sequence is from its
+    home bucket: squares for prime capacities, and triangular numbers, which
+    visit every bucket, for powers of two
+    """
+    if power_of_two:
+        return probe * (probe + 1) // 2
+    return probe ** 2
+
+
+def probe_limit(capacity: int, power_of_two: bool, probing: str = 'quadratic') -> int:
+    """
+    Return how many probes of a probe sequence reach every bucket it can
+    visit in a table of the given capacity. Only quadratic probing over a
+    prime capacity cannot visit every bucket; it reaches about half of them.
+    """
+    if probing == 'quadratic' and not power_of_two:
+        return capacity // 2 + 1
+    return capacity
+
+
+# Snapshots: magic number and map kind, then pickled parts, each prefixed with its length
+_SNAPSHOT_MAGIC = b'HMSNAP01'
+_SNAPSHOT_LENGTH = struct.Struct('<Q')
+_SNAPSHOT_FINGERPRINT_KEY = 'snapshot fingerprint'
+SNAPSHOT_CHUNK_SIZE = 65536
+
+
+def write_snapshot(path: str, kind: str, function: callable, header: dict, chunks) -> None:
+    """
+    Write a HashMap snapshot to a file: the map kind ('SC' or 'OA'), a header
+    holding the name of the hash function (one of HASH_FUNCTIONS), its value
+    for a fixed key and the given fields, then every chunk of slot records
+    from the chunks iterable. Each part is pickled and written on its own,
+    so only one chunk is held in memory at a time.
+    """
+    name = function.__name__
+    if HASH_FUNCTIONS.get(name) is not function:
+        raise ValueError(f"only maps using a hash function of HASH_FUNCTIONS can be dumped, not {name}")
+    header = {'function': name, 'fingerprint': function(_SNAPSHOT_FINGERPRINT_KEY), **header}
+
+    with open(path, 'wb') as file:
+        file.write(_SNAPSHOT_MAGIC + kind.encode())
+        for part in itertools.chain((header,), chunks):
+            data = pickle.dumps(part, pickle.HIGHEST_PROTOCOL)
+            file.write(_SNAPSHOT_LENGTH.pack(len(data)))
+            file.write(data)
+
+
+def read_snapshot(path: str, kind: str):
+    """
+    Read a HashMap snapshot written by write_snapshot for the given map kind,
+    one part at a time. The first part yielded is the header, with the hash
+    function itself in 'function' and, in 'rehash', whether the stored hashes
+    must be recomputed because the function now hashes differently (as the
+    built-in hash does in another process); each further part is a chunk of
+    slot records. The parts are unpickled, so only read trusted files.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(_SNAPSHOT_MAGIC) + len(kind)) != _SNAPSHOT_MAGIC + kind.encode():
+            raise ValueError(f"file {path!r} does not hold a snapshot of an {kind} HashMap")
+        header = pickle.loads(file.read(_SNAPSHOT_LENGTH.unpack(file.read(_SNAPSHOT_LENGTH.size))[0]))
+        function = HASH_FUNCTIONS[header['function']]
+        header['function'] = function
+        header['rehash'] = function(_SNAPSHOT_FINGERPRINT_KEY) != header.pop('fingerprint')
+        yield header
+
+        while prefix := file.read(_SNAPSHOT_LENGTH.size):
+            yield pickle.loads(file.read(_SNAPSHOT_LENGTH.unpack(prefix)[0]))
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
     """
     Singly Linked List node for use in a hash map
+    Uses __slots__, so nodes carry no per-instance attribute dictionary
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        The full (unreduced) hash of the key may be stored so the node can be
+        rejected quickly during a scan and rehashed without the hash function.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +441,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,9 +465,11 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, remove, pop, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,35 +494,55 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node at front of the list, optionally storing the key's hash."""
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list without allocating a new one."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If a hash is given, nodes with a different stored hash are skipped
+        without comparing keys.
         Return True if removal was successful, False otherwise.
         """
+        return self.pop(key, hash) is not None
+
+    def pop(self, key: str, hash: int = None) -> SLNode:
+        """
+        Remove first node with matching key and return it, or None if no match.
+        If a hash is given, nodes with a different stored hash are skipped
+        without comparing keys.
+        """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
-                return True
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If a hash is given, nodes with a different stored hash are skipped
+        without comparing keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -209,11 +555,22 @@ class LinkedList:
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
+    """
+    Key/value entry for use in an open addressing hash map
+    Uses __slots__, so entries carry no per-instance attribute dictionary
+    """
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        The full (unreduced) hash of the key may be stored so the map can
+        rehash the entry without calling the hash function again.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -0,0 +1,976 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: Benchmarks for the Separate Chaining (SC) and Open Addressing (OA) HashMap implementations. Every
+#              benchmark is a function registered with the @benchmark decorator and can be run from the command line,
+#              e.g. `python benchmarks.py hash_calls --sizes 1000,10000`. Running the script without a benchmark name
+#              lists the available benchmarks.
+
+import argparse
+import asyncio
+import gc
+import itertools
+import multiprocessing
+import os
+import pickle
+import random
+import threading
+import time
+import tracemalloc
+
+import frequency
+import hash_map_async
+import hash_map_compact
+import hash_map_concurrent
+import hash_map_mmap
+import hash_map_oa
+import hash_map_ordered
+import hash_map_sc
+import hash_map_sharded
+import hash_map_shared
+from a6_include import (HASH_FUNCTIONS, DynamicArray, as_list, bucket_indices, hash_function_1, hash_function_2,
+                        hash_function_builtin, hash_function_fnv1a, hash_function_int, hash_many, np, probe_limit,
+                        round_capacity)
+
+BENCHMARKS = {}
+
+
+def benchmark(function: callable) -> callable:
+    """Register a benchmark function under its name without the 'bench_' prefix."""
+    BENCHMARKS[function.__name__.removeprefix('bench_')] = function
+    return function
+
+
+class CountingHash:
+    """Wrap a hash function and count how many times it is called."""
+
+    def __init__(self, function: callable) -> None:
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, key: str) -> int:
+        self.calls += 1
+        return self.function(key)
+
+
+class CountingKey(str):
+    """String key that counts how many times it is compared for equality."""
+
+    compares = 0
+
+    def __eq__(self, other: object) -> bool:
+        CountingKey.compares += 1
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Return the value at the given fraction (0-1) of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def oa_probe_length(m: hash_map_oa.HashMap, key: str) -> int:
+    """Return the number of buckets an OA HashMap examines to find key, or to conclude it is absent."""
+    hash = m._hash(key)
+    buckets, capacity = m._buckets, m._capacity
+    hash_index = hash % capacity
+    probes, bucket = 1, buckets[hash_index]
+    while bucket is not None and probes <= probe_limit(capacity, m._power_of_two, m._probing):
+        if not bucket.is_tombstone and bucket.key == key:
+            break
+        if m._probing == 'robin_hood' and (hash_index - bucket.hash) % capacity < probes - 1:
+            break
+        hash_index = (hash + m._offset(hash, probes, capacity)) % capacity
+        bucket = buckets[hash_index]
+        probes += 1
+    return probes
+
+
+def make_keys(count: int, prefix: str = 'key') -> list[str]:
+    """Return a list of `count` distinct string keys."""
+    return [prefix + str(i) for i in range(count)]
+
+
+# ------------------- BENCHMARKS ------------------------------------------- #
+
+@benchmark
+def bench_hash_calls(sizes: tuple[int, ...] = (1_000, 5_000, 10_000)) -> None:
+    """Hash function calls per put (including the calls made by resizes) for the OA HashMap."""
+    print(f"{'hash':>16} {'n':>9} {'calls/put':>10} {'put calls':>10} {'resize calls':>13} {'seconds':>8}")
+    for function in (hash_function_1, hash_function_2):
+        for n in sizes:
+            keys = make_keys(n)
+            counter = CountingHash(function)
+            m = hash_map_oa.HashMap(11, counter)
+
+            start = time.perf_counter()
+            for key in keys:
+                m.put(key, key)
+            elapsed = time.perf_counter() - start
+            put_calls = counter.calls
+
+            counter.calls = 0
+            m.resize_table(m.get_capacity() * 2)
+            resize_calls = counter.calls
+
+            print(f"{function.__name__:>16} {n:>9} {put_calls / n:>10.2f} {put_calls:>10} {resize_calls:>13} "
+                  f"{elapsed:>8.3f}")
+
+
+@benchmark
+def bench_chain_compares(sizes: tuple[int, ...] = (1_000, 10_000, 50_000)) -> None:
+    """Key comparisons per get and hash calls per resize for the SC HashMap."""
+    print(f"{'hash':>16} {'n':>9} {'compares/get':>13} {'resize calls':>13} {'seconds':>8}")
+    for function in (hash_function_1, hash_function_2, hash):
+        for n in sizes:
+            keys = [CountingKey('long-key-prefix-' + str(i)) for i in range(n)]
+            counter = CountingHash(function)
+            m = hash_map_sc.HashMap(11, counter)
+            for key in keys:
+                m.put(key, key)
+
+            counter.calls = 0
+            m.resize_table(m.get_capacity() * 2)
+            resize_calls = counter.calls
+
+            CountingKey.compares = 0
+            start = time.perf_counter()
+            for key in keys:
+                m.get(key)
+            elapsed = time.perf_counter() - start
+
+            print(f"{function.__name__:>16} {n:>9} {CountingKey.compares / n:>13.2f} {resize_calls:>13} "
+                  f"{elapsed:>8.3f}")
+
+
+@benchmark
+def bench_find_mode(sizes: tuple[int, ...] = (10_000, 50_000, 100_000)) -> None:
+    """Update-heavy counting: find_mode over inputs with 1% distinct values."""
+    print(f"{'n':>9} {'distinct':>9} {'seconds':>8} {'ops/s':>10}")
+    for n in sizes:
+        distinct = max(1, n // 100)
+        da = DynamicArray(['value' + str(i % distinct) for i in range(n)])
+        start = time.perf_counter()
+        hash_map_sc.find_mode(da)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>9} {distinct:>9} {elapsed:>8.3f} {n / elapsed:>10.0f}")
+
+
+@benchmark
+def bench_grow(sizes: tuple[int, ...] = (1_000, 10_000, 100_000)) -> None:
+    """Grow each HashMap from an initial capacity of 11 and report the time spent rehashing inside put."""
+    print(f"{'map':>4} {'n':>9} {'resizes':>8} {'resize s':>9} {'total s':>8}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in sizes:
+            keys = make_keys(n)
+            m = module.HashMap(11, hash)
+
+            # Time every rehash triggered from inside put; a rehash that starts over with a larger array calls
+            # _rehash again, which is timed as part of the outer call
+            rehash, resize_times, rehashing = m._rehash, [], []
+
+            def timed_rehash(new_capacity: int) -> None:
+                if rehashing:
+                    rehash(new_capacity)
+                    return
+                rehashing.append(True)
+                resize_start = time.perf_counter()
+                try:
+                    rehash(new_capacity)
+                finally:
+                    resize_times.append(time.perf_counter() - resize_start)
+                    rehashing.pop()
+            m._rehash = timed_rehash
+
+            start = time.perf_counter()
+            for key in keys:
+                m.put(key, key)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>4} {n:>9} {len(resize_times):>8} {sum(resize_times):>9.3f} {elapsed:>8.3f}")
+
+
+@benchmark
+def bench_put_latency(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Per-put latency percentiles (microseconds) with synchronous vs incremental resizing."""
+    # Garbage collector pauses would otherwise hide the resize pauses being measured
+    gc.disable()
+    print(f"{'map':>4} {'mode':>12} {'n':>9} {'p50':>7} {'p99':>7} {'p999':>8} {'max':>10} {'total s':>8}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in sizes:
+            keys = make_keys(n)
+            for incremental in (False, True):
+                m = module.HashMap(11, hash, incremental_resize=incremental)
+                latencies = []
+                clock = time.perf_counter_ns
+                for key in keys:
+                    start = clock()
+                    m.put(key, key)
+                    latencies.append(clock() - start)
+                total = sum(latencies) / 1e9
+                latencies.sort()
+                print(f"{name:>4} {'incremental' if incremental else 'synchronous':>12} {n:>9} "
+                      f"{percentile(latencies, 0.5) / 1e3:>7.1f} {percentile(latencies, 0.99) / 1e3:>7.1f} "
+                      f"{percentile(latencies, 0.999) / 1e3:>8.1f} {latencies[-1] / 1e3:>10.1f} {total:>8.3f}")
+    gc.enable()
+
+
+@benchmark
+def bench_churn(sizes: tuple[int, ...] = (1_000, 10_000, 50_000)) -> None:
+    """OA probe lengths and tombstones over insert/delete churn cycles at a constant live size."""
+    print(f"{'n':>7} {'cycle':>6} {'capacity':>9} {'tombstones':>11} {'empty':>8} {'hit avg':>8} {'hit max':>8} "
+          f"{'miss avg':>9} {'miss max':>9}")
+    rng = random.Random(261)
+    for n in sizes:
+        m = hash_map_oa.HashMap(11, hash)
+        live = make_keys(n)
+        for key in live:
+            m.put(key, key)
+
+        # Each cycle replaces a quarter of the live keys with keys never seen before
+        next_key = n
+        for cycle in range(1, 21):
+            for _ in range(n // 4):
+                index = rng.randrange(n)
+                m.remove(live[index])
+                live[index] = 'key' + str(next_key)
+                next_key += 1
+                m.put(live[index], next_key)
+
+            if cycle % 5 == 0:
+                sample = rng.sample(live, min(n, 1_000))
+                hits = [oa_probe_length(m, key) for key in sample]
+                misses = [oa_probe_length(m, 'absent' + str(i)) for i in range(len(sample))]
+                print(f"{n:>7} {cycle:>6} {m.get_capacity():>9} {m._tombstones:>11} {m.empty_buckets():>8} "
+                      f"{sum(hits) / len(hits):>8.2f} {max(hits):>8} {sum(misses) / len(misses):>9.2f} "
+                      f"{max(misses):>9}")
+
+
+@benchmark
+def bench_probing(sizes: tuple[int, ...] = (20_000,), loads: tuple[float, ...] = (0.5, 0.6, 0.7, 0.8, 0.9)) -> None:
+    """Probe lengths, throughput and memory of each OA probing strategy at fixed load factors."""
+    print(f"{'probing':>10} {'load':>5} {'hit avg':>8} {'hit max':>8} {'miss avg':>9} {'miss max':>9} "
+          f"{'put/s':>9} {'get/s':>9} {'bytes/entry':>12}")
+    for n in sizes:
+        keys = make_keys(n)
+        absent = make_keys(n, 'absent')
+        for probing in hash_map_oa.PROBING_STRATEGIES:
+            for load in loads:
+                # Size the table so that inserting every key reaches the target load without a resize
+                tracemalloc.start()
+                m = hash_map_oa.HashMap(int(n / load), hash, probing=probing, max_load=0.95)
+                start = time.perf_counter()
+                for key in keys:
+                    m.put(key, key)
+                put_time = time.perf_counter() - start
+                memory = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+
+                start = time.perf_counter()
+                for key in keys:
+                    m.get(key)
+                get_time = time.perf_counter() - start
+
+                hits = [oa_probe_length(m, key) for key in random.Random(n).sample(keys, min(n, 2_000))]
+                misses = [oa_probe_length(m, key) for key in absent[:2_000]]
+                print(f"{probing:>10} {m.table_load():>5.2f} {sum(hits) / len(hits):>8.2f} {max(hits):>8} "
+                      f"{sum(misses) / len(misses):>9.2f} {max(misses):>9} {n / put_time:>9.0f} "
+                      f"{n / get_time:>9.0f} {memory / n:>12.1f}")
+
+
+@benchmark
+def bench_load_factor(sizes: tuple[int, ...] = (50_000,)) -> None:
+    """Memory and throughput at different max load factors, and capacity after removing 90% of the keys."""
+    print(f"{'map':>4} {'max load':>9} {'capacity':>9} {'bytes/entry':>12} {'put/s':>9} {'get/s':>9} "
+          f"{'shrunk to':>10}")
+    configurations = (('SC', hash_map_sc, (0.5, 1.0, 2.0, 4.0)), ('OA', hash_map_oa, (0.25, 0.5, 0.75, 0.9)))
+    for name, module, max_loads in configurations:
+        for n in sizes:
+            keys = make_keys(n)
+            for max_load in max_loads:
+                tracemalloc.start()
+                m = module.HashMap(11, hash, max_load=max_load)
+                start = time.perf_counter()
+                for key in keys:
+                    m.put(key, key)
+                put_time = time.perf_counter() - start
+                memory = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+
+                start = time.perf_counter()
+                for key in keys:
+                    m.get(key)
+                get_time = time.perf_counter() - start
+                capacity = m.get_capacity()
+
+                for key in keys[:n * 9 // 10]:
+                    m.remove(key)
+                print(f"{name:>4} {max_load:>9.2f} {capacity:>9} {memory / n:>12.1f} {n / put_time:>9.0f} "
+                      f"{n / get_time:>9.0f} {m.get_capacity():>10}")
+
+
+@benchmark
+def bench_hash_functions(sizes: tuple[int, ...] = (100_000,)) -> None:
+    """Hashing throughput and bucket distribution of each hash function (SC-style buckets at load 1)."""
+    print(f"{'hash':>22} {'keys':>11} {'hashes/s':>10} {'distinct':>9} {'empty %':>8} {'max chain':>10} "
+          f"{'probes/hit':>11}")
+    for n in sizes:
+        capacity = hash_map_sc.HashMap(n).get_capacity()
+        key_sets = (('sequential', make_keys(n)),
+                    ('anagrams', [''.join(letters) for letters in itertools.islice(
+                        itertools.permutations('abcdefghij'), n)]))
+        for name, function in HASH_FUNCTIONS.items():
+            for key_set, keys in key_sets:
+                start = time.perf_counter()
+                hashes = [function(key) for key in keys]
+                elapsed = time.perf_counter() - start
+
+                counts = [0] * capacity
+                for hash in hashes:
+                    counts[hash % capacity] += 1
+
+                # Average chain position of a key, i.e. the expected cost of a successful lookup; ideal is ~1.5
+                probes = sum(count * (count + 1) / 2 for count in counts) / n
+                print(f"{name:>22} {key_set:>11} {n / elapsed:>10.0f} {len(set(hashes)):>9} "
+                      f"{100 * counts.count(0) / capacity:>8.1f} {max(counts):>10} {probes:>11.2f}")
+
+
+@benchmark
+def bench_power_of_two(sizes: tuple[int, ...] = (10_000, 50_000)) -> None:
+    """Prime vs power-of-two capacities: throughput, time spent choosing capacities, and collision rates."""
+    print(f"{'map':>4} {'hash':>16} {'mode':>6} {'n':>7} {'capacity':>9} {'put/s':>9} {'get/s':>9} "
+          f"{'capacity s':>11} {'collide %':>10} {'probes/hit':>11}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for function in (hash_function_2, hash):
+            for n in sizes:
+                keys = make_keys(n)
+                for power_of_two in (False, True):
+                    m = module.HashMap(11, function, power_of_two=power_of_two)
+
+                    # Time every capacity choice, i.e. the prime search or the power of two rounding, by replacing
+                    # the module's round_capacity while the keys are put
+                    round_times = []
+
+                    def timed_round(capacity: int, power_of_two: bool) -> int:
+                        round_start = time.perf_counter()
+                        capacity = round_capacity(capacity, power_of_two)
+                        round_times.append(time.perf_counter() - round_start)
+                        return capacity
+                    module.round_capacity = timed_round
+
+                    start = time.perf_counter()
+                    try:
+                        for key in keys:
+                            m.put(key, key)
+                    finally:
+                        module.round_capacity = round_capacity
+                    put_time = time.perf_counter() - start
+                    start = time.perf_counter()
+                    for key in keys:
+                        m.get(key)
+                    get_time = time.perf_counter() - start
+
+                    # Share of keys whose home bucket is also the home bucket of another key, and the average
+                    # number of buckets (OA) or chain nodes (SC) examined by a successful lookup
+                    capacity = m.get_capacity()
+                    homes = [0] * capacity
+                    for key in keys:
+                        homes[m._hash(key) % capacity] += 1
+                    collide = sum(count for count in homes if count > 1) / n
+                    if module is hash_map_oa:
+                        probes = sum(oa_probe_length(m, key) for key in keys) / n
+                    else:
+                        probes = sum(count * (count + 1) / 2 for count in homes) / n
+                    print(f"{name:>4} {function.__name__:>16} {'pow2' if power_of_two else 'prime':>6} {n:>7} "
+                          f"{capacity:>9} {n / put_time:>9.0f} {n / get_time:>9.0f} {sum(round_times):>11.5f} "
+                          f"{100 * collide:>10.1f} {probes:>11.2f}")
+
+
+@benchmark
+def bench_memory(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Bytes per entry (traced, and split by memory_usage) and throughput of each HashMap layout."""
+    print(f"{'map':>8} {'n':>9} {'capacity':>9} {'bytes/entry':>12} {'peak/entry':>11} {'buckets':>8} {'nodes':>6} "
+          f"{'put/s':>9} {'get/s':>9}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa), ('compact', hash_map_compact)):
+        for n in sizes:
+            # Keys double as values and are created up front, so only the map's own allocations are traced
+            keys = make_keys(n)
+            gc.collect()
+            tracemalloc.start()
+            m = module.HashMap(11, hash_function_builtin)
+            start = time.perf_counter()
+            for key in keys:
+                m.put(key, key)
+            put_time = time.perf_counter() - start
+            memory, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            for key in keys:
+                m.get(key)
+            get_time = time.perf_counter() - start
+            usage = m.memory_usage()
+            print(f"{name:>8} {n:>9} {m.get_capacity():>9} {memory / n:>12.1f} {peak / n:>11.1f} "
+                  f"{usage['buckets'] / n:>8.1f} {usage['nodes'] / n:>6.1f} {n / put_time:>9.0f} {n / get_time:>9.0f}")
+            del m
+
+
+@benchmark
+def bench_ordered(sizes: tuple[int, ...] = (100_000, 500_000)) -> None:
+    """Memory, lookups and iteration of the OA layouts, full and after removing 90% of the keys (no shrinking)."""
+    print(f"{'map':>8} {'n':>8} {'bytes/entry':>12} {'get/s':>9} {'iterate s':>10} {'sparse bytes':>13} "
+          f"{'sparse iterate s':>17}")
+    for name, module in (('OA', hash_map_oa), ('compact', hash_map_compact), ('ordered', hash_map_ordered)):
+        for n in sizes:
+            keys = make_keys(n)
+            gc.collect()
+            tracemalloc.start()
+            m = module.HashMap(11, hash_function_builtin, shrink_load=0)
+            for key in keys:
+                m.put(key, key)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            for key in keys:
+                m.get(key)
+            get_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            m.get_keys_and_values()
+            iterate_time = time.perf_counter() - start
+
+            # Remove 90% of the keys; the capacity stays the same, as shrinking is disabled. The map's own memory is
+            # then taken from memory_usage.
+            for key in keys[:n * 9 // 10]:
+                m.remove(key)
+            usage = m.memory_usage()
+            sparse_memory = usage['buckets'] + usage['nodes']
+            start = time.perf_counter()
+            m.get_keys_and_values()
+            sparse_time = time.perf_counter() - start
+            print(f"{name:>8} {n:>8} {memory / n:>12.1f} {n / get_time:>9.0f} {iterate_time:>10.4f} "
+                  f"{sparse_memory:>13} {sparse_time:>17.4f}")
+            del m
+
+
+@benchmark
+def bench_bulk(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Loading and reading pairs with put/get loops vs put_many/get_many/remove_many, and the resizes involved."""
+    print(f"{'map':>4} {'n':>9} {'api':>6} {'put/s':>9} {'rehashes':>9} {'get/s':>9} {'remove/s':>9}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in sizes:
+            keys = make_keys(n)
+            items = [(key, key) for key in keys]
+            for bulk in (False, True):
+                m = module.HashMap(11, hash_function_builtin)
+                rehash, rehashes = m._rehash, []
+
+                def counted_rehash(new_capacity: int) -> None:
+                    rehashes.append(new_capacity)
+                    rehash(new_capacity)
+                m._rehash = counted_rehash
+
+                start = time.perf_counter()
+                if bulk:
+                    m.put_many(items)
+                else:
+                    for key, value in items:
+                        m.put(key, value)
+                put_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                # Both collect the values, as get_many returns them
+                if bulk:
+                    m.get_many(keys)
+                else:
+                    DynamicArray([m.get(key) for key in keys])
+                get_time = time.perf_counter() - start
+
+                # Shrinking is left on, so removing every key also measures the resizes on the way down
+                start = time.perf_counter()
+                if bulk:
+                    m.remove_many(keys)
+                else:
+                    for key in keys:
+                        m.remove(key)
+                remove_time = time.perf_counter() - start
+                print(f"{name:>4} {n:>9} {'bulk' if bulk else 'loop':>6} {n / put_time:>9.0f} {len(rehashes):>9} "
+                      f"{n / get_time:>9.0f} {n / remove_time:>9.0f}")
+
+
+@benchmark
+def bench_presize(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Building a map with a put loop from capacity 11, with reserve and a put loop, and with from_items."""
+    print(f"{'map':>4} {'n':>9} {'build':>11} {'rehashes':>9} {'capacity':>9} {'seconds':>8}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in sizes:
+            items = [(key, key) for key in make_keys(n)]
+            for build in ('put', 'reserve', 'from_items'):
+                # Count the rehashes of every map built, including the one from_items creates
+                rehash, rehashes = module.HashMap._rehash, []
+
+                def counted_rehash(self, new_capacity: int) -> None:
+                    rehashes.append(new_capacity)
+                    rehash(self, new_capacity)
+                module.HashMap._rehash = counted_rehash
+
+                start = time.perf_counter()
+                if build == 'from_items':
+                    m = module.HashMap.from_items(items, hash_function_builtin)
+                else:
+                    m = module.HashMap(11, hash_function_builtin)
+                    if build == 'reserve':
+                        m.reserve(n)
+                    for key, value in items:
+                        m.put(key, value)
+                elapsed = time.perf_counter() - start
+                module.HashMap._rehash = rehash
+                print(f"{name:>4} {n:>9} {build:>11} {len(rehashes):>9} {m.get_capacity():>9} {elapsed:>8.3f}")
+
+
+@benchmark
+def bench_numpy(sizes: tuple[int, ...] = (1_000_000, 10_000_000)) -> None:
+    """Scalar vs NumPy-vectorized hashing and bucket indexing of int64 keys, and bulk loads fed by each."""
+    if np is None:
+        print("NumPy is not installed")
+        return
+
+    capacity = 2 ** 24
+    print(f"{'n':>9} {'path':>10} {'hash+index s':>13} {'keys/s':>12}")
+    for n in sizes:
+        keys = np.random.default_rng(0).integers(-2 ** 62, 2 ** 62, n, dtype=np.int64)
+        for path, batch in (('scalar', keys.tolist()), ('vectorized', keys)):
+            start = time.perf_counter()
+            listed, hashes = hash_many(hash_function_int, batch, mix=True)
+            bucket_indices(hashes, capacity)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>9} {path:>10} {elapsed:>13.3f} {n / elapsed:>12,.0f}")
+
+    # Whole-map bulk loads are limited by the per-key Python work of inserting, so only the smaller sizes are run
+    print(f"\n{'map':>4} {'n':>9} {'keys':>8} {'put_many s':>11} {'get_many s':>11}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in (size for size in sizes if size <= 1_000_000):
+            keys = np.random.default_rng(0).integers(-2 ** 62, 2 ** 62, n, dtype=np.int64)
+            values = np.arange(n)
+            for kind, batch in (('list', keys.tolist()), ('ndarray', keys)):
+                m = module.HashMap(11, hash_function_int, power_of_two=True)
+                start = time.perf_counter()
+                m.put_many(batch, values)
+                put_time = time.perf_counter() - start
+                start = time.perf_counter()
+                m.get_many(batch)
+                get_time = time.perf_counter() - start
+                print(f"{name:>4} {n:>9} {kind:>8} {put_time:>11.3f} {get_time:>11.3f}")
+
+
+@benchmark
+def bench_counting(sizes: tuple[int, ...] = (1_000_000, 50_000_000)) -> None:
+    """Finding the mode of n values drawn from 1000 distinct integers: get+put, increment, count_many and NumPy."""
+    print(f"{'n':>9} {'method':>12} {'seconds':>8} {'values/s':>12} {'mode count':>11}")
+    block = 1_000_000
+    for n in sizes:
+        def blocks():
+            """Yield the n values in NumPy blocks (or lists without NumPy), so large inputs are never held at once."""
+            rnd = random.Random(0)
+            for start in range(0, n, block):
+                size = min(block, n - start)
+                if np is not None:
+                    yield np.random.default_rng(start).integers(0, 1000, size)
+                else:
+                    yield [rnd.randrange(1000) for _ in range(size)]
+
+        # The per-value loops (find_mode's original get then put, and increment) only run on the smaller inputs
+        methods = ['count_many'] + (['get+put', 'increment'] if n <= 1_000_000 else []) + (['numpy'] if np else [])
+        for method in methods:
+            if method == 'numpy':
+                data = np.concatenate(list(blocks()))
+            elif method != 'count_many':
+                data = [value for values in blocks() for value in as_list(values)]
+            gc.collect()
+
+            start = time.perf_counter()
+            if method == 'count_many':
+                freq = frequency.find_mode(value for values in blocks() for value in as_list(values))[1]
+            elif method == 'numpy':
+                freq = frequency.find_mode(data)[1]
+            else:
+                counts = hash_map_sc.HashMap(11, hash_function_builtin)
+                for value in data:
+                    if method == 'increment':
+                        counts.increment(value)
+                    else:
+                        count = counts.get(value)
+                        counts.put(value, 1 if count is None else count + 1)
+                freq = max(value for _, value in counts.items())
+            elapsed = time.perf_counter() - start
+            data = None
+            print(f"{n:>9} {method:>12} {elapsed:>8.3f} {n / elapsed:>12,.0f} {freq:>11}")
+
+
+@benchmark
+def bench_streaming(sizes: tuple[int, ...] = (1_000_000, 10_000_000)) -> None:
+    """Summarizing a Zipf-distributed stream: exact counting vs Space-Saving and Count-Min, speed and accuracy."""
+    print(f"{'n':>9} {'summary':>14} {'seconds':>8} {'values/s':>10} {'counters':>9} {'top-10 hit':>10} "
+          f"{'max over':>9}")
+    block = 100_000
+    for n in sizes:
+        def stream():
+            """Yield n Zipf-distributed values, generated one block at a time."""
+            rnd = random.Random(0)
+            for start in range(0, n, block):
+                size = min(block, n - start)
+                if np is not None:
+                    yield from (np.random.default_rng(start).zipf(1.2, size) % 10_000_000).tolist()
+                else:
+                    yield from (int(rnd.paretovariate(0.2)) % 10_000_000 for _ in range(size))
+
+        exact = None
+        for name, summary in (('exact', frequency.ExactCounter()),
+                              ('space_saving', frequency.SpaceSaving(epsilon=0.001)),
+                              ('count_min', frequency.CountMinSketch(epsilon=0.001, delta=0.01))):
+            start = time.perf_counter()
+            summary.update(stream())
+            elapsed = time.perf_counter() - start
+
+            # Compare against the exact counts: how many of the true top 10 are reported, and the largest
+            # overestimate of their counts
+            if exact is None:
+                exact = summary
+                top = exact.top_k(10)
+                top = [top[i] for i in range(top.length())]
+            hits = '-'
+            if name != 'count_min':
+                reported = summary.top_k(10)
+                hits = len({reported[i][0] for i in range(reported.length())} & {value for value, count in top})
+            over = max(summary.count(value) - count for value, count in top)
+            print(f"{n:>9} {name:>14} {elapsed:>8.3f} {n / elapsed:>10,.0f} {summary.size():>9} {hits:>10} "
+                  f"{over:>9}")
+
+
+@benchmark
+def bench_counter(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Counter-style read-modify-write: get then put vs increment, update and setdefault, over 10,000 keys."""
+    print(f"{'map':>4} {'n':>9} {'method':>10} {'seconds':>8} {'ops/s':>11}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in sizes:
+            rnd = random.Random(0)
+            keys = [f"key{rnd.randrange(10_000)}" for _ in range(n)]
+            for method in ('get+put', 'increment', 'update', 'setdefault'):
+                m = module.HashMap(11, hash_function_builtin)
+                gc.collect()
+                start = time.perf_counter()
+                if method == 'get+put':
+                    for key in keys:
+                        count = m.get(key)
+                        m.put(key, 1 if count is None else count + 1)
+                elif method == 'increment':
+                    for key in keys:
+                        m.increment(key)
+                elif method == 'update':
+                    for key in keys:
+                        m.update(key, lambda count: count + 1, 0)
+                else:
+                    # Grouping: collect the positions of each key in a list stored in the map
+                    for position, key in enumerate(keys):
+                        m.setdefault(key, []).append(position)
+                elapsed = time.perf_counter() - start
+                print(f"{name:>4} {n:>9} {method:>10} {elapsed:>8.3f} {n / elapsed:>11,.0f}")
+
+
+@benchmark
+def bench_iteration(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Iterating over every pair: get_keys_and_values vs lazy items(), time and extra peak memory."""
+    print(f"{'map':>4} {'n':>9} {'method':>20} {'seconds':>8} {'peak MiB':>9}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for n in sizes:
+            m = module.HashMap(11, hash_function_builtin)
+            m.put_many((key, key) for key in make_keys(n))
+            for method in ('get_keys_and_values', 'items'):
+                def iterate() -> int:
+                    """Sum the lengths of every key, iterating as the method does."""
+                    total = 0
+                    if method == 'items':
+                        for key, value in m.items():
+                            total += len(key)
+                    else:
+                        pairs = m.get_keys_and_values()
+                        for i in range(pairs.length()):
+                            total += len(pairs[i][0])
+                    return total
+
+                gc.collect()
+                start = time.perf_counter()
+                iterate()
+                elapsed = time.perf_counter() - start
+
+                # Measure the memory allocated while iterating in a second, traced run
+                tracemalloc.start()
+                iterate()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{name:>4} {n:>9} {method:>20} {elapsed:>8.3f} {peak / 2 ** 20:>9.1f}")
+
+
+@benchmark
+def bench_threads(sizes: tuple[int, ...] = (400_000,)) -> None:
+    """Shared-map throughput with 1-32 threads (90% get, 10% increment): one lock vs 16 striped segment locks."""
+    print(f"{'segments':>8} {'ops':>9} {'threads':>7} {'seconds':>8} {'ops/s':>11}")
+    keys = make_keys(100_000)
+    for n in sizes:
+        for segments in (1, 16):
+            for thread_count in (1, 2, 4, 8, 16, 32):
+                m = hash_map_concurrent.HashMap(len(keys), hash_function_builtin, segments=segments)
+                m.put_many((key, 0) for key in keys)
+
+                def work(seed: int) -> None:
+                    """Perform this thread's share of the n operations on random keys."""
+                    rnd = random.Random(seed)
+                    for _ in range(n // thread_count):
+                        key = keys[rnd.randrange(len(keys))]
+                        if rnd.random() < 0.1:
+                            m.increment(key)
+                        else:
+                            m.get(key)
+
+                threads = [threading.Thread(target=work, args=(seed,)) for seed in range(thread_count)]
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+                print(f"{segments:>8} {n:>9} {thread_count:>7} {elapsed:>8.3f} {n / elapsed:>11,.0f}")
+
+
+@benchmark
+def bench_async(sizes: tuple[int, ...] = (1_000_000,)) -> None:
+    """Event-loop stalls while a task puts n keys, yielding every 100: plain maps vs the asyncio HashMap."""
+    # Garbage collector pauses would otherwise hide the resize pauses being measured
+    gc.disable()
+    print(f"{'map':>4} {'resize':>12} {'n':>9} {'seconds':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>8}")
+    for n in sizes:
+        keys = make_keys(n)
+        for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+            for mode in ('synchronous', 'incremental', 'background'):
+
+                async def workload() -> tuple[float, list[float]]:
+                    """Put every key while a monitor task records how long each pass of the event loop takes."""
+                    if mode == 'background':
+                        m = hash_map_async.HashMap(11, hash_function_builtin, map_class=module.HashMap)
+                        put = m.put
+                    else:
+                        plain = module.HashMap(11, hash_function_builtin, incremental_resize=mode == 'incremental')
+
+                        async def put(key: str, value: object) -> None:
+                            plain.put(key, value)
+
+                    stalls = []
+                    done = False
+
+                    async def monitor() -> None:
+                        while not done:
+                            start = time.perf_counter()
+                            await asyncio.sleep(0)
+                            stalls.append(time.perf_counter() - start)
+
+                    monitor_task = asyncio.create_task(monitor())
+                    start = time.perf_counter()
+                    for i, key in enumerate(keys):
+                        await put(key, i)
+                        if i % 100 == 99:
+                            await asyncio.sleep(0)
+                    if mode == 'background':
+                        await m.wait_resized()
+                    elapsed = time.perf_counter() - start
+                    done = True
+                    await monitor_task
+                    return elapsed, stalls
+
+                elapsed, stalls = asyncio.run(workload())
+                stalls.sort()
+                print(f"{name:>4} {mode:>12} {n:>9} {elapsed:>8.3f} {percentile(stalls, 0.5) * 1e3:>7.2f} "
+                      f"{percentile(stalls, 0.99) * 1e3:>7.2f} {stalls[-1] * 1e3:>8.2f}")
+    gc.enable()
+
+
+@benchmark
+def bench_cold_start(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Cold start: rebuilding an OA map by replaying puts vs opening a memory-mapped table and reading from it."""
+    print(f"{'n':>9} {'file MB':>8} {'replay s':>9} {'open ms':>8} {'1k gets ms':>10}")
+    path = 'bench_cold_start.map'
+    for n in sizes:
+        keys = make_keys(n)
+        with hash_map_mmap.HashMap(path, capacity=int(n / 0.75) + 1) as m:
+            for i, key in enumerate(keys):
+                m.put(key, i)
+
+        # What a restart does today: put every pair into a new map
+        start = time.perf_counter()
+        replayed = hash_map_oa.HashMap(11, hash_function_fnv1a)
+        replayed.put_many((key, i) for i, key in enumerate(keys))
+        replay_time = time.perf_counter() - start
+
+        # Opening the file reads only its header; the first lookups page in the slots and heap they touch
+        sample = random.Random(0).sample(keys, 1000)
+        start = time.perf_counter()
+        m = hash_map_mmap.HashMap.open(path, readonly=True)
+        open_time = time.perf_counter() - start
+        for key in sample:
+            m.get(key)
+        get_time = time.perf_counter() - start - open_time
+        m.close()
+        print(f"{n:>9} {os.path.getsize(path) / 2 ** 20:>8.1f} {replay_time:>9.3f} {open_time * 1e3:>8.3f} "
+              f"{get_time * 1e3:>10.2f}")
+    os.remove(path)
+
+
+@benchmark
+def bench_snapshot(sizes: tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Saving and restoring a map: replaying puts vs pickling the map vs dump/load snapshots."""
+    # Collections triggered by the millions of objects loaded would otherwise dominate every method's time
+    gc.disable()
+    print(f"{'map':>4} {'method':>9} {'n':>9} {'save s':>8} {'load s':>8} {'file MB':>8} {'save peak MB':>12}")
+    path = 'bench_snapshot.bin'
+
+    def save_pairs(m, file_path: str) -> None:
+        """Save the pairs of get_keys_and_values, the way maps were persisted before dump."""
+        pairs = m.get_keys_and_values()
+        with open(file_path, 'wb') as file:
+            pickle.dump([pairs[i] for i in range(pairs.length())], file, pickle.HIGHEST_PROTOCOL)
+
+    def load_pairs(module, file_path: str):
+        """Put every saved pair into a new map."""
+        with open(file_path, 'rb') as file:
+            pairs = pickle.load(file)
+        m = module.HashMap(11, hash_function_fnv1a)
+        m.put_many(pairs)
+        return m
+
+    def save_pickle(m, file_path: str) -> None:
+        """Pickle the whole map object."""
+        with open(file_path, 'wb') as file:
+            pickle.dump(m, file, pickle.HIGHEST_PROTOCOL)
+
+    def load_pickle(module, file_path: str):
+        """Unpickle the whole map object."""
+        with open(file_path, 'rb') as file:
+            return pickle.load(file)
+
+    def save_snapshot(m, file_path: str) -> None:
+        """Write a snapshot with dump."""
+        m.dump(file_path)
+
+    def load_snapshot(module, file_path: str):
+        """Load a snapshot written by dump."""
+        return module.HashMap.load(file_path)
+
+    methods = {'replay': (save_pairs, load_pairs), 'pickle': (save_pickle, load_pickle),
+               'snapshot': (save_snapshot, load_snapshot)}
+    for n in sizes:
+        keys = make_keys(n)
+        for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+            m = module.HashMap(11, hash_function_fnv1a)
+            m.put_many((key, i) for i, key in enumerate(keys))
+            for method, (save, load) in methods.items():
+                gc.collect()
+                start = time.perf_counter()
+                save(m, path)
+                save_time = time.perf_counter() - start
+                start = time.perf_counter()
+                loaded = load(module, path)
+                load_time = time.perf_counter() - start
+                assert loaded.get_size() == n
+                del loaded
+
+                # Measure the memory allocated while saving in a second, traced run
+                gc.collect()
+                tracemalloc.start()
+                save(m, path)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{name:>4} {method:>9} {n:>9} {save_time:>8.3f} {load_time:>8.3f} "
+                      f"{os.path.getsize(path) / 2 ** 20:>8.1f} {peak / 2 ** 20:>12.1f}")
+    os.remove(path)
+    gc.enable()
+
+
+def read_shared(name: str, keys: list[str]) -> None:
+    """Attach to a shared-memory HashMap and look up every key; run in a reader process by bench_processes."""
+    hash_map = hash_map_shared.HashMap.attach(name)
+    for key in keys:
+        hash_map.get(key)
+    hash_map.close()
+
+
+@benchmark
+def bench_processes(sizes: tuple[int, ...] = (200_000,)) -> None:
+    """Multi-process maps: sharded put_many/get_many vs one process, and shared-memory reads from 1-4 processes."""
+    print(f"{multiprocessing.cpu_count()} CPUs")
+    print(f"{'map':>18} {'n':>9} {'workers':>7} {'put s':>8} {'get s':>8} {'gets/s':>11}")
+    for n in sizes:
+        keys = make_keys(n)
+        items = [(key, i) for i, key in enumerate(keys)]
+
+        # One process, then the same batches spread over shard processes
+        m = hash_map_oa.HashMap(11, hash_function_fnv1a)
+        start = time.perf_counter()
+        m.put_many(items)
+        put_time = time.perf_counter() - start
+        start = time.perf_counter()
+        m.get_many(keys)
+        get_time = time.perf_counter() - start
+        print(f"{'single process':>18} {n:>9} {1:>7} {put_time:>8.3f} {get_time:>8.3f} {n / get_time:>11,.0f}")
+
+        for shards in (1, 2, 4):
+            with hash_map_sharded.HashMap(11, hash_function_fnv1a, shards=shards) as m:
+                start = time.perf_counter()
+                m.put_many(items)
+                put_time = time.perf_counter() - start
+                start = time.perf_counter()
+                m.get_many(keys)
+                get_time = time.perf_counter() - start
+            print(f"{'sharded':>18} {n:>9} {shards:>7} {put_time:>8.3f} {get_time:>8.3f} {n / get_time:>11,.0f}")
+
+        # A shared-memory table, read in this process and then by reader processes each looking up a share of
+        # the keys, without any IPC
+        with hash_map_shared.HashMap(int(n / 0.75) + 1, key_size=16) as m:
+            start = time.perf_counter()
+            for key, value in items:
+                m.put(key, value)
+            put_time = time.perf_counter() - start
+            start = time.perf_counter()
+            read_shared(m.get_name(), keys)
+            get_time = time.perf_counter() - start
+            print(f"{'shared memory':>18} {n:>9} {'-':>7} {put_time:>8.3f} {get_time:>8.3f} {n / get_time:>11,.0f}")
+
+            for readers in (1, 2, 4):
+                processes = [multiprocessing.Process(target=read_shared, args=(m.get_name(), keys[i::readers]))
+                             for i in range(readers)]
+                start = time.perf_counter()
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                get_time = time.perf_counter() - start
+                print(f"{'shared memory':>18} {n:>9} {readers:>7} {'':>8} {get_time:>8.3f} {n / get_time:>11,.0f}")
+
+
+# ------------------- COMMAND LINE ----------------------------------------- #
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run HashMap benchmarks.")
+    parser.add_argument('names', nargs='*', help="benchmarks to run (default: list available benchmarks)")
+    parser.add_argument('--sizes', help="comma separated input sizes, e.g. 1000,10000")
+    arguments = parser.parse_args()
+
+    if not arguments.names:
+        for name, function in BENCHMARKS.items():
+            print(f"{name:<24} {function.__doc__}")
+
+    for name in arguments.names:
+        print(f"\n{name}: {BENCHMARKS[name].__doc__}")
+        if arguments.sizes:
+            BENCHMARKS[name](sizes=tuple(int(size) for size in arguments.sizes.split(',')))
+        else:
+            BENCHMARKS[name]()
@@ -0,0 +1,412 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: A frequency counting engine built on the Separate Chaining HashMap. It counts the values of a
+#              DynamicArray, any other iterable or a NumPy array, and reports the mode value(s), the k most frequent
+#              values, or the full histogram of counts. Values are counted in chunks: every chunk is hashed in a
+#              single pass and each count is incremented in place, so no value is looked up twice.
+#              If NumPy is installed, integer and boolean NumPy arrays are counted by NumPy itself instead: with
+#              np.bincount when the values span a range no wider than twice their number, otherwise with np.unique.
+#              Streams too large to count exactly in memory can be summarized chunk by chunk instead: ExactCounter
+#              keeps an exact count per distinct value, SpaceSaving keeps a bounded number of counters for the most
+#              frequent values, and CountMinSketch estimates the count of any value in a fixed-size table. Both
+#              approximate summaries take an error bound epsilon: their counts overestimate by at most epsilon times
+#              the number of values counted (for CountMinSketch, with probability at least 1 - delta).
+
+import heapq
+import itertools
+import math
+
+from a6_include import DynamicArray, as_list, hash_function_builtin, mix_hash, np
+from hash_map_sc import HashMap
+
+# Number of values hashed at a time when counting with the HashMap
+CHUNK_SIZE = 65536
+
+
+def histogram(values, function: callable = hash_function_builtin) -> HashMap:
+    """This function counts the occurrences of every distinct value of the given values.
+
+    Args:
+        values (DynamicArray | iterable): values to be counted, such as a DynamicArray, a list or a NumPy array.
+        function (callable): hash function of the returned HashMap.
+
+    Returns:
+        HashMap: a map from each distinct value to the number of times it occurs.
+    """
+    if _is_numeric_array(values):
+        distinct, counts = _numpy_counts(values)
+        hash_map = HashMap(11, function)
+        hash_map.put_many(distinct, counts)
+        return hash_map
+    return _count(values, function)
+
+
+def find_mode(values, function: callable = hash_function_builtin) -> tuple[DynamicArray, int]:
+    """This function returns the mode (most frequently occurring) value(s) of the given values, and their
+    frequency. Unlike hash_map_sc.find_mode, which returns the modes in the order they reached the mode
+    frequency, the modes are in no particular order (in ascending order for NumPy arrays).
+
+    Args:
+        values (DynamicArray | iterable): values to be evaluated for mode.
+        function (callable): hash function used to count the values.
+
+    Returns:
+        tuple[DynamicArray, int]: The mode(s) and the frequency of their occurrence.
+    """
+    if _is_numeric_array(values):
+        distinct, counts = _numpy_counts(values)
+        if counts.size == 0:
+            return DynamicArray(), 0
+        freq = counts.max()
+        return DynamicArray(distinct[counts == freq].tolist()), int(freq)
+
+    return _modes(_count(values, function))
+
+
+def top_k(values, k: int, function: callable = hash_function_builtin) -> DynamicArray:
+    """This function returns the k most frequent values of the given values, with their counts, most frequent
+    first. Values with equal counts are in no particular order (in ascending order for NumPy arrays).
+
+    Args:
+        values (DynamicArray | iterable): values to be counted.
+        k (int): number of values to return; fewer are returned if there are fewer distinct values.
+        function (callable): hash function used to count the values.
+
+    Returns:
+        DynamicArray: (value, count) tuples of the k most frequent values.
+    """
+    if k <= 0:
+        return DynamicArray()
+    if _is_numeric_array(values):
+        distinct, counts = _numpy_counts(values)
+        order = np.argsort(-counts, kind='stable')[:k]
+        return DynamicArray(list(zip(distinct[order].tolist(), counts[order].tolist())))
+
+    return _largest(_count(values, function), k)
+
+
+class ExactCounter:
+    """
+    Streaming counter that keeps an exact count of every distinct value seen
+    Memory grows with the number of distinct values, not the length of the stream
+    """
+
+    def __init__(self, function: callable = hash_function_builtin) -> None:
+        """Initialize an empty counter whose HashMap uses the given hash function."""
+        self._counts = HashMap(11, function)
+        self._total = 0
+
+    def update(self, values) -> None:
+        """This method counts the given values, consuming an iterable, generator or NumPy array chunk by chunk.
+
+        Args:
+            values (DynamicArray | iterable): values to be counted.
+        """
+        for chunk in _chunks(values):
+            self._counts.count_many(chunk)
+            self._total += len(chunk)
+
+    def total(self) -> int:
+        """This method returns the number of values counted so far."""
+        return self._total
+
+    def size(self) -> int:
+        """This method returns the number of counters held: one per distinct value counted."""
+        return self._counts.get_size()
+
+    def count(self, value: object) -> int:
+        """This method returns the number of times the given value has been counted."""
+        count = self._counts.get(value)
+        return 0 if count is None else count
+
+    def find_mode(self) -> tuple[DynamicArray, int]:
+        """This method returns the mode(s) of the values counted so far, in no particular order, and their
+        frequency."""
+        return _modes(self._counts)
+
+    def top_k(self, k: int) -> DynamicArray:
+        """This method returns (value, count) tuples of the k most frequent values counted so far, most frequent
+        first."""
+        return _largest(self._counts, k)
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent values of a stream
+    Keeps at most capacity counters. A value that is not monitored takes over
+    the counter of the least frequent monitored value, inheriting its count
+    (recorded as that counter's error), so counts never underestimate, and
+    overestimate by at most total / capacity. Every value occurring more than
+    total / capacity times is therefore monitored, as with Misra-Gries.
+    """
+
+    def __init__(self, capacity: int = None, epsilon: float = None,
+                 function: callable = hash_function_builtin) -> None:
+        """
+        Initialize an empty summary with the given number of counters, or with
+        enough counters (1 / epsilon) that counts overestimate by at most
+        epsilon times the number of values counted
+        """
+        if capacity is None:
+            if epsilon is None or not 0 < epsilon < 1:
+                raise ValueError(f"epsilon must be between 0 and 1, not {epsilon}")
+            capacity = math.ceil(1 / epsilon)
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, not {capacity}")
+        self._capacity = capacity
+        self._function = function
+
+        # Each monitored value maps to a [count, error] list, updated in place. The heap holds one
+        # (count, sequence number, value) entry per monitored value, whose count may be stale (lower than the
+        # value's current count); stale entries are refreshed when they reach the top of the heap.
+        self._counters = HashMap(11, function)
+        self._counters.reserve(capacity)
+        self._heap = []
+        self._sequence = 0
+        self._total = 0
+
+    def update(self, values) -> None:
+        """This method counts the given values, consuming an iterable, generator or NumPy array chunk by chunk.
+
+        Args:
+            values (DynamicArray | iterable): values to be counted.
+        """
+        counters, heap = self._counters, self._heap
+        for chunk in _chunks(values):
+            self._total += len(chunk)
+            for value in as_list(chunk):
+                counter = counters.get(value)
+                if counter is not None:
+                    counter[0] += 1
+                    continue
+
+                # Monitor a new value in a free counter, or in place of the value with the lowest count
+                self._sequence += 1
+                if counters.get_size() < self._capacity:
+                    counter = [1, 0]
+                else:
+                    evicted, count = self._pop_minimum()
+                    counters.remove(evicted)
+                    counter = [count + 1, count]
+                counters.put(value, counter)
+                heapq.heappush(heap, (counter[0], self._sequence, value))
+
+    def _pop_minimum(self) -> tuple:
+        """This private method pops the monitored value with the lowest count off the heap, and returns the value
+        and its count."""
+        heap, counters = self._heap, self._counters
+        while True:
+            count, sequence, value = heapq.heappop(heap)
+            current = counters.get(value)[0]
+            if current == count:
+                return value, count
+
+            # Stale entry: the value has been counted since it was pushed
+            heapq.heappush(heap, (current, sequence, value))
+
+    def total(self) -> int:
+        """This method returns the number of values counted so far."""
+        return self._total
+
+    def size(self) -> int:
+        """This method returns the number of counters in use, at most capacity."""
+        return self._counters.get_size()
+
+    def count(self, value: object) -> int:
+        """This method returns an upper bound on the number of times the given value has been counted: its
+        counter's count if it is monitored, otherwise 0 (its true count is then at most total / capacity)."""
+        counter = self._counters.get(value)
+        return 0 if counter is None else counter[0]
+
+    def error(self, value: object) -> int:
+        """This method returns by how much the count of the given monitored value may overestimate its true
+        count, or 0 if it is not monitored."""
+        counter = self._counters.get(value)
+        return 0 if counter is None else counter[1]
+
+    def find_mode(self) -> tuple[DynamicArray, int]:
+        """This method returns the monitored value(s) with the highest count, in no particular order, and that
+        count, which overestimates their true frequency by at most total / capacity."""
+        return _modes(self._count_map())
+
+    def top_k(self, k: int) -> DynamicArray:
+        """This method returns (value, count) tuples of the k monitored values with the highest counts, highest
+        first."""
+        return _largest(self._count_map(), k)
+
+    def _count_map(self) -> HashMap:
+        """This private method returns a map from each monitored value to its count."""
+        counts = HashMap(11, self._function)
+        counts.put_many((value, counter[0]) for value, counter in self._counters.items())
+        return counts
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: estimates how many times any value has been counted
+    using a fixed table of depth rows of width counters, whatever the number
+    of distinct values. Each row adds the value's count to one counter, chosen
+    by a different hash of the value, and a value's estimate is the smallest
+    of its counters. Estimates never underestimate, and with probability at
+    least 1 - delta overestimate by at most epsilon times the total count.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01,
+                 function: callable = hash_function_builtin) -> None:
+        """
+        Initialize an empty sketch of width e / epsilon and depth ln(1 / delta),
+        hashing values with the given hash function
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError(f"epsilon must be between 0 and 1, not {epsilon}")
+        if not 0 < delta < 1:
+            raise ValueError(f"delta must be between 0 and 1, not {delta}")
+        self._width = math.ceil(math.e / epsilon)
+        self._depth = math.ceil(math.log(1 / delta))
+        self._rows = [[0] * self._width for _ in range(self._depth)]
+        self._function = function
+        self._total = 0
+
+    def _columns(self, value: object) -> list:
+        """This private method returns the counter index of the given value in every row. The rows' hashes are
+        derived from the two halves of one mixed 64-bit hash (h1 + row * h2), so the value is hashed only once."""
+        hash = mix_hash(self._function(value))
+        low, high = hash & 0xFFFFFFFF, (hash >> 32) | 1
+        width = self._width
+        return [(low + row * high) % width for row in range(self._depth)]
+
+    def add(self, value: object, count: int = 1) -> None:
+        """This method adds count occurrences of the given value to the sketch."""
+        for row, column in zip(self._rows, self._columns(value)):
+            row[column] += count
+        self._total += count
+
+    def update(self, values) -> None:
+        """This method counts the given values, consuming an iterable, generator or NumPy array chunk by chunk.
+
+        Args:
+            values (DynamicArray | iterable): values to be counted.
+        """
+        add = self.add
+        for chunk in _chunks(values):
+            for value in as_list(chunk):
+                add(value)
+
+    def total(self) -> int:
+        """This method returns the number of values counted so far."""
+        return self._total
+
+    def count(self, value: object) -> int:
+        """This method returns the estimated number of times the given value has been counted, an upper bound on
+        its true count."""
+        return min(row[column] for row, column in zip(self._rows, self._columns(value)))
+
+    def size(self) -> int:
+        """This method returns the number of counters in the sketch (width * depth)."""
+        return self._width * self._depth
+
+
+def _count(values, function: callable) -> HashMap:
+    """This private function counts the given values with a HashMap, one chunk of CHUNK_SIZE values at a time.
+
+    Args:
+        values (DynamicArray | iterable): values to be counted.
+        function (callable): hash function of the returned HashMap.
+
+    Returns:
+        HashMap: a map from each distinct value to the number of times it occurs.
+    """
+    counts = HashMap(11, function)
+    for chunk in _chunks(values):
+        counts.count_many(chunk)
+    return counts
+
+
+def _chunks(values):
+    """This private function yields the given values in chunks of at most CHUNK_SIZE values: lists, or slices of
+    a NumPy array, which a HashMap hashes in one vectorized call when its hash function allows it.
+
+    Args:
+        values (DynamicArray | iterable): values to be split into chunks.
+
+    Yields:
+        list | np.ndarray: the next chunk of values.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        values = values.ravel()
+        for start in range(0, values.size, CHUNK_SIZE):
+            yield values[start:start + CHUNK_SIZE]
+        return
+
+    # DynamicArray disables iteration, so read it by index
+    if isinstance(values, DynamicArray):
+        values = map(values.get_at_index, range(values.length()))
+    values = iter(values)
+    while chunk := list(itertools.islice(values, CHUNK_SIZE)):
+        yield chunk
+
+
+def _modes(counts: HashMap) -> tuple[DynamicArray, int]:
+    """This private function returns the keys with the highest value in a map of counts, and that value.
+
+    Args:
+        counts (HashMap): map from each value to its count.
+
+    Returns:
+        tuple[DynamicArray, int]: The mode(s) and the frequency of their occurrence.
+    """
+    # Collect the values with the highest count in one pass over the counts
+    freq = 0
+    modes = []
+    for key, count in counts.items():
+        if count > freq:
+            freq = count
+            modes = [key]
+        elif count == freq:
+            modes.append(key)
+    return DynamicArray(modes), freq
+
+
+def _largest(counts: HashMap, k: int) -> DynamicArray:
+    """This private function returns the k keys with the highest values in a map of counts, highest first.
+
+    Args:
+        counts (HashMap): map from each value to its count.
+        k (int): number of keys to return.
+
+    Returns:
+        DynamicArray: (value, count) tuples of the k most frequent values.
+    """
+    # Select the k largest counts with a heap, rather than sorting every distinct value
+    return DynamicArray(heapq.nlargest(k, counts.items(), key=lambda pair: pair[1]))
+
+
+def _is_numeric_array(values) -> bool:
+    """This private function returns True if the given values are an integer or boolean NumPy array."""
+    return np is not None and isinstance(values, np.ndarray) and values.dtype.kind in 'biu'
+
+
+def _numpy_counts(values: "np.ndarray") -> tuple:
+    """This private function counts the distinct values of an integer or boolean NumPy array.
+
+    Args:
+        values (np.ndarray): values to be counted.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the distinct values, in ascending order, and the count of each.
+    """
+    values = values.ravel()
+    if values.dtype.kind in 'iu' and values.size:
+        low, high = values.min(), values.max()
+
+        # Count a dense range of integers in linear time with bincount, indexed by offset from the minimum.
+        # Signed values are widened first so the offsets cannot overflow; unsigned offsets never do.
+        if int(high) - int(low) < 2 * values.size:
+            offsets = values.astype(np.int64) - np.int64(low) if values.dtype.kind == 'i' else values - low
+            counts = np.bincount(offsets.astype(np.intp))
+            present = np.flatnonzero(counts)
+
+            # Adding the offsets back wraps around in the narrow type, but every distinct value fits in it
+            return present.astype(values.dtype) + low, counts[present]
+
+    return np.unique(values, return_counts=True)
@@ -0,0 +1,216 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: This program is an asyncio-friendly HashMap for use inside an event loop. It wraps a Separate Chaining
+#              (or Open Addressing) HashMap created in incremental resize mode, so that a put which grows the table
+#              only installs the new bucket array instead of rehashing every key while the loop waits. The old and
+#              new bucket arrays coexist and every operation keeps working on both: keys not migrated yet are read
+#              from the old array. The rest of the migration runs as a background task that moves a bounded chunk of
+#              old buckets at a time and yields to the event loop between chunks, so no single step stalls the loop
+#              for longer than one chunk takes.
+#              put, get, remove and the other operations are coroutines. Each single-key operation runs to
+#              completion without yielding, so it is atomic with respect to other tasks; put_many, get_many and
+#              remove_many yield to the event loop between chunks of keys. The map must be used from a single event
+#              loop; await wait_resized(), or use the map as an async context manager, before the loop ends so that
+#              no migration task is left pending.
+
+import asyncio
+
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_1
+
+
+class HashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1, rehash_chunk: int = 1024,
+                 map_class: type = hash_map_sc.HashMap, **options) -> None:
+        """
+        Initialize new asyncio HashMap around a map_class HashMap
+        (hash_map_sc.HashMap by default, or hash_map_oa.HashMap) created in
+        incremental resize mode with the capacity, hash function and any other
+        options, such as max_load or power_of_two. The background task that
+        completes a resize migrates rehash_chunk old buckets per step.
+        """
+        if rehash_chunk < 1:
+            raise ValueError(f"rehash_chunk must be at least 1, not {rehash_chunk}")
+        self._map = map_class(capacity, function, incremental_resize=True, **options)
+        self._rehash_chunk = rehash_chunk
+        self._migration = None
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self._map)
+
+    async def __aenter__(self) -> "HashMap":
+        """Return the map, for use as an async context manager that waits for any resize on exit."""
+        return self
+
+    async def __aexit__(self, *exception) -> None:
+        """Wait for any resize in progress at the end of an async with block."""
+        await self.wait_resized()
+
+    def _schedule_migration(self) -> None:
+        """This private method starts the background migration task if the last operation began a resize and no
+        task is already running."""
+        if self._map.migrate(0) and (self._migration is None or self._migration.done()):
+            self._migration = asyncio.get_running_loop().create_task(self._migrate())
+
+    async def _migrate(self) -> None:
+        """This private method completes a resize one chunk of old buckets at a time, yielding to the event loop
+        after every chunk. Operations running in between also migrate a few buckets each, and may begin the next
+        resize, which this task then carries on with."""
+        while self._map.migrate(self._rehash_chunk):
+            await asyncio.sleep(0)
+
+    async def wait_resized(self) -> None:
+        """This method waits until no resize is in progress."""
+        while self._migration is not None and not self._migration.done():
+            await self._migration
+        self._migration = None
+
+    def get_size(self) -> int:
+        """This method returns the number of key/value pairs in the hash map."""
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """This method returns the capacity of the hash map's current bucket array."""
+        return self._map.get_capacity()
+
+    def table_load(self) -> float:
+        """This method returns the load of the hash map's current bucket array."""
+        return self._map.table_load()
+
+    # ------------------------------------------------------------------ #
+
+    async def put(self, key: str, value: object) -> None:
+        """This method updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value is replaced with the new value. Otherwise, a new key/value
+        pair is added, and a resize it begins is completed in the background.
+
+        Args:
+            key (str): key to be added or updated in the hash map
+            value (object): value to be stored in the hash map
+        """
+        self._map.put(key, value)
+        self._schedule_migration()
+
+    async def get(self, key: str) -> object:
+        """This method returns the value associated with the given key, or None if the key is not in the
+        hash map.
+
+        Args:
+            key (str): key of the value to be retrieved
+
+        Returns:
+            object: the value associated with the given key, or None
+        """
+        return self._map.get(key)
+
+    async def contains_key(self, key: str) -> bool:
+        """This method returns True if the given key is in the hash map, otherwise False.
+
+        Args:
+            key (str): key to be searched for
+
+        Returns:
+            bool: True if the key is present in the hash map, otherwise False
+        """
+        return self._map.contains_key(key)
+
+    async def remove(self, key: str) -> None:
+        """This method removes the given key and its associated value from the hash map. If the key is not
+        in the hash map, the method does nothing. A shrink it begins is completed in the background.
+
+        Args:
+            key (str): key to be removed from the hash map
+        """
+        self._map.remove(key)
+        self._schedule_migration()
+
+    async def increment(self, key: str, delta: object = 1) -> object:
+        """This method adds delta to the value associated with the given key, adding the key with delta as its
+        value if it is not in the hash map.
+
+        Args:
+            key (str): key whose value is to be incremented
+            delta (object): amount to add to the key's value
+
+        Returns:
+            object: the key's new value
+        """
+        value = self._map.increment(key, delta)
+        self._schedule_migration()
+        return value
+
+    async def pop(self, key: str, default: object = None) -> object:
+        """This method removes the given key from the hash map and returns its value, or returns the default if
+        the key is not in the hash map.
+
+        Args:
+            key (str): key to be removed from the hash map
+            default (object): value to return if the key is not in the hash map
+
+        Returns:
+            object: the key's value, or default
+        """
+        value = self._map.pop(key, default)
+        self._schedule_migration()
+        return value
+
+    async def put_many(self, items, chunk: int = 1024) -> None:
+        """This method puts every key/value pair of the given iterable into the hash map, as put would, yielding
+        to the event loop after every chunk of pairs.
+
+        Args:
+            items (iterable): (key, value) pairs to be added or updated in the hash map
+            chunk (int): number of pairs to put between yields
+        """
+        batch = []
+        for pair in items:
+            batch.append(pair)
+            if len(batch) == chunk:
+                self._map.put_many(batch)
+                self._schedule_migration()
+                batch = []
+                await asyncio.sleep(0)
+        if batch:
+            self._map.put_many(batch)
+            self._schedule_migration()
+
+    async def get_many(self, keys, chunk: int = 1024) -> DynamicArray:
+        """This method returns the values associated with each key of the given iterable, as get would, yielding
+        to the event loop after every chunk of keys.
+
+        Args:
+            keys (iterable): keys of the values to be retrieved
+            chunk (int): number of keys to look up between yields
+
+        Returns:
+            DynamicArray: the value associated with each key, in order, or None for keys not in the hash map
+        """
+        keys = list(keys)
+        return_array = DynamicArray()
+        for start in range(0, len(keys), chunk):
+            if start:
+                await asyncio.sleep(0)
+            found = self._map.get_many(keys[start:start + chunk])
+            for i in range(found.length()):
+                return_array.append(found[i])
+        return return_array
+
+    async def remove_many(self, keys, chunk: int = 1024) -> None:
+        """This method removes every key of the given iterable from the hash map, as remove would, yielding to the
+        event loop after every chunk of keys.
+
+        Args:
+            keys (iterable): keys to be removed from the hash map
+            chunk (int): number of keys to remove between yields
+        """
+        keys = list(keys)
+        for start in range(0, len(keys), chunk):
+            if start:
+                await asyncio.sleep(0)
+            self._map.remove_many(keys[start:start + chunk])
+            self._schedule_migration()
+
+    async def clear(self) -> None:
+        """This method clears the contents of the hash map, abandoning any resize in progress."""
+        self._map.clear()
@@ -0,0 +1,394 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: This program is an Open Addressing HashMap with compact, array-backed storage. Instead of a dynamic
+#              array of HashEntry objects, the table is kept in parallel arrays: the full hash of each bucket's key in
+#              an array of unsigned 64-bit integers, the keys and values in two lists, and the state of each bucket
+#              (empty, live or tombstone) in a bytearray. No object is allocated per entry, so an entry costs a few
+#              machine words instead of a HashEntry instance.
+#              The HashMap offers the same methods as the HashEntry-based Open Addressing HashMap: putting and
+#              removing a key/value pair, getting the value of a known key, determining the table load and the
+#              amount of empty buckets, resizing and clearing the HashMap, and obtaining an array of all key/value
+#              pairs. It uses quadratic probing, counts tombstones and clears them with a rehash, reuses tombstoned
+#              buckets on put, and supports the same load, growth, shrink and power-of-two options.
+
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, full_hash, grown_capacity, hash_function_1, hash_function_2,
+                        next_power_of_two, next_prime, probe_limit, probe_offset, round_capacity, sizeof_unique)
+
+# Bucket states, stored one byte per bucket
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, tombstone_threshold: float = 0.25, max_load: float = 0.5,
+                 growth_factor: float = 2.0, shrink_load: float = None, power_of_two: bool = False) -> None:
+        """
+        Initialize new HashMap that uses open addressing with quadratic
+        probing (triangular probing in power-of-two mode) over parallel
+        hash, key, value and state arrays.
+        The table grows by growth_factor once its load reaches max_load, and
+        shrinks when a removal leaves its load below shrink_load (by default
+        max_load / 8; 0 disables shrinking).
+        Once tombstones fill tombstone_threshold of the buckets, the table is
+        rehashed at its current capacity to clear them.
+        If power_of_two is True, capacities are powers of two instead of primes
+        and every hash is mixed before use.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError(f"max_load must be between 0 and 1, not {max_load}")
+        if growth_factor <= 1:
+            raise ValueError(f"growth_factor must be greater than 1, not {growth_factor}")
+        self._max_load = max_load
+        self._growth_factor = growth_factor
+        self._shrink_load = max_load / 8 if shrink_load is None else shrink_load
+        self._power_of_two = power_of_two
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+        self._tombstone_threshold = tombstone_threshold
+
+        # capacity must be a prime number, or a power of two in power-of-two mode
+        self._capacity = next_power_of_two(capacity) if power_of_two else next_prime(capacity)
+        self._min_capacity = self._capacity
+        self._hashes, self._keys, self._values, self._states = self._new_arrays(self._capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output, in the same
+        format as the HashEntry-based HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(self._states[i] == TOMBSTONE) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _new_arrays(capacity: int) -> tuple:
+        """This private method returns empty hash, key, value and state arrays for the given capacity.
+
+        Returns:
+            tuple: an array('Q') of hashes, a list of keys, a list of values and a bytearray of bucket states,
+            each with capacity items.
+        """
+        return array('Q', bytes(8 * capacity)), [None] * capacity, [None] * capacity, bytearray(capacity)
+
+    def put(self, key: str, value: object) -> None:
+        """This method updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value is replaced with the new value. If the given key is not in
+        the hash map, a new key/value pair is added.
+
+        Args:
+            key (str): key to be added or updated within the HashMap.
+            value (object): value to be added to the HashMap.
+        """
+        # Resize HashMap if table load is too high. Otherwise, clear tombstones with a rehash at the current capacity
+        # once there are too many of them, or once they would push live entries and tombstones past the max load.
+        if self._size / self._capacity >= self._max_load:
+            self._rehash(round_capacity(grown_capacity(self._capacity, self._growth_factor), self._power_of_two))
+        elif self._tombstones and (self._tombstones >= self._tombstone_threshold * self._capacity or
+                                   (self._size + self._tombstones) / self._capacity >= self._max_load):
+            self._rehash(self._capacity)
+
+        hash = full_hash(self._hash_function, key, self._power_of_two)
+        hashes, keys, states, capacity = self._hashes, self._keys, self._states, self._capacity
+
+        # Probe for an empty bucket or matching key, remembering the first tombstone passed
+        hash_index = hash % capacity
+        probe = 1
+        limit = probe_limit(capacity, self._power_of_two)
+        tombstone_index = None
+        while states[hash_index] != EMPTY and probe <= limit:
+            if states[hash_index] == TOMBSTONE:
+                if tombstone_index is None:
+                    tombstone_index = hash_index
+            elif hashes[hash_index] == hash and keys[hash_index] == key:
+                # If key already exists, update the value in place
+                self._values[hash_index] = value
+                return
+            hash_index = (hash + probe_offset(probe, self._power_of_two)) % capacity
+            probe += 1
+
+        # If every bucket the probe sequence can reach is occupied, which quadratic probing allows above a load of
+        # 0.5, grow the table and try again
+        if states[hash_index] != EMPTY and tombstone_index is None:
+            self._rehash(round_capacity(grown_capacity(self._capacity, self._growth_factor), self._power_of_two))
+            self.put(key, value)
+            return
+
+        # Place the new entry in the first tombstone passed, or else in the empty bucket found
+        if tombstone_index is not None:
+            hash_index = tombstone_index
+            self._tombstones -= 1
+        hashes[hash_index] = hash
+        keys[hash_index] = key
+        self._values[hash_index] = value
+        states[hash_index] = LIVE
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """This method changes the capacity of the underlying table, rehashing all elements in the process.
+
+        Args:
+            new_capacity (int): new capacity of the underlying arrays
+        """
+        # Ensure new capacity is large enough to hold the map
+        if new_capacity < self._size:
+            return
+
+        # Evaluate if new capacity is prime (or a power of two), if not increment to the next one
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+
+        # Grow the new capacity until the load stays below the max load, as re-putting every entry would have done
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = round_capacity(grown_capacity(new_capacity, self._growth_factor), self._power_of_two)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = new_capacity
+        self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """This private method moves every live entry into new arrays of the given capacity, using the stored
+        hashes. Keys are known to be unique, so no duplicate checks or load checks are needed, and tombstones are
+        dropped.
+
+        Args:
+            new_capacity (int): capacity of the new arrays, assumed valid and large enough for the map
+        """
+        hashes, keys, values, states = self._new_arrays(new_capacity)
+        limit = probe_limit(new_capacity, self._power_of_two)
+
+        # Place each live entry in the first empty bucket of its probe sequence. Should quadratic probing find no
+        # empty bucket, start over with larger arrays.
+        for i in range(self._capacity):
+            if self._states[i] == LIVE:
+                hash = self._hashes[i]
+                hash_index = hash % new_capacity
+                probe = 1
+                while states[hash_index] != EMPTY:
+                    if probe > limit:
+                        self._rehash(round_capacity(grown_capacity(new_capacity, self._growth_factor),
+                                                    self._power_of_two))
+                        return
+                    hash_index = (hash + probe_offset(probe, self._power_of_two)) % new_capacity
+                    probe += 1
+                hashes[hash_index] = hash
+                keys[hash_index] = self._keys[i]
+                values[hash_index] = self._values[i]
+                states[hash_index] = LIVE
+
+        self._capacity = new_capacity
+        self._hashes, self._keys, self._values, self._states = hashes, keys, values, states
+        self._tombstones = 0
+
+    def table_load(self) -> float:
+        """This method returns the current hash table load factor.
+
+        Returns:
+            float: hash table load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """This method returns the number of empty buckets in the hash table.
+
+        Returns:
+            int: number of empty buckets in the HashMap.
+        """
+        # Tombstoned buckets are not empty; they still lengthen probe sequences
+        return self._capacity - self._size - self._tombstones
+
+    def get(self, key: str) -> object:
+        """This method returns the value associated with the given key. If the key is not in the hash
+        map, the method returns None.
+
+        Args:
+            key (str): key of the value to be retrieved.
+
+        Returns:
+            object: value associated with the passed key.
+        """
+        hash_index = self._find_index(key)
+        if hash_index is not None:
+            return self._values[hash_index]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """This method returns True if the given key is in the hash map, otherwise it returns False.
+
+        Args:
+            key (str): key to be searched for in the hashMap.
+
+        Returns:
+            bool: True if the given key is in the HashMap, otherwise False.
+        """
+        return self._find_index(key) is not None
+
+    def remove(self, key: str) -> None:
+        """This method removes the given key and its associated value from the hash map. If the key
+        is not in the hash map, the method does nothing.
+
+        Args:
+            key (str): key of the object to be removed.
+        """
+        # Tombstone the bucket and drop its key and value, so they can be garbage collected
+        hash_index = self._find_index(key)
+        if hash_index is not None:
+            self._states[hash_index] = TOMBSTONE
+            self._keys[hash_index] = None
+            self._values[hash_index] = None
+            self._size -= 1
+            self._tombstones += 1
+            self._shrink()
+
+    def _shrink(self) -> None:
+        """This private method shrinks the table once its load falls below the shrink threshold, to a capacity at
+        which the load is max_load / growth_factor, but never below the capacity the map was created with or last
+        explicitly resized to."""
+        if self._size / self._capacity >= self._shrink_load:
+            return
+
+        new_capacity = max(self._min_capacity, int(self._size * self._growth_factor / self._max_load))
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+        if new_capacity < self._capacity:
+            self._rehash(new_capacity)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """This method returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map.
+
+        Returns:
+            DynamicArray: A dynamic array containing all the key value pairs of the HashMap.
+        """
+        states, keys, values = self._states, self._keys, self._values
+        return DynamicArray([(keys[i], values[i]) for i in range(self._capacity) if states[i] == LIVE])
+
+    def clear(self) -> None:
+        """This method clears the contents of the hash map without changing the underlying hash table capacity."""
+        self._hashes, self._keys, self._values, self._states = self._new_arrays(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def memory_usage(self) -> dict:
+        """This method reports the memory used by the hash map in bytes, as measured by sys.getsizeof, in the same
+        form as the other HashMaps: the hash, key, value and state arrays count as buckets, and there are no nodes.
+        Keys and values are measured shallowly, and an object stored more than once is counted once.
+
+        Returns:
+            dict: bytes spent on 'buckets', 'nodes', 'keys' and 'values', and their 'total'.
+        """
+        seen = set()
+        live = [i for i in range(self._capacity) if self._states[i] == LIVE]
+        usage = {'buckets': sizeof_unique([self._hashes, self._keys, self._values, self._states], seen),
+                 'nodes': 0,
+                 'keys': sizeof_unique([self._keys[i] for i in live], seen),
+                 'values': sizeof_unique([self._values[i] for i in live], seen)}
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def __iter__(self):
+        """This method iterates over the live entries of the hash map. As the map stores no HashEntry objects,
+        each entry is yielded as a new HashEntry holding the bucket's key, value and hash."""
+        for i in range(self._capacity):
+            if self._states[i] == LIVE:
+                yield HashEntry(self._keys[i], self._values[i], self._hashes[i])
+
+    def _find_index(self, key: str) -> int | None:
+        """This private method returns the index of the live bucket holding the given key, using quadratic
+        probing and skipping over tombstones.
+
+        Returns:
+            int: index of the matching live bucket, or None if the key is not in the HashMap.
+        """
+        hash = full_hash(self._hash_function, key, self._power_of_two)
+        hashes, keys, states, capacity = self._hashes, self._keys, self._states, self._capacity
+        hash_index = hash % capacity
+        probe = 1
+        limit = probe_limit(capacity, self._power_of_two)
+        while states[hash_index] != EMPTY and probe <= limit:
+            if states[hash_index] == LIVE and hashes[hash_index] == hash and keys[hash_index] == key:
+                return hash_index
+            hash_index = (hash + probe_offset(probe, self._power_of_two)) % capacity
+            probe += 1
+        return None
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(25, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - get_keys_and_values example 1")
+    print("------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+
+    m.resize_table(2)
+    print(m.get_keys_and_values())
+
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(12)
+    print(m.get_keys_and_values())
+
+    print("\nPDF - __iter__(), __next__() example 2")
+    print("---------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -0,0 +1,309 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: This program is a thread-safe HashMap that can be shared between threads. It uses lock striping: the
+#              keys are partitioned by hash across a fixed number of segments, each an independent Separate Chaining
+#              (or Open Addressing) HashMap guarded by its own lock. Operations on keys in different segments never
+#              wait for each other, and a segment that grows or shrinks is rehashed while its lock is held, so no
+#              reader or writer can observe its bucket array half-rebuilt. Read-modify-write operations (setdefault,
+#              increment, update and pop) are atomic.
+#              Keys are assigned to segments by Python's built-in hash, which str objects cache, so routing a key
+#              costs almost nothing beyond the segment's own hash function. Batch operations group their keys by
+#              segment and take each segment's lock once per batch. Iterating over the map is weakly consistent: it
+#              copies one segment's pairs at a time under that segment's lock, never raising for concurrent changes,
+#              and reflects each segment as it was when the iteration reached it.
+
+import threading
+
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_1, mix_hash
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+class HashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1, segments: int = 16,
+                 map_class: type = hash_map_sc.HashMap, **options) -> None:
+        """
+        Initialize new thread-safe HashMap of the given number of segments,
+        each a map_class HashMap (hash_map_sc.HashMap by default, or
+        hash_map_oa.HashMap) created with an equal share of the capacity, the
+        hash function and any other options, such as max_load or power_of_two
+        """
+        if segments < 1:
+            raise ValueError(f"segments must be at least 1, not {segments}")
+        segment_capacity = max(1, -(-capacity // segments))
+        self._segments = [map_class(segment_capacity, function, **options) for _ in range(segments)]
+        self._locks = [threading.Lock() for _ in range(segments)]
+        self._segment_count = segments
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output, one segment after another."""
+        out = ''
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                out += f'segment {index}:\n{self._segments[index]}'
+        return out
+
+    def _segment(self, key: str) -> int:
+        """This private method returns the index of the segment holding the given key.
+
+        Args:
+            key (str): key to route
+
+        Returns:
+            int: index of the key's segment
+        """
+        return mix_hash(hash(key) & _MASK_64) % self._segment_count
+
+    def get_size(self) -> int:
+        """This method returns the number of key/value pairs in the hash map. Under concurrent updates, the
+        segments are counted one after another, so the count may be out of date as soon as it is returned."""
+        return sum(segment.get_size() for segment in self._segments)
+
+    def get_capacity(self) -> int:
+        """This method returns the total number of buckets of every segment."""
+        return sum(segment.get_capacity() for segment in self._segments)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """This method updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value is replaced with the new value. Otherwise, a new key/value
+        pair is added.
+
+        Args:
+            key (str): key to be added or updated in the hash map
+            value (object): value to be stored in the hash map
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            self._segments[index].put(key, value)
+
+    def get(self, key: str) -> object:
+        """This method returns the value associated with the given key, or None if the key is not in the
+        hash map.
+
+        Args:
+            key (str): key of the value to be retrieved
+
+        Returns:
+            object: the value associated with the given key, or None
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            return self._segments[index].get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """This method returns True if the given key is in the hash map, otherwise False.
+
+        Args:
+            key (str): key to be searched for
+
+        Returns:
+            bool: True if the key is present in the hash map, otherwise False
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            return self._segments[index].contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """This method removes the given key and its associated value from the hash map. If the key is not
+        in the hash map, the method does nothing.
+
+        Args:
+            key (str): key to be removed from the hash map
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            self._segments[index].remove(key)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """This method atomically returns the value associated with the given key, adding the key with the
+        given default value if it is not in the hash map.
+
+        Args:
+            key (str): key whose value is to be returned
+            default (object): value to be stored with the key if it is not in the hash map
+
+        Returns:
+            object: the key's value
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            return self._segments[index].setdefault(key, default)
+
+    def increment(self, key: str, delta: object = 1) -> object:
+        """This method atomically adds delta to the value associated with the given key, adding the key with
+        delta as its value if it is not in the hash map.
+
+        Args:
+            key (str): key whose value is to be incremented
+            delta (object): amount to add to the key's value
+
+        Returns:
+            object: the key's new value
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            return self._segments[index].increment(key, delta)
+
+    def update(self, key: str, function: callable, default: object = None) -> object:
+        """This method atomically replaces the value associated with the given key by function(value), or adds
+        the key with function(default) if it is not in the hash map. The key's segment stays locked while
+        function runs, so function must not use this hash map.
+
+        Args:
+            key (str): key whose value is to be updated
+            function (callable): function computing the new value from the current one
+            default (object): value passed to function if the key is not in the hash map
+
+        Returns:
+            object: the key's new value
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            return self._segments[index].update(key, function, default)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """This method atomically removes the given key from the hash map and returns its value, or returns the
+        default if the key is not in the hash map.
+
+        Args:
+            key (str): key to be removed from the hash map
+            default (object): value to return if the key is not in the hash map
+
+        Returns:
+            object: the key's value, or default
+        """
+        index = self._segment(key)
+        with self._locks[index]:
+            return self._segments[index].pop(key, default)
+
+    def put_many(self, items) -> None:
+        """This method puts every key/value pair of the given iterable into the hash map, as put would. The
+        pairs are grouped by segment, and each segment is locked once for all of its pairs.
+
+        Args:
+            items (iterable): (key, value) pairs to be added or updated in the hash map
+        """
+        groups = [[] for _ in range(self._segment_count)]
+        for key, value in items:
+            groups[self._segment(key)].append((key, value))
+        for index, group in enumerate(groups):
+            if group:
+                with self._locks[index]:
+                    self._segments[index].put_many(group)
+
+    def get_many(self, keys) -> DynamicArray:
+        """This method returns the values associated with each key of the given iterable, as get would. The
+        keys are grouped by segment, and each segment is locked once for all of its keys.
+
+        Args:
+            keys (iterable): keys of the values to be retrieved
+
+        Returns:
+            DynamicArray: the value associated with each key, in order, or None for keys not in the hash map
+        """
+        keys = list(keys)
+        groups = [[] for _ in range(self._segment_count)]
+        for position, key in enumerate(keys):
+            groups[self._segment(key)].append(position)
+
+        # Look up each segment's keys in one batch, then put every value back at its key's position
+        values = [None] * len(keys)
+        for index, positions in enumerate(groups):
+            if positions:
+                with self._locks[index]:
+                    found = self._segments[index].get_many([keys[position] for position in positions])
+                for i, position in enumerate(positions):
+                    values[position] = found[i]
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """This method removes every key of the given iterable from the hash map, as remove would. The keys
+        are grouped by segment, and each segment is locked once for all of its keys.
+
+        Args:
+            keys (iterable): keys to be removed from the hash map
+        """
+        groups = [[] for _ in range(self._segment_count)]
+        for key in keys:
+            groups[self._segment(key)].append(key)
+        for index, group in enumerate(groups):
+            if group:
+                with self._locks[index]:
+                    self._segments[index].remove_many(group)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """This method resizes every segment to an equal share of the given capacity, one segment at a time,
+        following the segments' own resize_table rules.
+
+        Args:
+            new_capacity (int): new total capacity
+        """
+        if new_capacity < 1:
+            return
+        segment_capacity = -(-new_capacity // self._segment_count)
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                self._segments[index].resize_table(segment_capacity)
+
+    def table_load(self) -> float:
+        """This method returns the load of the table: the number of key/value pairs over the total capacity."""
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """This method returns the number of empty buckets of every segment. Counting may complete a segment's
+        incremental resize, so each segment is counted under its lock."""
+        count = 0
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                count += self._segments[index].empty_buckets()
+        return count
+
+    def clear(self) -> None:
+        """This method clears every segment of the hash map, one segment at a time."""
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                self._segments[index].clear()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """This method returns a dynamic array where each index contains a tuple of a key/value pair stored in
+        the hash map, collected one segment at a time as items does.
+
+        Returns:
+            DynamicArray: dynamic array where each index contains a tuple of a key/value pair
+        """
+        return_array = DynamicArray()
+        for pair in self.items():
+            return_array.append(pair)
+        return return_array
+
+    def keys(self):
+        """This method returns a weakly consistent iterator over the keys of the hash map; see items.
+
+        Returns:
+            iterator: the keys, one segment after another
+        """
+        return (key for key, value in self.items())
+
+    def values(self):
+        """This method returns a weakly consistent iterator over the values of the hash map; see items.
+
+        Returns:
+            iterator: the values, one segment after another
+        """
+        return (value for key, value in self.items())
+
+    def items(self):
+        """This method returns a weakly consistent iterator over the key/value pairs of the hash map. Each segment's
+        pairs are copied under its lock when the iteration reaches it, so only one segment is held in memory at a
+        time, and concurrent changes never make the iteration fail.
+
+        Yields:
+            tuple: (key, value) tuples, one segment after another
+        """
+        for index in range(self._segment_count):
+            with self._locks[index]:
+                pairs = list(self._segments[index].items())
+            yield from pairs
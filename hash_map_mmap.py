@@ -0,0 +1,437 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: This program is a persistent Open Addressing HashMap stored in a file and accessed through mmap, so
+#              that a process can open an existing table without rebuilding it: opening reads only the header, and
+#              the operating system pages the rest of the file in as lookups touch it. The file holds a header (the
+#              capacity, size, tombstone count, end of the heap and number of dead heap bytes), then a slot table of
+#              fixed-width slots, and then a heap. Each slot records its state (empty, live or tombstone), the full
+#              hash of its key and the heap offsets of its key and value; the heap holds length-prefixed key bytes
+#              (UTF-8) and values (pickled). The capacity is a power of two and slots are probed linearly. Keys are
+#              hashed with FNV-1a, which, unlike the built-in hash, is the same in every process, so the stored
+#              hashes stay valid.
+#              put appends to the heap, growing the file as needed; updating a key appends its new value and leaves
+#              the old one behind as dead bytes, as does removing a key. Once live entries and tombstones would pass
+#              the maximum load, or dead bytes fill half of the heap, the table is rebuilt into a new file, twice the
+#              capacity if needed, from the stored hashes and with the heap compacted, and the new file then replaces
+#              the old one.
+#              Any number of processes can open the same file read-only and share its pages. The table has a single
+#              writer, and readers only see a consistent table while it is not being written; a reader that opened
+#              the file before a rebuild keeps reading the old file. The file is only guaranteed to be complete on
+#              disk after flush() or close(). Values are unpickled when read, so only open files from a trusted
+#              source.
+
+import mmap
+import os
+import pickle
+import struct
+
+from a6_include import DynamicArray, hash_function_fnv1a, next_power_of_two
+
+# Slot states, stored in the first byte of each slot
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# Header: magic number, capacity, size, tombstone count, end of the heap and dead heap bytes
+_MAGIC = b'HMMMAP02'
+_HEADER = struct.Struct('<8sQQQQQ')
+_COUNTS_OFFSET = 16
+_COUNTS = struct.Struct('<QQQQ')
+
+# Slot: state, hash, key offset and value offset; offsets are relative to the start of the heap
+_SLOT = struct.Struct('<BQQQ')
+_VALUE_OFFSET = 17
+_OFFSET = struct.Struct('<Q')
+
+# Length prefix of a key or value in the heap
+_LENGTH = struct.Struct('<I')
+
+_INITIAL_HEAP_SIZE = 1 << 16
+
+
+class HashMap:
+    def __init__(self, path: str, capacity: int = 1024, max_load: float = 0.75) -> None:
+        """
+        Initialize new HashMap in a new file at the given path, replacing any
+        existing file, with capacity slots (rounded up to a power of two)
+        filled to at most max_load before the table grows.
+        Use HashMap.open to open an existing table.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError(f"max_load must be between 0 and 1, not {max_load}")
+        self._path = os.fspath(path)
+        self._max_load = max_load
+        self._writable = True
+        self._create(self._path, next_power_of_two(capacity), _INITIAL_HEAP_SIZE)
+        self._map_file()
+
+    @classmethod
+    def open(cls, path: str, readonly: bool = False, max_load: float = 0.75) -> "HashMap":
+        """This method opens the existing HashMap stored in the file at the given path. Only the header is read;
+        slots, keys and values are paged in as they are used. A read-only map shares its pages with every other
+        process that maps the same file and cannot be changed.
+
+        Args:
+            path (str): path of the file, as created by HashMap.
+            readonly (bool): whether to open the file read-only.
+            max_load (float): maximum load of puts made through the opened map.
+
+        Returns:
+            HashMap: a HashMap reading (and, unless readonly, writing) the table in the file.
+        """
+        hash_map = cls.__new__(cls)
+        hash_map._path = os.fspath(path)
+        hash_map._max_load = max_load
+        hash_map._writable = not readonly
+        hash_map._map_file()
+        return hash_map
+
+    @staticmethod
+    def _create(path: str, capacity: int, heap_size: int) -> None:
+        """This private method creates a file holding an empty table of the given capacity and room for heap_size
+        bytes of heap. The file is extended without writing to it, so every slot reads as zero: empty.
+
+        Args:
+            path (str): path of the file to create or replace
+            capacity (int): number of slots, a power of two
+            heap_size (int): initial size of the heap in bytes
+        """
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, capacity, 0, 0, 0, 0))
+            file.truncate(_HEADER.size + capacity * _SLOT.size + heap_size)
+
+    def _map_file(self) -> None:
+        """This private method maps the map's file into memory and reads its header."""
+        with open(self._path, 'r+b' if self._writable else 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if self._writable else mmap.ACCESS_READ)
+        magic, capacity, _, _, _, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"file {self._path!r} does not hold a HashMap")
+        self._capacity = capacity
+        self._heap = _HEADER.size + capacity * _SLOT.size
+
+    def __enter__(self) -> "HashMap":
+        """Return the map, for use as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Close the map at the end of a with block."""
+        self.close()
+
+    def flush(self) -> None:
+        """This method writes every change made to the map through to its file."""
+        if self._writable:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """This method flushes the map and unmaps its file. The map cannot be used afterwards."""
+        self.flush()
+        self._mmap.close()
+
+    def get_path(self) -> str:
+        """This method returns the path of the map's file, to be passed to HashMap.open."""
+        return self._path
+
+    def get_size(self) -> int:
+        """This method returns the number of key/value pairs in the hash map, as recorded in the header."""
+        return _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)[0]
+
+    def get_capacity(self) -> int:
+        """This method returns the number of slots in the hash map."""
+        return self._capacity
+
+    def _check_writable(self) -> None:
+        """This private method raises PermissionError if the map was opened read-only."""
+        if not self._writable:
+            raise PermissionError(f"HashMap {self._path!r} was opened read-only")
+
+    # ------------------------------------------------------------------ #
+
+    def _read(self, offset: int) -> bytes:
+        """This private method returns the key or value bytes stored at the given heap offset."""
+        start = self._heap + offset + _LENGTH.size
+        return self._mmap[start:start + _LENGTH.unpack_from(self._mmap, start - _LENGTH.size)[0]]
+
+    def _append(self, data: bytes) -> int:
+        """This private method appends key or value bytes to the heap, doubling the file if the heap is full, and
+        returns their heap offset. Growing the file maps it again, so callers must not hold on to self._mmap
+        across a call.
+
+        Args:
+            data (bytes): bytes to append
+
+        Returns:
+            int: heap offset of the bytes
+        """
+        size, tombstones, heap_end, garbage = _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)
+        start = self._heap + heap_end
+        end = start + _LENGTH.size + len(data)
+        if end > len(self._mmap):
+            # mmap.resize needs mremap, which not every platform has, so extend the file and map it again instead
+            file_size = max(end, 2 * len(self._mmap))
+            self._mmap.close()
+            os.truncate(self._path, file_size)
+            self._map_file()
+        _LENGTH.pack_into(self._mmap, start, len(data))
+        self._mmap[start + _LENGTH.size:end] = data
+        _COUNTS.pack_into(self._mmap, _COUNTS_OFFSET, size, tombstones, end - self._heap, garbage)
+        return heap_end
+
+    def _discard(self, *offsets: int) -> None:
+        """This private method records the keys or values at the given heap offsets as dead, and compacts the heap
+        with a rebuild at the same capacity once dead bytes fill half of it. Small heaps are never compacted.
+
+        Args:
+            offsets (int): heap offsets of keys or values no longer referenced by any slot
+        """
+        size, tombstones, heap_end, garbage = _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)
+        for offset in offsets:
+            garbage += _LENGTH.size + _LENGTH.unpack_from(self._mmap, self._heap + offset)[0]
+        _COUNTS.pack_into(self._mmap, _COUNTS_OFFSET, size, tombstones, heap_end, garbage)
+        if heap_end >= _INITIAL_HEAP_SIZE and 2 * garbage >= heap_end:
+            self._rebuild(self._capacity)
+
+    def _set_counts(self, size: int, tombstones: int) -> None:
+        """This private method records the size and tombstone count in the header."""
+        struct.pack_into('<QQ', self._mmap, _COUNTS_OFFSET, size, tombstones)
+
+    def _find(self, data: bytes, hash: int) -> tuple[int | None, int | None]:
+        """This private method probes for the slot of the given key, reading a key from the heap only when its
+        slot's hash matches.
+
+        Args:
+            data (bytes): UTF-8 bytes of the key
+            hash (int): FNV-1a hash of the key
+
+        Returns:
+            tuple[int, int]: the offset of the key's live slot, or of the empty slot ending the probe if the key is
+            not in the hash map; and the offset of the first tombstone passed, or None
+        """
+        memory, mask = self._mmap, self._capacity - 1
+        index = hash & mask
+        tombstone = None
+        for _ in range(self._capacity):
+            offset = _HEADER.size + index * _SLOT.size
+            state, slot_hash, key_offset, _ = _SLOT.unpack_from(memory, offset)
+            if state == EMPTY:
+                return offset, tombstone
+            if state == TOMBSTONE:
+                if tombstone is None:
+                    tombstone = offset
+            elif slot_hash == hash and self._read(key_offset) == data:
+                return offset, tombstone
+            index = (index + 1) & mask
+        return None, tombstone
+
+    def _is_live(self, offset: int | None) -> bool:
+        """This private method returns True if the given offset is that of a live slot."""
+        return offset is not None and self._mmap[offset] == LIVE
+
+    def put(self, key: str, value: object) -> None:
+        """This method updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value is replaced with the new value. Otherwise, a new key/value
+        pair is added.
+
+        Args:
+            key (str): key to be added or updated.
+            value (object): picklable value to be stored.
+        """
+        self._check_writable()
+        data = key.encode()
+        hash = hash_function_fnv1a(data)
+        offset, tombstone = self._find(data, hash)
+
+        # If the key already exists, append its new value, point its slot at it and discard the old value
+        if self._is_live(offset):
+            old_value_offset = _OFFSET.unpack_from(self._mmap, offset + _VALUE_OFFSET)[0]
+            value_offset = self._append(pickle.dumps(value))
+            _OFFSET.pack_into(self._mmap, offset + _VALUE_OFFSET, value_offset)
+            self._discard(old_value_offset)
+            return
+
+        # A new key needs room under the maximum load: rebuild the table to clear its tombstones, at twice the
+        # capacity if live entries alone would pass the maximum load
+        size, tombstones, _, _ = _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)
+        if tombstone is None and size + tombstones + 1 > self._max_load * self._capacity:
+            self._rebuild(2 * self._capacity if size + 1 > self._max_load * self._capacity else self._capacity)
+            self.put(key, value)
+            return
+
+        # Fill the first tombstone passed, or else the empty slot found. The state byte is written last, so a reader
+        # never sees a live slot before its key and value are in place.
+        if tombstone is not None:
+            offset = tombstone
+            tombstones -= 1
+        key_offset = self._append(data)
+        value_offset = self._append(pickle.dumps(value))
+        _SLOT.pack_into(self._mmap, offset, EMPTY, hash, key_offset, value_offset)
+        self._mmap[offset] = LIVE
+        self._set_counts(size + 1, tombstones)
+
+    def get(self, key: str, default: object = None) -> object:
+        """This method returns the value associated with the given key, or default if the key is not in the
+        hash map.
+
+        Args:
+            key (str): key of the value to be retrieved.
+            default (object): value to return if the key is not in the hash map.
+
+        Returns:
+            object: the value associated with the given key, or default.
+        """
+        data = key.encode()
+        offset, _ = self._find(data, hash_function_fnv1a(data))
+        if not self._is_live(offset):
+            return default
+        return pickle.loads(self._read(_OFFSET.unpack_from(self._mmap, offset + _VALUE_OFFSET)[0]))
+
+    def contains_key(self, key: str) -> bool:
+        """This method returns True if the given key is in the hash map, otherwise False.
+
+        Args:
+            key (str): key to be searched for.
+
+        Returns:
+            bool: True if the key is present in the hash map, otherwise False.
+        """
+        data = key.encode()
+        return self._is_live(self._find(data, hash_function_fnv1a(data))[0])
+
+    def remove(self, key: str) -> None:
+        """This method removes the given key and its associated value from the hash map, leaving a tombstone.
+        If the key is not in the hash map, the method does nothing.
+
+        Args:
+            key (str): key to be removed.
+        """
+        self._check_writable()
+        data = key.encode()
+        offset, _ = self._find(data, hash_function_fnv1a(data))
+        if self._is_live(offset):
+            self._mmap[offset] = TOMBSTONE
+            size, tombstones, _, _ = _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)
+            self._set_counts(size - 1, tombstones + 1)
+            _, _, key_offset, value_offset = _SLOT.unpack_from(self._mmap, offset)
+            self._discard(key_offset, value_offset)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """This method changes the capacity of the table, rounded up to a power of two and to at least the capacity
+        that holds the current pairs under the maximum load, by rebuilding it into a new file.
+
+        Args:
+            new_capacity (int): new number of slots.
+        """
+        self._check_writable()
+        self._rebuild(max(new_capacity, int(self.get_size() / self._max_load) + 1))
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """This private method copies every live entry into a new file of the given capacity, rounded up to a power
+        of two, then replaces the map's file with it. Each entry keeps its stored hash, so no key is hashed again;
+        only live keys and values are copied, which compacts the heap; and tombstones are dropped.
+
+        Args:
+            new_capacity (int): number of slots of the new table, large enough for every live entry
+        """
+        new_capacity = next_power_of_two(new_capacity)
+        _, _, heap_end, garbage = _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)
+        new_path = self._path + '.rebuild'
+        self._create(new_path, new_capacity, max(heap_end - garbage, _INITIAL_HEAP_SIZE))
+        new_map = HashMap.open(new_path, max_load=self._max_load)
+
+        # Place each live entry in the first empty slot of its probe sequence; keys are known to be unique
+        mask, size = new_capacity - 1, 0
+        for state, hash, key_offset, value_offset in self._slots():
+            if state == LIVE:
+                index = hash & mask
+                while new_map._mmap[_HEADER.size + index * _SLOT.size] != EMPTY:
+                    index = (index + 1) & mask
+                key_offset = new_map._append(self._read(key_offset))
+                value_offset = new_map._append(self._read(value_offset))
+                _SLOT.pack_into(new_map._mmap, _HEADER.size + index * _SLOT.size, LIVE, hash, key_offset,
+                                value_offset)
+                size += 1
+        new_map._set_counts(size, 0)
+        new_map.close()
+
+        # Swap the new file in and map it in place of the old one
+        self._mmap.close()
+        os.replace(new_path, self._path)
+        self._map_file()
+
+    def _slots(self):
+        """This private generator yields every slot as a (state, hash, key offset, value offset) tuple."""
+        memory = self._mmap
+        for index in range(self._capacity):
+            yield _SLOT.unpack_from(memory, _HEADER.size + index * _SLOT.size)
+
+    def table_load(self) -> float:
+        """This method returns the load of the table: the number of key/value pairs over the capacity."""
+        return self.get_size() / self._capacity
+
+    def empty_buckets(self) -> int:
+        """This method returns the number of empty slots in the hash table."""
+        # Tombstoned slots are not empty; they still lengthen probe sequences
+        size, tombstones, _, _ = _COUNTS.unpack_from(self._mmap, _COUNTS_OFFSET)
+        return self._capacity - size - tombstones
+
+    def items(self):
+        """This method returns a lazy iterator over the key/value pairs of the hash map, in slot order.
+
+        Returns:
+            iterator: (key, value) tuples.
+        """
+        return ((self._read(key_offset).decode(), pickle.loads(self._read(value_offset)))
+                for state, hash, key_offset, value_offset in self._slots() if state == LIVE)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """This method returns a dynamic array where each index contains a tuple of a key/value pair stored in
+        the hash map.
+
+        Returns:
+            DynamicArray: dynamic array where each index contains a tuple of a key/value pair.
+        """
+        return_array = DynamicArray()
+        for pair in self.items():
+            return_array.append(pair)
+        return return_array
+
+    def clear(self) -> None:
+        """This method clears the contents of the hash map without changing its capacity. The heap is emptied, but
+        the file keeps its size."""
+        self._check_writable()
+        self._mmap[_HEADER.size:self._heap] = bytes(self._heap - _HEADER.size)
+        _COUNTS.pack_into(self._mmap, _COUNTS_OFFSET, 0, 0, 0, 0)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    print("\nempty buckets after removals")
+    print("-----------------------------")
+    with tempfile.TemporaryDirectory() as directory:
+        with HashMap(os.path.join(directory, 'table.map'), capacity=64) as m:
+            for i in range(20):
+                m.put('key' + str(i), i)
+            print(m.empty_buckets(), m.get_size(), m.get_capacity())
+            for i in range(0, 20, 2):
+                m.remove('key' + str(i))
+            # The 10 tombstones are not empty slots, also once the file is reopened
+            print(m.empty_buckets(), m.get_size(), m.get_capacity())
+        with HashMap.open(os.path.join(directory, 'table.map'), readonly=True) as m:
+            print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+    print("\nrepeated updates keep the file bounded")
+    print("---------------------------------------")
+    with tempfile.TemporaryDirectory() as directory:
+        with HashMap(os.path.join(directory, 'table.map'), capacity=64) as m:
+            # Each round overwrites every value; dead values are compacted away instead of piling up in the heap
+            sizes = []
+            for round in range(200):
+                for i in range(20):
+                    m.put('key' + str(i), 'value' * 100 + str(round))
+                sizes.append(os.path.getsize(m.get_path()))
+            print(m.get_size(), m.get('key7')[-3:], max(sizes) <= 4 * sizes[0])
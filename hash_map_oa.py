@@ -8,27 +8,86 @@
 #              tombstone. The HashMap class includes methods for putting and removing a key/value pair in the map,
 #              getting the value of a known key, determining the table load, determining the amount of empty buckets,
 #              resizing the HashMap, clearing the HashMap, as well as obtaining an array of all key/value pairs.
-
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+#              The probing strategy is selectable: linear, quadratic (the default), double hashing, or Robin Hood
+#              hashing, which uses linear probing with displacement and backward-shift deletion instead of tombstones.
+#              The maximum load factor, growth factor and shrink threshold are configurable; the table shrinks after
+#              mass removals, but never below the capacity it was created with or last explicitly resized to.
+#              Removed entries are tombstoned and counted; put reuses tombstoned buckets, and once tombstones pass a
+#              configurable share of the table the map is rehashed in place to clear them.
+#              An optional incremental resize mode spreads rehashing over later operations: the old and new bucket
+#              arrays coexist and every operation migrates a bounded number of old buckets.
+#              An optional power-of-two mode replaces prime capacities: resizing needs no prime search, and hashes are
+#              passed through a mixing finalizer so that the low bits used as the bucket index are well distributed.
+#              Read-modify-write operations (setdefault, increment, update and pop) update entries in place with a
+#              single hash and probe sequence.
+#              keys(), values() and items() iterate lazily, each with its own iterator, and fail fast if keys are
+#              added or removed during the iteration.
+
+from array import array
+
+from a6_include import (SNAPSHOT_CHUNK_SIZE, DynamicArray, HashEntry,
+                        as_list, grown_capacity, hash_function_1, hash_function_2, hash_many, mix_hash,
+                        next_power_of_two, next_prime, probe_limit, read_snapshot, round_capacity, sizeof_unique,
+                        write_snapshot)
+
+PROBING_STRATEGIES = ('linear', 'quadratic', 'double', 'robin_hood')
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, incremental_resize: bool = False, rehash_step: int = 4,
+                 tombstone_threshold: float = 0.25, probing: str = 'quadratic', max_load: float = 0.5,
+                 growth_factor: float = 2.0, shrink_load: float = None, power_of_two: bool = False) -> None:
         """
-        Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Initialize new HashMap that uses open addressing with the given
+        probing strategy (quadratic by default) for collision resolution
+        The table grows by growth_factor once its load reaches max_load, and
+        shrinks when a removal leaves its load below shrink_load (by default
+        max_load / 8; 0 disables shrinking).
+        If incremental_resize is True, growing the table migrates rehash_step
+        old buckets per operation instead of rehashing everything at once.
+        Once tombstones fill tombstone_threshold of the buckets, the table is
+        rehashed at its current capacity to clear them.
+        If power_of_two is True, capacities are powers of two instead of primes
+        and every hash is mixed before use.
         """
+        if probing not in PROBING_STRATEGIES:
+            raise ValueError(f"probing must be one of {PROBING_STRATEGIES}, not {probing!r}")
+        if not 0 < max_load < 1:
+            raise ValueError(f"max_load must be between 0 and 1, not {max_load}")
+        if growth_factor <= 1:
+            raise ValueError(f"growth_factor must be greater than 1, not {growth_factor}")
+        self._probing = probing
+        self._power_of_two = power_of_two
+        self._max_load = max_load
+        self._growth_factor = growth_factor
+        self._shrink_load = max_load / 8 if shrink_load is None else shrink_load
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, or a power of two in power-of-two mode
+        self._capacity = next_power_of_two(capacity) if power_of_two else next_prime(capacity)
         for _ in range(self._capacity):
             self._buckets.append(None)
 
         self._hash_function = function
+
+        # Full hash of a key; mixed in power-of-two mode, where the bucket index is just its low bits
+        self._hash = self._mixed_hash if power_of_two else function
         self._size = 0
+        self._min_capacity = self._capacity
+
+        # Count of changes to the set of keys or to the table's layout; iterators fail fast when it changes
+        self._modifications = 0
+
+        # Tombstoned buckets in the current bucket array
+        self._tombstones = 0
+        self._tombstone_threshold = tombstone_threshold
+
+        # State of an in-progress incremental resize; old buckets below _rehash_index have been migrated
+        self._incremental_resize = incremental_resize
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_index = 0
 
     def __str__(self) -> str:
         """
@@ -40,39 +99,6 @@ class HashMap:
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
         return out
 
-    def _next_prime(self, capacity: int) -> int:
-        """
-        Increment from given number to find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
-
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
-        """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
-
     def get_size(self) -> int:
         """
         Return size of map
@@ -89,6 +115,104 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def from_items(cls, items, function, expected_size: int = None, **options) -> "HashMap":
+        """This method builds a new hash map from an iterable of key/value pairs. The table is sized once, up
+        front, for expected_size entries (by default, the number of pairs), so building the map never rehashes.
+
+        Args:
+            items (iterable): (key, value) pairs to put into the new HashMap.
+            function: hash function of the new HashMap.
+            expected_size (int): number of entries to size the table for.
+            **options: other HashMap constructor options, such as max_load or power_of_two.
+
+        Returns:
+            HashMap: a new HashMap holding the given pairs.
+        """
+        if expected_size is None:
+            items = list(items)
+            expected_size = len(items)
+
+        # Start from the smallest table, which reserve replaces with one sized for the map's load policy
+        hash_map = cls(1, function, **options)
+        hash_map.reserve(expected_size)
+        hash_map.put_many(items)
+        return hash_map
+
+    def dump(self, path: str) -> None:
+        """This method writes a binary snapshot of the hash map to a file: its capacity, hash function and options,
+        and the position, stored hash, key and value of every entry and tombstone, written one chunk of buckets at
+        a time. An incremental resize in progress is completed first. The hash function must be one of
+        HASH_FUNCTIONS.
+
+        Args:
+            path (str): path of the file to write.
+        """
+        self._finish_rehash()
+        header = {'capacity': self._capacity, 'size': self._size, 'tombstones': self._tombstones,
+                  'min_capacity': self._min_capacity,
+                  'options': {'incremental_resize': self._incremental_resize, 'rehash_step': self._rehash_step,
+                              'tombstone_threshold': self._tombstone_threshold, 'probing': self._probing,
+                              'max_load': self._max_load, 'growth_factor': self._growth_factor,
+                              'shrink_load': self._shrink_load, 'power_of_two': self._power_of_two}}
+        write_snapshot(path, 'OA', self._hash_function, header, self._snapshot_chunks())
+
+    def _snapshot_chunks(self):
+        """This private generator yields the occupied buckets in chunks of up to SNAPSHOT_CHUNK_SIZE, each as
+        columns: arrays of bucket indices and stored hashes, lists of keys and values, and a bytes object flagging
+        tombstones."""
+        get_at_index = self._buckets.get_at_index
+        for chunk_start in range(0, self._capacity, SNAPSHOT_CHUNK_SIZE):
+            indices, hashes, keys, values, tombstones = array('Q'), array('Q'), [], [], bytearray()
+            for index in range(chunk_start, min(chunk_start + SNAPSHOT_CHUNK_SIZE, self._capacity)):
+                hash_entry = get_at_index(index)
+                if hash_entry is not None:
+                    indices.append(index)
+                    hashes.append(hash_entry.hash)
+                    keys.append(hash_entry.key)
+                    values.append(hash_entry.value)
+                    tombstones.append(hash_entry.is_tombstone)
+            if indices:
+                yield indices, hashes, keys, values, bytes(tombstones)
+
+    @classmethod
+    def load(cls, path: str) -> "HashMap":
+        """This method builds a hash map from a snapshot written by dump. Every entry and tombstone is put straight
+        back in the bucket it occupied, with its stored hash, so no key is hashed or probed for. Should the hash
+        function now give different hashes, as the built-in hash does in another process, the entries are put
+        into the map instead.
+
+        Args:
+            path (str): path of the snapshot file.
+
+        Returns:
+            HashMap: a new HashMap holding the snapshot's entries.
+        """
+        snapshot = read_snapshot(path, 'OA')
+        header = next(snapshot)
+        hash_map = cls(1, header['function'], **header['options'])
+        if header['rehash']:
+            hash_map.reserve(header['size'])
+            for indices, hashes, keys, values, tombstones in snapshot:
+                for key, value, is_tombstone in zip(keys, values, tombstones):
+                    if not is_tombstone:
+                        hash_map.put(key, value)
+            return hash_map
+
+        # Place each entry straight into the map's bucket array, so no chunk is copied and only one is held at a time
+        buckets = DynamicArray([None] * header['capacity'])
+        set_at_index = buckets.set_at_index
+        for indices, hashes, keys, values, tombstones in snapshot:
+            for index, hash, key, value, is_tombstone in zip(indices, hashes, keys, values, tombstones):
+                hash_entry = HashEntry(key, value, hash)
+                if is_tombstone:
+                    hash_entry.is_tombstone = True
+                set_at_index(index, hash_entry)
+        hash_map._buckets, hash_map._capacity = buckets, header['capacity']
+        hash_map._size, hash_map._tombstones = header['size'], header['tombstones']
+        hash_map._min_capacity = header['min_capacity']
+        return hash_map
+
     def put(self, key: str, value: object) -> None:
         """This method updates the key/value pair in the hash map. If the given key already exists in
         the hash map, its associated value must be replaced with the new value. If the given key is
@@ -98,31 +222,251 @@ class HashMap:
             key (str): key to be added or updated within the HashMap.
             value (object): value to be added to the HashMap.
         """
-        # Resize HashMap if table load is too high
-        if self.table_load() >= 0.5:
-            self.resize_table(self._capacity * 2)
+        self._put_hashed(key, value, self._hash(key))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """This private method performs a put using an already computed hash of the key, so that the hash
+        function is called at most once per operation.
+
+        Args:
+            key (str): key to be added or updated within the HashMap.
+            value (object): value to be added to the HashMap.
+            hash (int): full hash of the key, as returned by _hash.
+        """
+        # If key already exists, update the value in place
+        hash_entry, added = self._entry(key, value, hash)
+        if not added:
+            hash_entry.value = value
+
+    def _entry(self, key: str, default: object, hash: int) -> tuple[HashEntry, bool]:
+        """This private method returns the live entry holding the given key, adding an entry with the given default
+        value if the key is not in the HashMap, with a single probe sequence.
+
+        Args:
+            key (str): key to be found or added.
+            default (object): value of the entry added if the key is not in the HashMap.
+            hash (int): full hash of the key, as returned by _hash.
+
+        Returns:
+            tuple[HashEntry, bool]: the key's entry, and whether it was added.
+        """
+        # Resize HashMap if table load is too high. Otherwise, clear tombstones with a rehash at the current capacity
+        # once there are too many of them, or once they would push live entries and tombstones past the max load.
+        # Either only makes room for a new entry, so neither happens if the key is already in the HashMap: updating
+        # a value never rehashes.
+        grow = self.table_load() >= self._max_load
+        if grow or self._tombstones and (self._tombstones >= self._tombstone_threshold * self._capacity or
+                                         (self._size + self._tombstones) / self._capacity >= self._max_load):
+            hash_entry = self._find_entry(key, hash)
+            if hash_entry is not None:
+                return hash_entry, False
+            if grow:
+                self._resize(grown_capacity(self._capacity, self._growth_factor))
+            elif self._incremental_resize:
+                self._start_rehash(self._capacity)
+            else:
+                self._rehash(self._capacity)
+
+        # During an incremental resize, a key that has not been migrated yet is found where it is
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
+            if self._old_buckets is not None:
+                hash_index = self._probe(self._old_buckets, self._old_capacity, key, hash, self._rehash_index)
+                if hash_index is not None:
+                    return self._old_buckets[hash_index], False
+
+        if self._probing == 'robin_hood':
+            return self._entry_robin_hood(key, default, hash)
 
         # Initialize the initial hash index, a variable for the associated bucket, and a value for the probe
-        hash_index = self._hash_function(key) % self._capacity
+        hash_index = hash % self._capacity
         bucket = self._buckets[hash_index]
         probe = 1
-
-        # Quadratically probe for an empty bucket, matching key, or tombstoned value
-        while bucket is not None and not bucket.is_tombstone and bucket.key != key:
-            hash_index = (self._hash_function(key) + probe ** 2) % self._capacity
+        tombstone_index = None
+
+        # Probe for an empty bucket or matching key, remembering the first tombstone passed. Stop once every bucket
+        # the probe sequence can reach has been visited.
+        limit = probe_limit(self._capacity, self._power_of_two, self._probing)
+        while bucket is not None and probe <= limit:
+            if bucket.is_tombstone:
+                if tombstone_index is None:
+                    tombstone_index = hash_index
+            elif bucket.hash == hash and bucket.key == key:
+                return bucket, False
+            hash_index = (hash + self._offset(hash, probe, self._capacity)) % self._capacity
             bucket = self._buckets[hash_index]
             probe += 1
 
-        # If bucket is "empty", place the new entry in bucket
-        if bucket is None or bucket.is_tombstone:
-            self._buckets.set_at_index(hash_index, HashEntry(key, value))
-            self._size += 1
-            return
+        # If every bucket the probe sequence can reach is occupied, which quadratic probing allows above a load of
+        # 0.5, grow the table and try again
+        if bucket is not None and tombstone_index is None:
+            self._rehash(round_capacity(grown_capacity(self._capacity, self._growth_factor), self._power_of_two))
+            return self._entry(key, default, hash)
+
+        # Place the new entry in the first tombstone passed, or else in the empty bucket found
+        if tombstone_index is not None:
+            hash_index = tombstone_index
+            self._tombstones -= 1
+        hash_entry = HashEntry(key, default, hash)
+        self._buckets.set_at_index(hash_index, hash_entry)
+        self._size += 1
+        self._modifications += 1
+        return hash_entry, True
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """This method returns the value associated with the given key. If the given key is not in the hash map,
+        it is added with the given default value, which is returned.
 
-        # If key already exists, update the value
-        if bucket.key == key:
-            self._buckets.set_at_index(hash_index, HashEntry(key, value))
-            return
+        Args:
+            key (str): key whose value is to be returned.
+            default (object): value to be stored with the key if it is not in the HashMap.
+
+        Returns:
+            object: the key's value.
+        """
+        return self._entry(key, default, self._hash(key))[0].value
+
+    def increment(self, key: str, delta: object = 1) -> object:
+        """This method adds delta to the value associated with the given key, in place, with a single hash and
+        probe sequence. If the given key is not in the hash map, it is added with delta as its value.
+
+        Args:
+            key (str): key whose value is to be incremented.
+            delta (object): amount to add to the key's value.
+
+        Returns:
+            object: the key's new value.
+        """
+        hash_entry, added = self._entry(key, delta, self._hash(key))
+        if not added:
+            hash_entry.value += delta
+        return hash_entry.value
+
+    def update(self, key: str, function: callable, default: object = None) -> object:
+        """This method replaces the value associated with the given key by function(value), in place, with a
+        single hash and probe sequence. If the given key is not in the hash map, it is added with
+        function(default). If function raises an exception, no key or value is changed, but adding a new key
+        may already have resized the table or cleared its tombstones.
+
+        Args:
+            key (str): key whose value is to be updated.
+            function (callable): function computing the new value from the current one.
+            default (object): value passed to function if the key is not in the HashMap.
+
+        Returns:
+            object: the key's new value.
+        """
+        hash = self._hash(key)
+        hash_entry, added = self._entry(key, default, hash)
+        try:
+            hash_entry.value = function(hash_entry.value)
+        except BaseException:
+            if added:
+                self._remove_hashed(key, hash)
+            raise
+        return hash_entry.value
+
+    def put_many(self, items, values=None) -> None:
+        """This method puts every key/value pair of the given iterable into the hash map, as put would. Every
+        key is hashed in a single pass, and the table is resized at most once, up front, to hold the incoming
+        pairs, rather than repeatedly as they are added. Keys and values may also be given as two sequences,
+        such as NumPy arrays; see _hash_many.
+
+        Args:
+            items (iterable): (key, value) pairs to be added or updated within the HashMap, or keys if values is given.
+            values (iterable): values to be stored with the keys given as items.
+        """
+        if values is None:
+            items = list(items)
+            keys, values = [key for key, value in items], [value for key, value in items]
+        else:
+            keys, values = items, as_list(values)
+        keys, hashes = self._hash_many(keys)
+        self._presize(self._size + len(keys))
+        for key, value, hash in zip(keys, values, as_list(hashes)):
+            self._put_hashed(key, value, hash)
+
+    def _hash_many(self, keys) -> tuple:
+        """This private method returns the given keys as a list, and the full hash of each as _hash would compute
+        it. If NumPy is installed, the keys are a NumPy array and the hash function has a vectorized version (such
+        as hash_function_int), every hash is computed in one vectorized call and returned as a NumPy array."""
+        return hash_many(self._hash_function, keys, mix=self._power_of_two)
+
+    def _presize(self, size: int) -> None:
+        """This private method grows the table, if needed, so that putting up to the given number of entries causes
+        no further resize.
+
+        Args:
+            size (int): number of entries the table must hold
+        """
+        new_capacity = self._capacity_for(size)
+        if new_capacity > self._capacity:
+            self._resize(new_capacity)
+
+    def _capacity_for(self, size: int) -> int:
+        """This private method returns the smallest valid capacity that holds the given number of entries without
+        reaching the max load before the last one is put.
+
+        Args:
+            size (int): number of entries the table must hold
+
+        Returns:
+            int: prime (or power of two) capacity for the map's load policy
+        """
+        return round_capacity(max(1, int((size - 1) / self._max_load) + 1), self._power_of_two)
+
+    def _entry_robin_hood(self, key: str, default: object, hash: int) -> tuple[HashEntry, bool]:
+        """This private method performs _entry with Robin Hood probing. Buckets are probed linearly; as entries are
+        kept ordered by their distance from their home bucket, the key cannot be present past an entry closer to its
+        home than the probe is, and the new entry is inserted there.
+
+        Args:
+            key (str): key to be found or added.
+            default (object): value of the entry added if the key is not in the HashMap.
+            hash (int): full hash of the key, as returned by the hash function.
+
+        Returns:
+            tuple[HashEntry, bool]: the key's entry, and whether it was added.
+        """
+        hash_index = hash % self._capacity
+        bucket = self._buckets[hash_index]
+        distance = 0
+        while bucket is not None and (hash_index - bucket.hash) % self._capacity >= distance:
+            if bucket.hash == hash and bucket.key == key:
+                return bucket, False
+            hash_index = (hash_index + 1) % self._capacity
+            bucket = self._buckets[hash_index]
+            distance += 1
+
+        hash_entry = HashEntry(key, default, hash)
+        self._displace(self._buckets, self._capacity, hash_entry, hash_index, distance)
+        self._size += 1
+        self._modifications += 1
+        return hash_entry, True
+
+    @staticmethod
+    def _displace(buckets: DynamicArray, capacity: int, hash_entry: HashEntry, hash_index: int, distance: int) -> None:
+        """This private method inserts an entry into a Robin Hood bucket array, starting at hash_index, distance
+        buckets from its home. Whenever an occupant is closer to its own home than the entry being inserted, the
+        two are swapped and insertion continues with the displaced occupant.
+
+        Args:
+            buckets (DynamicArray): bucket array to insert into
+            capacity (int): capacity of the bucket array
+            hash_entry (HashEntry): entry to insert, with its hash stored
+            hash_index (int): bucket to start at
+            distance (int): distance of hash_index from the entry's home bucket
+        """
+        bucket = buckets[hash_index]
+        while bucket is not None:
+            occupant_distance = (hash_index - bucket.hash) % capacity
+            if occupant_distance < distance:
+                buckets.set_at_index(hash_index, hash_entry)
+                hash_entry, distance = bucket, occupant_distance
+            hash_index = (hash_index + 1) % capacity
+            bucket = buckets[hash_index]
+            distance += 1
+        buckets.set_at_index(hash_index, hash_entry)
 
     def resize_table(self, new_capacity: int) -> None:
         """This method changes the capacity of the underlying table, rehashing all elements in the process.
@@ -134,26 +478,224 @@ class HashMap:
         if new_capacity < self._size:
             return
 
-        # Evaluate if new capacity is prime, if not increment to next prime number
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Evaluate if new capacity is prime (or a power of two), if not increment to the next one
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
 
-        # Initialize conditions for new HashMap, create variable to hold values of old array
-        self._size = 0
-        self._capacity = new_capacity
-        old_array = self._buckets
-        self._buckets = DynamicArray()
+        # Grow the new capacity until the load stays below the max load, as re-putting every entry would have done
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = round_capacity(grown_capacity(new_capacity, self._growth_factor), self._power_of_two)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = new_capacity
+        self._rehash(new_capacity)
+
+    def reserve(self, size: int) -> None:
+        """This method grows the table, if needed, to the capacity that holds the given number of entries under
+        the map's load policy, so that putting up to that many entries never rehashes. Like a capacity passed to
+        resize_table, the reserved capacity becomes the floor for automatic shrinking.
+
+        Args:
+            size (int): number of entries to make room for
+        """
+        new_capacity = self._capacity_for(size)
+        if new_capacity > self._capacity:
+            self._min_capacity = new_capacity
+            self._rehash(new_capacity)
+
+    def migrate(self, bucket_count: int) -> bool:
+        """This method advances an in-progress incremental resize by moving the entries of up to bucket_count old
+        buckets into the new bucket array, on top of the few that every operation moves. It lets a caller spread a
+        resize over its own idle time instead of over later operations.
+
+        Args:
+            bucket_count (int): maximum number of old buckets to migrate
+
+        Returns:
+            bool: True if the resize is still in progress afterwards, otherwise False
+        """
+        if self._old_buckets is not None:
+            self._migrate(bucket_count)
+        return self._old_buckets is not None
+
+    def _mixed_hash(self, key: str) -> int:
+        """This private method hashes a key in power-of-two mode, mixing the hash function's value so that the low
+        bits used as the bucket index depend on every bit of the hash."""
+        return mix_hash(self._hash_function(key))
 
+    def _resize(self, new_capacity: int) -> None:
+        """This private method resizes the table, incrementally if the map was created with incremental_resize.
+
+        Args:
+            new_capacity (int): requested new capacity
+        """
+        if self._incremental_resize:
+            self._start_rehash(new_capacity)
+        else:
+            self._rehash(round_capacity(new_capacity, self._power_of_two))
+
+    def _rehash(self, new_capacity: int) -> None:
+        """This private method moves every live entry, including those an incremental resize has not migrated yet,
+        into a new bucket array of the given capacity. Entries are placed using their stored hash and reused as-is:
+        keys are known to be unique, so no duplicate checks, load checks or allocations are needed, and tombstones
+        are dropped.
+
+        Args:
+            new_capacity (int): capacity of the new bucket array, assumed valid and large enough for the map
+        """
         # Fill in new array with None objects to adjust underlying indices
-        for i in range(new_capacity):
-            self._buckets.append(None)
+        new_array = DynamicArray([None] * new_capacity)
+
+        # Collect the current bucket array and the part of an incremental resize's old array not yet migrated
+        sources = [(self._buckets, self._capacity, 0)]
+        if self._old_buckets is not None:
+            sources.append((self._old_buckets, self._old_capacity, self._rehash_index))
+
+        # Place each live entry in the first empty bucket of its probe sequence. Should quadratic probing find no
+        # empty bucket, start over with a larger array.
+        for buckets, capacity, start in sources:
+            for i in range(start, capacity):
+                hash_entry = buckets.get_at_index(i)
+                if hash_entry is not None and not hash_entry.is_tombstone:
+                    if not self._place(new_array, new_capacity, hash_entry):
+                        self._rehash(round_capacity(grown_capacity(new_capacity, self._growth_factor),
+                                                    self._power_of_two))
+                        return
+
+        self._capacity = new_capacity
+        self._modifications += 1
+        self._buckets = new_array
+        self._tombstones = 0
+        self._old_buckets, self._old_capacity, self._rehash_index = None, 0, 0
+
+    def _place(self, buckets: DynamicArray, capacity: int, hash_entry: HashEntry) -> bool:
+        """This private method stores an entry whose key is known not to be live in the given bucket array in the
+        first empty or tombstoned bucket of its probe sequence, or by displacement under Robin Hood probing. The
+        bucket array must be the current one or a new one that has no tombstones.
+
+        Args:
+            buckets (DynamicArray): bucket array to place the entry in
+            capacity (int): capacity of the bucket array
+            hash_entry (HashEntry): entry to place, with its hash stored
+
+        Returns:
+            bool: False if every bucket the probe sequence can reach is occupied, otherwise True.
+        """
+        hash_index = hash_entry.hash % capacity
+        if self._probing == 'robin_hood':
+            self._displace(buckets, capacity, hash_entry, hash_index, 0)
+            return True
+
+        bucket = buckets[hash_index]
+        probe = 1
+        limit = probe_limit(capacity, self._power_of_two, self._probing)
+        while bucket is not None and not bucket.is_tombstone:
+            if probe > limit:
+                return False
+            hash_index = (hash_entry.hash + self._offset(hash_entry.hash, probe, capacity)) % capacity
+            bucket = buckets[hash_index]
+            probe += 1
+        if bucket is not None:
+            self._tombstones -= 1
+        buckets.set_at_index(hash_index, hash_entry)
+        return True
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """This private method begins an incremental resize. The current bucket array becomes the old array and
+        a new, empty array of the next valid capacity is installed; entries are moved over later by _migrate.
+
+        Args:
+            new_capacity (int): requested capacity of the new bucket array
+        """
+        self._finish_rehash()
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+
+        self._old_buckets, self._old_capacity, self._rehash_index = self._buckets, self._capacity, 0
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._modifications += 1
+        self._tombstones = 0
 
-        # Iterate over entries of old array, if valid, hash and put into new map
-        for i in range(old_array.length()):
-            hash_entry = old_array.get_at_index(i)
-            if hash_entry:
-                if hash_entry.is_tombstone is False:
-                    self.put(hash_entry.key, hash_entry.value)
+    def _migrate(self, bucket_count: int) -> None:
+        """This private method moves the live entries of the next bucket_count old buckets into the new bucket
+        array, ending the incremental resize once every old bucket has been migrated. Migrated entries are left
+        in the old array; lookups treat old buckets below _rehash_index as already moved.
+
+        Args:
+            bucket_count (int): maximum number of old buckets to migrate
+        """
+        end = min(self._rehash_index + bucket_count, self._old_capacity)
+        for index in range(self._rehash_index, end):
+            hash_entry = self._old_buckets[index]
+            if hash_entry is not None and not hash_entry.is_tombstone:
+                if not self._place(self._buckets, self._capacity, hash_entry):
+                    # Quadratic probing found no empty bucket; finish with a synchronous rehash into a larger array
+                    self._rehash_index = index
+                    self._rehash(round_capacity(grown_capacity(self._capacity, self._growth_factor),
+                                                self._power_of_two))
+                    return
+        self._rehash_index = end
+
+        if end == self._old_capacity:
+            self._old_buckets, self._old_capacity, self._rehash_index = None, 0, 0
+
+    def _finish_rehash(self) -> None:
+        """This private method migrates every remaining old bucket of an in-progress incremental resize."""
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def _probe(self, buckets: DynamicArray, capacity: int, key: str, hash: int, migrated: int = 0) -> int | None:
+        """This private method probes a bucket array for a live entry with the given key, skipping over tombstones.
+        Probing stops at an empty bucket, once every bucket the probe sequence can reach has been visited, or, under
+        Robin Hood probing, at an entry closer to its home bucket than the probe is.
+
+        Args:
+            buckets (DynamicArray): bucket array to search
+            capacity (int): capacity of the bucket array
+            key (str): key to search for
+            hash (int): full hash of the key
+            migrated (int): buckets below this index hold entries already moved by an incremental resize
+
+        Returns:
+            int: index of the matching live entry, or None if there is none
+        """
+        robin_hood = self._probing == 'robin_hood'
+        limit = probe_limit(capacity, self._power_of_two, self._probing)
+        hash_index = hash % capacity
+        bucket = buckets[hash_index]
+        probe = 1
+        while bucket is not None and probe <= limit:
+            if hash_index >= migrated and not bucket.is_tombstone and bucket.hash == hash and bucket.key == key:
+                return hash_index
+            if robin_hood and (hash_index - bucket.hash) % capacity < probe - 1:
+                return None
+            hash_index = (hash + self._offset(hash, probe, capacity)) % capacity
+            bucket = buckets[hash_index]
+            probe += 1
+        return None
+
+    def _offset(self, hash: int, probe: int, capacity: int) -> int:
+        """This private method returns how far the given probe of a key's probe sequence is from its home bucket.
+
+        Args:
+            hash (int): full hash of the key
+            probe (int): number of the probe, starting at 1 for the first bucket after the home bucket
+            capacity (int): capacity of the bucket array being probed
+
+        Returns:
+            int: offset to add to the hash before reducing it to a bucket index
+        """
+        if self._probing == 'quadratic':
+            # Triangular numbers visit every bucket of a power-of-two table; squares visit only a few of them
+            if self._power_of_two:
+                return probe * (probe + 1) // 2
+            return probe ** 2
+        if self._probing == 'double':
+            # The step comes from the hash bits above the bucket index; a prime capacity makes every step coprime, as
+            # does an odd step with a power-of-two capacity
+            if self._power_of_two:
+                return probe * (hash // capacity % capacity | 1)
+            return probe * (1 + hash // capacity % (capacity - 1))
+        return probe
 
     def table_load(self) -> float:
         """This method returns the current hash table load factor.
@@ -169,7 +711,9 @@ class HashMap:
         Returns:
             int: number of empty buckets in the HashMap.
         """
-        return self._capacity - self._size
+        # Tombstoned buckets are not empty; they still lengthen probe sequences
+        self._finish_rehash()
+        return self._capacity - self._size - self._tombstones
 
     def get(self, key: str) -> object:
         """This method returns the value associated with the given key. If the key is not in the hash
@@ -181,11 +725,11 @@ class HashMap:
         Returns:
             object: value associated with the passed key.
         """
-        # Call to quadratic probe to find empty space or matching key
-        bucket = self._quadratic_probe(key)
+        # Probe for a matching live entry
+        bucket = self._find_entry(key, self._hash(key))
 
-        #  # If a matching valid Hash Entry exists, return its value
-        if bucket and bucket.key == key and not bucket.is_tombstone:
+        # If a matching valid Hash Entry exists, return its value
+        if bucket is not None:
             return bucket.value
 
     def contains_key(self, key: str) -> bool:
@@ -197,13 +741,25 @@ class HashMap:
         Returns:
             bool: True if the given key is in the HashMap, otherwise False.
         """
-        # Call to quadratic probe to find empty space or matching key
-        bucket = self._quadratic_probe(key)
+        # Probe for a matching live entry, return bool indicating if one was found
+        return self._find_entry(key, self._hash(key)) is not None
 
-        # Return bool indicating if a Hash Entry was found
-        if bucket:
-            return True
-        return False
+    def get_many(self, keys) -> DynamicArray:
+        """This method returns the values associated with each key of the given iterable, as get would,
+        hashing every key in a single pass first.
+
+        Args:
+            keys (iterable): keys of the values to be retrieved.
+
+        Returns:
+            DynamicArray: the value associated with each key, in order, or None for keys not in the HashMap.
+        """
+        keys, hashes = self._hash_many(keys)
+        values = []
+        for key, hash in zip(keys, as_list(hashes)):
+            hash_entry = self._find_entry(key, hash)
+            values.append(hash_entry.value if hash_entry is not None else None)
+        return DynamicArray(values)
 
     def remove(self, key: str) -> None:
         """This method removes the given key and its associated value from the hash map. If the key
@@ -212,13 +768,120 @@ class HashMap:
         Args:
             key (str): key of the object to be removed.
         """
-        # Call to quadratic probe to find empty space or matching key
-        bucket = self._quadratic_probe(key)
+        if self._remove_hashed(key, self._hash(key)):
+            self._shrink()
+
+    def pop(self, key: str, default: object = None) -> object:
+        """This method removes the given key from the hash map and returns its associated value, with a single
+        hash and probe sequence. If the key is not in the hash map, the default is returned.
+
+        Args:
+            key (str): key of the object to be removed.
+            default (object): value to return if the key is not in the HashMap.
 
-        # If a matching valid Hash Entry exists, tombstone it and decrement size
-        if bucket and bucket.key == key and not bucket.is_tombstone:
+        Returns:
+            object: the key's value, or default.
+        """
+        hash_entry = self._pop_hashed(key, self._hash(key))
+        if hash_entry is None:
+            return default
+        self._shrink()
+        return hash_entry.value
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """This private method removes a key using an already computed hash of the key, without shrinking the
+        table afterwards.
+
+        Args:
+            key (str): key of the object to be removed.
+            hash (int): full hash of the key, as returned by _hash.
+
+        Returns:
+            bool: True if the key was in the HashMap, otherwise False.
+        """
+        return self._pop_hashed(key, hash) is not None
+
+    def _pop_hashed(self, key: str, hash: int) -> HashEntry | None:
+        """This private method removes a key using an already computed hash of the key, without shrinking the
+        table afterwards, and returns its entry.
+
+        Args:
+            key (str): key of the object to be removed.
+            hash (int): full hash of the key, as returned by _hash.
+
+        Returns:
+            HashEntry: the removed entry, or None if the key was not in the HashMap.
+        """
+        # Migrate a few old buckets if an incremental resize is in progress
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
+
+        # Probe the current bucket array for a matching live entry. Robin Hood probing closes the gap by shifting
+        # the following entries back; otherwise, tombstone the entry and count it.
+        hash_index = self._probe(self._buckets, self._capacity, key, hash)
+        if hash_index is not None:
+            hash_entry = self._buckets[hash_index]
             self._size -= 1
-            bucket.is_tombstone = True
+            self._modifications += 1
+            if self._probing == 'robin_hood':
+                self._backward_shift(hash_index)
+            else:
+                hash_entry.is_tombstone = True
+                self._tombstones += 1
+            return hash_entry
+
+        # During an incremental resize, tombstone a matching entry still waiting in the old array; the old array is
+        # discarded once migrated, so its tombstones are not counted.
+        if self._old_buckets is not None:
+            hash_index = self._probe(self._old_buckets, self._old_capacity, key, hash, self._rehash_index)
+            if hash_index is not None:
+                hash_entry = self._old_buckets[hash_index]
+                self._size -= 1
+                self._modifications += 1
+                hash_entry.is_tombstone = True
+                return hash_entry
+        return None
+
+    def remove_many(self, keys) -> None:
+        """This method removes every key of the given iterable from the hash map, as remove would. Every key
+        is hashed in a single pass, and the table shrinks at most once, after all the removals.
+
+        Args:
+            keys (iterable): keys of the objects to be removed.
+        """
+        keys, hashes = self._hash_many(keys)
+        removed = False
+        for key, hash in zip(keys, as_list(hashes)):
+            removed |= self._remove_hashed(key, hash)
+        if removed:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        """This private method shrinks the table once its load falls below the shrink threshold, to a capacity at
+        which the load is max_load / growth_factor, but never below the capacity the map was created with or last
+        explicitly resized to."""
+        if self.table_load() >= self._shrink_load or self._old_buckets is not None:
+            return
+
+        new_capacity = max(self._min_capacity, int(self._size * self._growth_factor / self._max_load))
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+        if new_capacity < self._capacity:
+            self._resize(new_capacity)
+
+    def _backward_shift(self, hash_index: int) -> None:
+        """This private method empties a Robin Hood bucket, shifting each following entry that is not in its home
+        bucket back by one so that no lookup can stop early at the gap.
+
+        Args:
+            hash_index (int): index of the bucket to empty
+        """
+        next_index = (hash_index + 1) % self._capacity
+        bucket = self._buckets[next_index]
+        while bucket is not None and (next_index - bucket.hash) % self._capacity != 0:
+            self._buckets.set_at_index(hash_index, bucket)
+            hash_index, next_index = next_index, (next_index + 1) % self._capacity
+            bucket = self._buckets[next_index]
+        self._buckets.set_at_index(hash_index, None)
 
     def get_keys_and_values(self) -> DynamicArray:
         """This method returns a dynamic array where each index contains a tuple of a key/value pair
@@ -227,6 +890,9 @@ class HashMap:
         Returns:
             DynamicArray: A dynamic array containing all the key value pairs of the HashMap.
         """
+        # Complete any incremental resize so only the current bucket array needs examining
+        self._finish_rehash()
+
         # Initialize array to hold tuples and be returned
         return_array = DynamicArray()
 
@@ -239,49 +905,136 @@ class HashMap:
 
     def clear(self) -> None:
         """This method clears the contents of the hash map without changing the underlying hash table capacity."""
-        # Set the value of every bucket to None, set size to zero
+        # Abandon any incremental resize, set the value of every bucket to None, set size and tombstones to zero
+        self._old_buckets, self._old_capacity, self._rehash_index = None, 0, 0
         for i in range(self._capacity):
             self._buckets.set_at_index(i, None)
         self._size = 0
+        self._modifications += 1
+        self._tombstones = 0
 
-    def __iter__(self):
-        """his method enables the hash map to iterate across itself."""
-        self._index = 0
-        return self
+    def memory_usage(self) -> dict:
+        """This method reports the memory used by the hash map in bytes, as measured by sys.getsizeof: the bucket
+        arrays and their lists, the HashEntry objects (reported as nodes, and including tombstones), and the keys
+        and values. Keys and values are measured shallowly, and an object stored more than once is counted once.
 
-    def __next__(self):
-        """This method will return the next item in the hash map, based on the current location of the
-        iterator. Only Active entries are iterated over."""
-        # If the next step in iteration is not a valid HashEntry, continue to iterate
-        try:
-            entry = self._buckets[self._index]
-            while entry is None or entry.is_tombstone:
-                self._index += 1
-                entry = self._buckets[self._index]
-        except DynamicArrayException:
-            raise StopIteration
+        Returns:
+            dict: bytes spent on 'buckets', 'nodes', 'keys' and 'values', and their 'total'.
+        """
+        usage = {'buckets': 0, 'nodes': 0, 'keys': 0, 'values': 0}
+        seen = set()
+
+        # Examine the current bucket array, and the old one during an incremental resize; entries in both are
+        # only counted once
+        for buckets in (self._buckets, self._old_buckets):
+            if buckets is None:
+                continue
+            usage['buckets'] += sizeof_unique([buckets], seen)
+            entries = [buckets[i] for i in range(buckets.length())
+                       if buckets[i] is not None and id(buckets[i]) not in seen]
+            usage['nodes'] += sizeof_unique(entries, seen)
+            usage['keys'] += sizeof_unique([entry.key for entry in entries], seen)
+            usage['values'] += sizeof_unique([entry.value for entry in entries], seen)
+
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def __iter__(self) -> "HashMapIterator":
+        """This method returns a new iterator over the live entries of the hash map. Iterations are independent of
+        each other; see HashMapIterator."""
+        return HashMapIterator(self)
+
+    def keys(self):
+        """This method returns a lazy iterator over the keys of the hash map, which copies nothing. Like iterating
+        over the map itself, it raises RuntimeError if keys are added or removed before it is exhausted.
 
-        self._index += 1
-        return entry
+        Returns:
+            iterator: the keys, in bucket order.
+        """
+        return (entry.key for entry in HashMapIterator(self))
 
-    def _quadratic_probe(self, key: str) -> object | None:
-        """This private method returns the appropriate hash index of a given key while accounting for collision using
-        quadratic open addressing.
+    def values(self):
+        """This method returns a lazy iterator over the values of the hash map; see keys.
 
         Returns:
-            object: if there exists a matching key, then the corresponding object is returned. Otherwise, None.
+            iterator: the values, in bucket order.
         """
-        # Initialize the initial hash index, a variable for the associated bucket, and a value for the probe
-        hash_index = self._hash_function(key) % self._capacity
-        bucket = self._buckets[hash_index]
-        probe = 1
+        return (entry.value for entry in HashMapIterator(self))
 
-        # Quadratically probe for an empty bucket or matching key. Skip over tombstones. Return result.
-        while bucket is not None and bucket.key != key:
-            hash_index = (self._hash_function(key) + probe ** 2) % self._capacity
-            bucket = self._buckets[hash_index]
-            probe += 1
-        return bucket
+    def items(self):
+        """This method returns a lazy iterator over the key/value pairs of the hash map; see keys. Unlike
+        get_keys_and_values, no array of every pair is built.
+
+        Returns:
+            iterator: (key, value) tuples, in bucket order.
+        """
+        return ((entry.key, entry.value) for entry in HashMapIterator(self))
+
+    def _find_entry(self, key: str, hash: int) -> HashEntry | None:
+        """This private method returns the live entry with the given key while accounting for collision using
+        the map's probing strategy.
+
+        Args:
+            key (str): key to search for.
+            hash (int): full hash of the key, as returned by _hash.
+
+        Returns:
+            HashEntry: if there exists a matching live key, then the corresponding entry is returned. Otherwise, None.
+        """
+        # Migrate a few old buckets if an incremental resize is in progress
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
+
+        # Probe the current bucket array for a matching live entry
+        hash_index = self._probe(self._buckets, self._capacity, key, hash)
+        if hash_index is not None:
+            return self._buckets[hash_index]
+
+        # During an incremental resize, a key not found in the new array may still be waiting in the old one
+        if self._old_buckets is not None:
+            hash_index = self._probe(self._old_buckets, self._old_capacity, key, hash, self._rehash_index)
+            if hash_index is not None:
+                return self._old_buckets[hash_index]
+        return None
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap, yielding every live entry
+    Each iteration has its own iterator object. It raises RuntimeError if
+    keys are added to or removed from the map, or the map is rehashed, while
+    the iteration is in progress; updating values is allowed.
+    """
+
+    __slots__ = ('_map', '_modifications', '_index')
+
+    def __init__(self, hash_map: HashMap) -> None:
+        """Initialize an iterator at the first bucket of the given map."""
+        # Complete any incremental resize so only the current bucket array needs examining
+        hash_map._finish_rehash()
+        self._map = hash_map
+        self._modifications = hash_map._modifications
+        self._index = 0
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> HashEntry:
+        """Obtain the next live entry, skipping empty and tombstoned buckets."""
+        hash_map = self._map
+        if hash_map._modifications != self._modifications:
+            raise RuntimeError("HashMap changed during iteration")
+
+        buckets, index = hash_map._buckets, self._index
+        while index < hash_map._capacity:
+            entry = buckets[index]
+            index += 1
+            if entry is not None and not entry.is_tombstone:
+                self._index = index
+                return entry
+        self._index = index
+        raise StopIteration
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -492,3 +1245,15 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nupdating values during iteration")
+    print("--------------------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(6):
+        m.put('k' + str(i), i)
+    # The table is at its max load, but updating a value must not resize it under the iterator
+    print(m.get_capacity())
+    for key, value in m.items():
+        m.put(key, value * 10)
+        m.increment('k0')
+    print(m.get_capacity(), sorted(m.items()))
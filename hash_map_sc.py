@@ -8,74 +8,89 @@
 #              getting the value of a known key, determining the table load, determining the amount of empty buckets,
 #              resizing the HashMap, clearing the HashMap, as well as obtaining an array of all key/value pairs.
 #              There also exists a separate method for finding the mode of a dynamic array using Hash-maping.
+#              The maximum load factor, growth factor and shrink threshold are configurable; the table shrinks after
+#              mass removals, but never below the capacity it was created with or last explicitly resized to.
+#              An optional incremental resize mode spreads rehashing over later operations: the old and new bucket
+#              arrays coexist and every operation migrates a bounded number of old buckets.
+#              Buckets are created lazily: an empty bucket is None rather than an empty LinkedList.
+#              An optional power-of-two mode replaces prime capacities: resizing needs no prime search, and hashes are
+#              passed through a mixing finalizer so that the low bits used as the bucket index are well distributed.
+#              Read-modify-write operations (setdefault, increment, update and pop) update nodes in place with a single
+#              hash and chain walk; find_mode counts with increment, and count_many increments a batch of keys.
+#              keys(), values() and items() iterate lazily, each with its own iterator, and fail fast if keys are
+#              added or removed during the iteration.
 
 
-from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+from array import array
+
+from a6_include import (SNAPSHOT_CHUNK_SIZE, DynamicArray, LinkedList, SLNode,
+                        as_list, bucket_indices, grown_capacity, hash_function_1, hash_function_2, hash_many,
+                        mix_hash, next_power_of_two, next_prime, read_snapshot, round_capacity, sizeof_unique,
+                        write_snapshot)
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental_resize: bool = False,
+                 rehash_step: int = 4,
+                 max_load: float = 1.0,
+                 growth_factor: float = 2.0,
+                 shrink_load: float = None,
+                 power_of_two: bool = False) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        The table grows by growth_factor once its load reaches max_load, and
+        shrinks when a removal leaves its load below shrink_load (by default
+        max_load / 8; 0 disables shrinking).
+        If incremental_resize is True, growing the table migrates rehash_step
+        old buckets per operation instead of rehashing everything at once.
+        If power_of_two is True, capacities are powers of two instead of primes
+        and every hash is mixed before use.
         """
-        self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        if max_load <= 0:
+            raise ValueError(f"max_load must be greater than 0, not {max_load}")
+        if growth_factor <= 1:
+            raise ValueError(f"growth_factor must be greater than 1, not {growth_factor}")
+        self._max_load = max_load
+        self._power_of_two = power_of_two
+        self._growth_factor = growth_factor
+        self._shrink_load = max_load / 8 if shrink_load is None else shrink_load
+
+        # capacity must be a prime number, or a power of two in power-of-two mode; empty buckets are None
+        self._capacity = next_power_of_two(capacity) if power_of_two else next_prime(capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
 
         self._hash_function = function
+
+        # Full hash of a key; mixed in power-of-two mode, where the bucket index is just its low bits
+        self._hash = self._mixed_hash if power_of_two else function
         self._size = 0
+        self._min_capacity = self._capacity
+
+        # Count of changes to the set of keys or to the table's layout; iterators fail fast when it changes
+        self._modifications = 0
+
+        # State of an in-progress incremental resize; old buckets below _rehash_index have been migrated
+        self._incremental_resize = incremental_resize
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_index = 0
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Empty (None) buckets are shown as empty lists
         """
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            bucket = self._buckets[i]
+            out += str(i) + ': ' + (str(bucket) if bucket is not None else 'SLL []') + '\n'
         return out
 
-    def _next_prime(self, capacity: int) -> int:
-        """
-        Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
-
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
-        """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
-
     def get_size(self) -> int:
         """
         Return size of map
@@ -92,6 +107,101 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def from_items(cls, items, function: callable = hash_function_1, expected_size: int = None,
+                   **options) -> "HashMap":
+        """This method builds a new hash map from an iterable of key/value pairs. The table is sized once, up
+        front, for expected_size nodes (by default, the number of pairs), so building the map never rehashes.
+
+        Args:
+            items (iterable): (key, value) pairs to put into the new HashMap.
+            function (callable): hash function of the new hash map
+            expected_size (int): number of nodes to size the table for.
+            **options: other HashMap constructor options, such as max_load or power_of_two.
+
+        Returns:
+            HashMap: a new HashMap holding the given pairs.
+        """
+        if expected_size is None:
+            items = list(items)
+            expected_size = len(items)
+
+        # Start from the smallest table, which reserve replaces with one sized for the map's load policy
+        hash_map = cls(1, function, **options)
+        hash_map.reserve(expected_size)
+        hash_map.put_many(items)
+        return hash_map
+
+    def dump(self, path: str) -> None:
+        """This method writes a binary snapshot of the hash map to a file: its capacity, hash function and options,
+        and the bucket index, stored hash, key and value of every node, written one chunk of nodes at a time. An
+        incremental resize in progress is completed first. The hash function must be one of HASH_FUNCTIONS.
+
+        Args:
+            path (str): path of the file to write
+        """
+        self._finish_rehash()
+        header = {'capacity': self._capacity, 'size': self._size, 'min_capacity': self._min_capacity,
+                  'options': {'incremental_resize': self._incremental_resize, 'rehash_step': self._rehash_step,
+                              'max_load': self._max_load, 'growth_factor': self._growth_factor,
+                              'shrink_load': self._shrink_load, 'power_of_two': self._power_of_two}}
+        write_snapshot(path, 'SC', self._hash_function, header, self._snapshot_chunks())
+
+    def _snapshot_chunks(self):
+        """This private generator yields the nodes of chunks of up to SNAPSHOT_CHUNK_SIZE buckets, each as columns:
+        arrays of bucket indices and stored hashes, and lists of keys and values. Each chain is listed from its
+        tail, so that inserting the nodes in order at the front of their buckets rebuilds every chain in its
+        original order."""
+        get_at_index = self._buckets.get_at_index
+        for chunk_start in range(0, self._capacity, SNAPSHOT_CHUNK_SIZE):
+            indices, hashes, keys, values = array('Q'), array('Q'), [], []
+            for index in range(chunk_start, min(chunk_start + SNAPSHOT_CHUNK_SIZE, self._capacity)):
+                bucket = get_at_index(index)
+                if bucket is not None:
+                    for node in reversed(list(bucket)):
+                        indices.append(index)
+                        hashes.append(node.hash)
+                        keys.append(node.key)
+                        values.append(node.value)
+            if indices:
+                yield indices, hashes, keys, values
+
+    @classmethod
+    def load(cls, path: str) -> "HashMap":
+        """This method builds a hash map from a snapshot written by dump. Every node is linked straight back into
+        the bucket it occupied, with its stored hash, so no key is hashed or compared. Should the hash function
+        now give different hashes, as the built-in hash does in another process, the pairs are put into the map
+        instead.
+
+        Args:
+            path (str): path of the snapshot file
+
+        Returns:
+            HashMap: a new HashMap holding the snapshot's pairs
+        """
+        snapshot = read_snapshot(path, 'SC')
+        header = next(snapshot)
+        hash_map = cls(1, header['function'], **header['options'])
+        if header['rehash']:
+            hash_map.reserve(header['size'])
+            for indices, hashes, keys, values in snapshot:
+                hash_map.put_many(keys, values)
+            return hash_map
+
+        # Link each node straight into the map's bucket array, so no chunk is copied and only one is held at a time
+        buckets = DynamicArray([None] * header['capacity'])
+        get_at_index, set_at_index = buckets.get_at_index, buckets.set_at_index
+        for indices, hashes, keys, values in snapshot:
+            for index, hash, key, value in zip(indices, hashes, keys, values):
+                bucket = get_at_index(index)
+                if bucket is None:
+                    bucket = LinkedList()
+                    set_at_index(index, bucket)
+                bucket.insert(key, value, hash)
+        hash_map._buckets, hash_map._capacity = buckets, header['capacity']
+        hash_map._size, hash_map._min_capacity = header['size'], header['min_capacity']
+        return hash_map
+
     def put(self, key: str, value: object) -> None:
         """This method updates the key/value pair in the hash map. If the given key already exists in
         the hash map, its associated value must be replaced with the new value. If the given key is
@@ -101,17 +211,210 @@ class HashMap:
             key (str): key to be added or updated in the hash map
             value (object): value to be stored in the hash map
         """
-        if self.table_load() >= 1:
-            self.resize_table(self._capacity * 2)
+        self._put_hashed(key, value, self._hash(key))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """This private method performs a put using an already computed hash of the key. The hash is stored
+        in the node so chain scans can reject other keys by hash and resizes never call the hash function.
+
+        Args:
+            key (str): key to be added or updated in the hash map
+            value (object): value to be stored in the hash map
+            hash (int): full hash of the key, as returned by _hash
+        """
+        buckets, index = self._locate(hash)
+
+        # The load check is only needed when a new node is added; updating a value never resizes
+        if self.table_load() >= self._max_load:
+            bucket = buckets[index]
+            if bucket is None or bucket.contains(key, hash) is None:
+                self._resize(grown_capacity(self._capacity, self._growth_factor))
+                buckets, index = self._locate(hash)
+        self._put_at(buckets, index, key, value, hash)
+
+    def _put_at(self, buckets: DynamicArray, index: int, key: str, value: object, hash: int) -> None:
+        """This private method performs a put into the bucket at the given index of the given bucket array,
+        which must be the key's bucket as returned by _locate.
+
+        Args:
+            buckets (DynamicArray): bucket array holding the key's bucket
+            index (int): index of the key's bucket
+            key (str): key to be added or updated in the hash map
+            value (object): value to be stored in the hash map
+            hash (int): full hash of the key, as returned by _hash
+        """
+        # Walk the chain once: overwrite the value of a matching node in place, otherwise insert a new node,
+        # creating the bucket's list if it is empty
+        bucket = buckets[index]
+        node = bucket.contains(key, hash) if bucket is not None else None
+        if node is not None:
+            node.value = value
+            return
+        if bucket is None:
+            bucket = LinkedList()
+            buckets[index] = bucket
+        bucket.insert(key, value, hash)
+        self._size += 1
+        self._modifications += 1
+
+    def increment(self, key: str, delta: object = 1) -> object:
+        """This method adds delta to the value associated with the given key, in place, with a single hash and
+        chain walk. If the given key is not in the hash map, it is added with delta as its value.
+
+        Args:
+            key (str): key whose value is to be incremented
+            delta (object): amount to add to the key's value
+
+        Returns:
+            object: the key's new value
+        """
+        return self._increment_hashed(key, delta, self._hash(key))
+
+    def _increment_hashed(self, key: str, delta: object, hash: int) -> object:
+        """This private method performs an increment using an already computed hash of the key.
+
+        Args:
+            key (str): key whose value is to be incremented
+            delta (object): amount to add to the key's value
+            hash (int): full hash of the key, as returned by _hash
+
+        Returns:
+            object: the key's new value
+        """
+        node, added = self._node(key, delta, hash)
+        if not added:
+            node.value += delta
+        return node.value
+
+    def _node(self, key: str, default: object, hash: int) -> tuple[SLNode, bool]:
+        """This private method returns the node holding the given key, adding a node with the given default value
+        if the key is not in the hash map, with a single chain walk.
+
+        Args:
+            key (str): key to be found or added
+            default (object): value of the node added if the key is not in the hash map
+            hash (int): full hash of the key, as returned by _hash
+
+        Returns:
+            tuple[SLNode, bool]: the key's node, and whether it was added
+        """
+        buckets, index = self._locate(hash)
+        bucket = buckets[index]
+        node = bucket.contains(key, hash) if bucket is not None else None
+        if node is not None:
+            return node, False
+
+        # The load check is only needed when a new node is added
+        if self.table_load() >= self._max_load:
+            self._resize(grown_capacity(self._capacity, self._growth_factor))
+            buckets, index = self._locate(hash)
+            bucket = buckets[index]
+        if bucket is None:
+            bucket = LinkedList()
+            buckets[index] = bucket
+        node = SLNode(key, default, None, hash)
+        bucket.insert_node(node)
+        self._size += 1
+        self._modifications += 1
+        return node, True
+
+    def count_many(self, keys) -> None:
+        """This method increments the value associated with each key of the given iterable by one, as increment
+        would, hashing every key in a single pass first. Keys not in the hash map are added with a count of 1.
+
+        Args:
+            keys (iterable): keys to be counted, such as a list or a NumPy array (see _hash_many)
+        """
+        keys, hashes = self._hash_many(keys)
+        increment = self._increment_hashed
+        for key, hash in zip(keys, as_list(hashes)):
+            increment(key, 1, hash)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """This method returns the value associated with the given key. If the given key is not in the hash map,
+        it is added with the given default value, which is returned.
+
+        Args:
+            key (str): key whose value is to be returned
+            default (object): value to be stored with the key if it is not in the hash map
+
+        Returns:
+            object: the key's value
+        """
+        return self._node(key, default, self._hash(key))[0].value
+
+    def update(self, key: str, function: callable, default: object = None) -> object:
+        """This method replaces the value associated with the given key by function(value), in place, with a
+        single hash and chain walk. If the given key is not in the hash map, it is added with function(default).
+        If function raises an exception, no key or value is changed, but adding a new key may already have
+        resized the table.
+
+        Args:
+            key (str): key whose value is to be updated
+            function (callable): function computing the new value from the current one
+            default (object): value passed to function if the key is not in the hash map
 
-        hash_index = self._hash_function(key) % self._capacity
+        Returns:
+            object: the key's new value
+        """
+        hash = self._hash(key)
+        node, added = self._node(key, default, hash)
+        try:
+            node.value = function(node.value)
+        except BaseException:
+            if added:
+                self._remove_hashed(key, hash)
+            raise
+        return node.value
+
+    def put_many(self, items, values=None) -> None:
+        """This method puts every key/value pair of the given iterable into the hash map, as put would. Every
+        key is hashed in a single pass, and the table is resized at most once, up front, to hold the incoming
+        pairs, rather than repeatedly as they are added. Keys and values may also be given as two sequences,
+        such as NumPy arrays; see _hash_many.
 
-        if self._buckets[hash_index].contains(key) is None:
-            self._buckets[hash_index].insert(key, value)
-            self._size += 1
+        Args:
+            items (iterable): (key, value) pairs to be added or updated in the hash map, or keys if values is given
+            values (iterable): values to be stored with the keys given as items
+        """
+        if values is None:
+            items = list(items)
+            keys, values = [key for key, value in items], [value for key, value in items]
         else:
-            self._buckets[hash_index].remove(key)
-            self._buckets[hash_index].insert(key, value)
+            keys, values = items, as_list(values)
+        keys, hashes = self._hash_many(keys)
+        self._presize(self._size + len(keys))
+        for key, value, hash, (buckets, index) in zip(keys, values, as_list(hashes), self._locate_many(hashes)):
+            self._put_at(buckets, index, key, value, hash)
+
+    def _hash_many(self, keys) -> tuple:
+        """This private method returns the given keys as a list, and the full hash of each as _hash would compute
+        it. If NumPy is installed, the keys are a NumPy array and the hash function has a vectorized version (such
+        as hash_function_int), every hash is computed in one vectorized call and returned as a NumPy array."""
+        return hash_many(self._hash_function, keys, mix=self._power_of_two)
+
+    def _presize(self, size: int) -> None:
+        """This private method grows the table, if needed, so that putting up to the given number of nodes causes
+        no further resize.
+
+        Args:
+            size (int): number of nodes the table must hold
+        """
+        new_capacity = self._capacity_for(size)
+        if new_capacity > self._capacity:
+            self._resize(new_capacity)
+
+    def _capacity_for(self, size: int) -> int:
+        """This private method returns the smallest valid capacity that holds the given number of nodes without
+        reaching the max load before the last one is put.
+
+        Args:
+            size (int): number of nodes the table must hold
+
+        Returns:
+            int: prime (or power of two) capacity for the map's load policy
+        """
+        return round_capacity(max(1, int((size - 1) / self._max_load) + 1), self._power_of_two)
 
     def resize_table(self, new_capacity: int) -> None:
         """This method changes the capacity of the underlying table. All existing key/value pairs must
@@ -120,33 +423,203 @@ class HashMap:
         Args:
             new_capacity (int): The new capacity of the overlaying dynamic array
         """
-        # Evaluate new capacity for validity, terminating if less than one, incrementing until prime if it is not.
+        # Evaluate new capacity for validity, terminating if less than one, incrementing until prime (or a power of
+        # two) if it is not.
         if new_capacity < 1:
             return
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = new_capacity
+        self._rehash(new_capacity)
 
-        # Initialize a new array to replace the previous and a linked list to temporarily hold the key/value pairs
-        new_array = DynamicArray()
-        for i in range(new_capacity):
-            new_array.append(LinkedList())
-        temp_linked_list = LinkedList()
+    def reserve(self, size: int) -> None:
+        """This method grows the table, if needed, to the capacity that holds the given number of nodes under
+        the map's load policy, so that putting up to that many nodes never rehashes. Like a capacity passed to
+        resize_table, the reserved capacity becomes the floor for automatic shrinking.
 
-        # Add all HashMap items to the temporary linked list
+        Args:
+            size (int): number of nodes to make room for
+        """
+        new_capacity = self._capacity_for(size)
+        if new_capacity > self._capacity:
+            self._min_capacity = new_capacity
+            self._rehash(new_capacity)
+
+    def migrate(self, bucket_count: int) -> bool:
+        """This method advances an in-progress incremental resize by moving the nodes of up to bucket_count old
+        buckets into the new bucket array, on top of the few that every operation moves. It lets a caller spread a
+        resize over its own idle time instead of over later operations.
+
+        Args:
+            bucket_count (int): maximum number of old buckets to migrate
+
+        Returns:
+            bool: True if the resize is still in progress afterwards, otherwise False
+        """
+        if self._old_buckets is not None:
+            self._migrate(bucket_count)
+        return self._old_buckets is not None
+
+    def _mixed_hash(self, key: str) -> int:
+        """This private method hashes a key in power-of-two mode, mixing the hash function's value so that the low
+        bits used as the bucket index depend on every bit of the hash."""
+        return mix_hash(self._hash_function(key))
+
+    def _rehash(self, new_capacity: int) -> None:
+        """This private method moves every node into a new bucket array of the given capacity.
+
+        Args:
+            new_capacity (int): capacity of the new bucket array, assumed valid
+        """
+        # Complete any incremental resize in progress so every node is in the current bucket array
+        self._finish_rehash()
+
+        # Initialize a new array of empty buckets to replace the previous
+        new_array = DynamicArray([None] * new_capacity)
+
+        # Move every node of the HashMap directly into its new bucket using the stored hash. Keys are known to be
+        # unique, so no duplicate checks are needed and no nodes are allocated.
         for index in range(self._capacity):
             bucket = self._buckets.get_at_index(index)
             if bucket is not None:
-                for item in bucket:
-                    temp_linked_list.insert(item.key, item.value)
+                for node in bucket:
+                    self._link(new_array, node.hash % new_capacity, node)
 
         # Set new data member values for the resized HashMap
-        self._size = 0
         self._capacity = new_capacity
+        self._modifications += 1
         self._buckets = new_array
 
-        # Add every item from the previous HashMap into the new one
-        for item in temp_linked_list:
-            self.put(item.key, item.value)
+    def _resize(self, new_capacity: int) -> None:
+        """This private method resizes the table, incrementally if the map was created with incremental_resize.
+
+        Args:
+            new_capacity (int): requested new capacity
+        """
+        if self._incremental_resize:
+            self._start_rehash(new_capacity)
+        else:
+            self._rehash(round_capacity(new_capacity, self._power_of_two))
+
+    def _shrink(self) -> None:
+        """This private method shrinks the table once its load falls below the shrink threshold, to a capacity at
+        which the load is max_load / growth_factor, but never below the capacity the map was created with or last
+        explicitly resized to."""
+        if self.table_load() >= self._shrink_load or self._old_buckets is not None:
+            return
+
+        new_capacity = max(self._min_capacity, int(self._size * self._growth_factor / self._max_load))
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+        if new_capacity < self._capacity:
+            self._resize(new_capacity)
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """This private method begins an incremental resize. The current bucket array becomes the old array and
+        a new, empty array of the next valid capacity is installed; nodes are moved over later by _migrate.
+
+        Args:
+            new_capacity (int): requested capacity of the new bucket array
+        """
+        self._finish_rehash()
+        new_capacity = round_capacity(new_capacity, self._power_of_two)
+
+        self._old_buckets, self._old_capacity, self._rehash_index = self._buckets, self._capacity, 0
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._modifications += 1
+
+    def _migrate(self, bucket_count: int) -> None:
+        """This private method moves the nodes of the next bucket_count old buckets into the new bucket array,
+        ending the incremental resize once every old bucket has been migrated. Each migrated bucket's list is
+        released as it is emptied, so the old array is freed a little at a time rather than all at once at the end.
+
+        Args:
+            bucket_count (int): maximum number of old buckets to migrate
+        """
+        end = min(self._rehash_index + bucket_count, self._old_capacity)
+        for index in range(self._rehash_index, end):
+            bucket = self._old_buckets[index]
+            if bucket is not None:
+                for node in bucket:
+                    self._link(self._buckets, node.hash % self._capacity, node)
+                self._old_buckets[index] = None
+        self._rehash_index = end
+
+        if end == self._old_capacity:
+            self._old_buckets, self._old_capacity, self._rehash_index = None, 0, 0
+
+    def _finish_rehash(self) -> None:
+        """This private method migrates every remaining old bucket of an in-progress incremental resize."""
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    @staticmethod
+    def _link(buckets: DynamicArray, index: int, node) -> None:
+        """This private method links an existing node in at the front of the given bucket, creating the bucket's
+        list if it is empty.
+
+        Args:
+            buckets (DynamicArray): bucket array holding the bucket
+            index (int): index of the bucket
+            node (SLNode): node to link in
+        """
+        bucket = buckets[index]
+        if bucket is None:
+            bucket = LinkedList()
+            buckets[index] = bucket
+        bucket.insert_node(node)
+
+    def _locate(self, hash: int) -> tuple[DynamicArray, int]:
+        """This private method returns the bucket array and index of the bucket that holds, or would hold, a key
+        with the given hash. During an incremental resize it first migrates a few old buckets; a key whose old
+        bucket has not been migrated yet still lives in (and is inserted into) that old bucket.
+
+        Args:
+            hash (int): full hash of the key
+
+        Returns:
+            tuple[DynamicArray, int]: the bucket array and the index of the key's bucket in it
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
+            if self._old_buckets is not None:
+                old_index = hash % self._old_capacity
+                if old_index >= self._rehash_index:
+                    return self._old_buckets, old_index
+        return self._buckets, hash % self._capacity
+
+    def _locate_many(self, hashes):
+        """This private method yields the bucket array and index of the bucket of each of the given hashes, as
+        _locate would. Outside an incremental resize, every index is computed in one pass, vectorized if the
+        hashes are a NumPy array; the table must not be resized while the locations are consumed.
+
+        Args:
+            hashes (list): full hashes of the keys, as returned by _hash_many
+
+        Yields:
+            tuple[DynamicArray, int]: the bucket array and the index of each key's bucket in it
+        """
+        if self._old_buckets is None:
+            buckets = self._buckets
+            for index in bucket_indices(hashes, self._capacity):
+                yield buckets, index
+        else:
+            for hash in as_list(hashes):
+                yield self._locate(hash)
+
+    def _bucket(self, hash: int) -> LinkedList | None:
+        """This private method returns the bucket that holds a key with the given hash, or None if the bucket is
+        empty. See _locate.
+
+        Args:
+            hash (int): full hash of the key
+
+        Returns:
+            LinkedList: the chain for the key, or None
+        """
+        buckets, index = self._locate(hash)
+        return buckets[index]
 
     def table_load(self) -> float:
         """This method returns the current hash table load factor.
@@ -162,12 +635,15 @@ class HashMap:
         Returns:
             int: number of empty buckets
         """
+        # Complete any incremental resize so only the current bucket array needs examining
+        self._finish_rehash()
+
         # Initialize a return value
         return_value = 0
 
         # Examine each bucket, determine if empty, increment return value if so, return the # of empty buckets
         for i in range(self._capacity):
-            if self._buckets[i].length() == 0:
+            if self._buckets[i] is None:
                 return_value += 1
         return return_value
 
@@ -181,10 +657,13 @@ class HashMap:
         Returns:
             object: value associated with the given key.
         """
-        # Find the hash index associated with the key, if a value occurs at that index return it
-        hash_index = self._hash_function(key) % self._capacity
-        if self._buckets[hash_index].contains(key):
-            return self._buckets[hash_index].contains(key).value
+        # Find the bucket associated with the key, if a matching node occurs in it return its value
+        hash = self._hash(key)
+        bucket = self._bucket(hash)
+        if bucket is not None:
+            node = bucket.contains(key, hash)
+            if node is not None:
+                return node.value
         return None
 
     def contains_key(self, key: str) -> bool:
@@ -197,11 +676,28 @@ class HashMap:
         Returns:
             bool: True if the given key is in the hash map, otherwise False.
         """
-        # Find the hash index associated with the key, determine if key occurs in the bucket, return bool accordingly
-        hash_index = self._hash_function(key) % self._capacity
-        if self._buckets[hash_index].contains(key):
-            return True
-        return False
+        # Find the bucket associated with the key, determine if key occurs in the bucket, return bool accordingly
+        hash = self._hash(key)
+        bucket = self._bucket(hash)
+        return bucket is not None and bucket.contains(key, hash) is not None
+
+    def get_many(self, keys) -> DynamicArray:
+        """This method returns the values associated with each key of the given iterable, as get would,
+        hashing every key in a single pass first.
+
+        Args:
+            keys (iterable): keys to be found from the hash map
+
+        Returns:
+            DynamicArray: the value associated with each key, in order, or None for keys not in the hash map
+        """
+        keys, hashes = self._hash_many(keys)
+        values = []
+        for key, hash, (buckets, index) in zip(keys, as_list(hashes), self._locate_many(hashes)):
+            bucket = buckets[index]
+            node = bucket.contains(key, hash) if bucket is not None else None
+            values.append(node.value if node is not None else None)
+        return DynamicArray(values)
 
     def remove(self, key: str) -> None:
         """This method removes the given key and its associated value from the hash map. If the key
@@ -210,11 +706,89 @@ class HashMap:
         Args:
             key (str): key to be removed from the hash map.
         """
-        # Locate the bucket associated with the key, remove the associated key/value pair, decrement size
-        hash_index = self._hash_function(key) % self._capacity
-        removal = self._buckets[hash_index].remove(key)
-        if removal:
+        if self._remove_hashed(key, self._hash(key)):
+            self._shrink()
+
+    def pop(self, key: str, default: object = None) -> object:
+        """This method removes the given key from the hash map and returns its associated value, with a single
+        hash and chain walk. If the key is not in the hash map, the default is returned.
+
+        Args:
+            key (str): key to be removed from the hash map
+            default (object): value to return if the key is not in the hash map
+
+        Returns:
+            object: the key's value, or default
+        """
+        node = self._pop_hashed(key, self._hash(key))
+        if node is None:
+            return default
+        self._shrink()
+        return node.value
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """This private method removes a key using an already computed hash of the key, without shrinking the
+        table afterwards.
+
+        Args:
+            key (str): key to be removed from the hash map
+            hash (int): full hash of the key, as returned by _hash
+
+        Returns:
+            bool: True if the key was in the hash map, otherwise False
+        """
+        return self._pop_hashed(key, hash) is not None
+
+    def _pop_hashed(self, key: str, hash: int) -> SLNode | None:
+        """This private method removes a key using an already computed hash of the key, without shrinking the
+        table afterwards, and returns its node.
+
+        Args:
+            key (str): key to be removed from the hash map
+            hash (int): full hash of the key, as returned by _hash
+
+        Returns:
+            SLNode: the removed node, or None if the key was not in the hash map
+        """
+        buckets, index = self._locate(hash)
+        return self._pop_at(buckets, index, key, hash)
+
+    def _pop_at(self, buckets: DynamicArray, index: int, key: str, hash: int) -> SLNode | None:
+        """This private method removes a key from the bucket at the given index of the given bucket array, which
+        must be the key's bucket as returned by _locate, without shrinking the table afterwards.
+
+        Args:
+            buckets (DynamicArray): bucket array holding the key's bucket
+            index (int): index of the key's bucket
+            key (str): key to be removed from the hash map
+            hash (int): full hash of the key, as returned by _hash
+
+        Returns:
+            SLNode: the removed node, or None if the key was not in the hash map
+        """
+        # Remove the associated key/value pair from the bucket, decrement size. A bucket left empty goes back to None.
+        bucket = buckets[index]
+        node = bucket.pop(key, hash) if bucket is not None else None
+        if node is not None:
+            if bucket.length() == 0:
+                buckets[index] = None
             self._size -= 1
+            self._modifications += 1
+        return node
+
+    def remove_many(self, keys) -> None:
+        """This method removes every key of the given iterable from the hash map, as remove would. Every key
+        is hashed in a single pass, and the table shrinks at most once, after all the removals.
+
+        Args:
+            keys (iterable): keys to be removed from the hash map
+        """
+        keys, hashes = self._hash_many(keys)
+        removed = False
+        for key, hash, (buckets, index) in zip(keys, as_list(hashes), self._locate_many(hashes)):
+            removed |= self._pop_at(buckets, index, key, hash) is not None
+        if removed:
+            self._shrink()
 
     def get_keys_and_values(self) -> DynamicArray:
         """This method returns a dynamic array where each index contains a tuple of a key/value pair
@@ -223,6 +797,9 @@ class HashMap:
         Returns:
             DynamicArray: dynamic array where each index contains a tuple of a key/value pair.
         """
+        # Complete any incremental resize so only the current bucket array needs examining
+        self._finish_rehash()
+
         # Initialize return array
         return_array = DynamicArray()
 
@@ -234,12 +811,115 @@ class HashMap:
                     return_array.append((item.key, item.value))
         return return_array
 
+    def __iter__(self) -> "HashMapIterator":
+        """This method returns a new iterator over the nodes of the hash map, which hold each key/value pair as
+        their key and value attributes. Iterations are independent of each other; see HashMapIterator."""
+        return HashMapIterator(self)
+
+    def keys(self):
+        """This method returns a lazy iterator over the keys of the hash map, which copies nothing. Like iterating
+        over the map itself, it raises RuntimeError if keys are added or removed before it is exhausted.
+
+        Returns:
+            iterator: the keys, in bucket order.
+        """
+        return (node.key for node in HashMapIterator(self))
+
+    def values(self):
+        """This method returns a lazy iterator over the values of the hash map; see keys.
+
+        Returns:
+            iterator: the values, in bucket order.
+        """
+        return (node.value for node in HashMapIterator(self))
+
+    def items(self):
+        """This method returns a lazy iterator over the key/value pairs of the hash map; see keys. Unlike
+        get_keys_and_values, no array of every pair is built.
+
+        Returns:
+            iterator: (key, value) tuples, in bucket order.
+        """
+        return ((node.key, node.value) for node in HashMapIterator(self))
+
     def clear(self) -> None:
         """This method clears the contents of the hash map."""
-        # Initialize a new empty Linked List at each bucket space in the array, reset size
+        # Abandon any incremental resize, empty each bucket space, reset size
+        self._old_buckets, self._old_capacity, self._rehash_index = None, 0, 0
         for index in range(self._capacity):
-            self._buckets.set_at_index(index, LinkedList())
+            self._buckets.set_at_index(index, None)
         self._size = 0
+        self._modifications += 1
+
+    def memory_usage(self) -> dict:
+        """This method reports the memory used by the hash map in bytes, as measured by sys.getsizeof: the bucket
+        arrays and their lists, the chain nodes, and the keys and values. Keys and values are measured shallowly,
+        and an object stored more than once is counted once.
+
+        Returns:
+            dict: bytes spent on 'buckets', 'nodes', 'keys' and 'values', and their 'total'.
+        """
+        usage = {'buckets': 0, 'nodes': 0, 'keys': 0, 'values': 0}
+        seen = set()
+
+        # Examine the current bucket array, and the old one during an incremental resize, whose migrated buckets
+        # have been emptied. Any object reachable from both is only counted once.
+        for buckets in (self._buckets, self._old_buckets):
+            if buckets is None:
+                continue
+            usage['buckets'] += sizeof_unique([buckets], seen)
+            for index in range(buckets.length()):
+                bucket = buckets[index]
+                if bucket is not None:
+                    usage['buckets'] += sizeof_unique([bucket], seen)
+                    nodes = [node for node in bucket if id(node) not in seen]
+                    usage['nodes'] += sizeof_unique(nodes, seen)
+                    usage['keys'] += sizeof_unique([node.key for node in nodes], seen)
+                    usage['values'] += sizeof_unique([node.value for node in nodes], seen)
+
+        usage['total'] = sum(usage.values())
+        return usage
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap, yielding the node of every key/value pair
+    Each iteration has its own iterator object. It raises RuntimeError if
+    keys are added to or removed from the map, or the map is rehashed, while
+    the iteration is in progress; updating values is allowed.
+    """
+
+    __slots__ = ('_map', '_modifications', '_index', '_nodes')
+
+    def __init__(self, hash_map: HashMap) -> None:
+        """Initialize an iterator at the first bucket of the given map."""
+        # Complete any incremental resize so only the current bucket array needs examining
+        hash_map._finish_rehash()
+        self._map = hash_map
+        self._modifications = hash_map._modifications
+        self._index = 0
+        self._nodes = None
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> SLNode:
+        """Obtain the next node, moving on to the next non-empty bucket once the current chain is exhausted."""
+        hash_map = self._map
+        if hash_map._modifications != self._modifications:
+            raise RuntimeError("HashMap changed during iteration")
+
+        node = next(self._nodes, None) if self._nodes is not None else None
+        while node is None:
+            if self._index >= hash_map._capacity:
+                raise StopIteration
+            bucket = hash_map._buckets[self._index]
+            self._index += 1
+            if bucket is not None:
+                self._nodes = iter(bucket)
+                node = next(self._nodes, None)
+        return node
 
 
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
@@ -253,36 +933,29 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     Returns:
         tuple[DynamicArray, int]: The mode and the frequency of its occurrence.
     """
-    # Initialize a map to add values to with associated frequency, a value to hold mode frequency, and the return array
-    map = HashMap(da.length())
+    # Initialize a map to add values to with associated frequency, sized so that even all-distinct values never
+    # force a resize, a value to hold mode frequency, and the list of mode values
+    map = HashMap()
+    map.reserve(da.length())
     freq = 0
-    return_array = DynamicArray()
+    modes = []
 
-    # Iterate through keys of input array, check if the key is present in the map
+    # Iterate through keys of input array, incrementing each key's count in place (a key not yet in the map is
+    # added with a count of 1)
     for i in range(da.length()):
-        value = map.get(da[i])
-
-        # If the key is present, increment its value and update
-        if value is not None:
-            value += 1
-            map.put(da[i], value)
+        key = da[i]
+        value = map.increment(key)
 
-        # If the key is not present, add the key to the map with a value of 1
-        else:
-            value = 1
-            map.put(da[i], value)
-
-        # If a new mode is found, reset the return array and add this key to it
+        # If a new mode is found, restart the list of modes with this key
         if value > freq:
             freq = value
-            return_array = DynamicArray()
-            return_array.append(da[i])
+            modes = [key]
 
-        # If a key's occurrence is equal to the current mode frequency, append it to the return array
+        # If a key's occurrence is equal to the current mode frequency, append it to the list of modes
         elif value == freq:
-            return_array.append(da[i])
+            modes.append(key)
 
-    return return_array, freq
+    return DynamicArray(modes), freq
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -485,3 +1158,15 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nupdating values during iteration")
+    print("--------------------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(11):
+        m.put('k' + str(i), i)
+    # The table is at its max load, but updating a value must not resize it under the iterator
+    print(m.get_capacity())
+    for key, value in m.items():
+        m.put(key, value * 10)
+        m.increment('k0')
+    print(m.get_capacity(), sorted(m.items()))
@@ -0,0 +1,315 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: This program is a sharded HashMap spread over worker processes, so that work on the map is not limited
+#              to the one core a single CPython process can use at a time. The keys are partitioned by hash across N
+#              shards; each shard is an ordinary Open Addressing (or Separate Chaining) HashMap living in its own
+#              worker process, which serves requests sent over a pipe. Single-key operations make one round trip to
+#              one worker. Batch operations (put_many, get_many, remove_many) split their keys by shard, send every
+#              shard its batch before waiting for any reply, and so run on all the workers in parallel; batches
+#              amortize the cost of the round trips and of pickling, which dominates single-key operations.
+#              Keys, values and the hash function are sent between processes by pickling, so they must be picklable
+#              (module-level hash functions are). The map must be closed to stop its workers, by calling close() or
+#              by using it as a context manager.
+
+import multiprocessing
+
+import hash_map_oa
+from a6_include import DynamicArray, hash_function_1, hash_function_builtin, mix_hash
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _serve(connection, map_class: type, capacity: int, function: callable, options: dict) -> None:
+    """This function runs in a worker process: it creates the shard's HashMap, then performs each request received
+    on the connection and sends back its result, until it receives None.
+
+    Args:
+        connection (Connection): the worker's end of the pipe
+        map_class (type): class of the shard's HashMap
+        capacity (int): initial capacity of the shard
+        function (callable): hash function of the shard
+        options (dict): other HashMap constructor options
+    """
+    hash_map = map_class(capacity, function, **options)
+    while (request := connection.recv()) is not None:
+        name, args = request
+        try:
+            # items returns a lazy iterator and get_many a DynamicArray; send both as lists
+            if name == 'items':
+                result = list(hash_map.items())
+            else:
+                result = getattr(hash_map, name)(*args)
+                if isinstance(result, DynamicArray):
+                    result = [result[i] for i in range(result.length())]
+        except Exception as exception:
+            connection.send((False, exception))
+        else:
+            connection.send((True, result))
+    connection.close()
+
+
+class HashMap:
+    def __init__(self, capacity: int, function: callable = hash_function_builtin, shards: int = None,
+                 map_class: type = hash_map_oa.HashMap, **options) -> None:
+        """
+        Initialize new sharded HashMap of the given number of shards (by
+        default, one per CPU), each a map_class HashMap (hash_map_oa.HashMap
+        by default, or hash_map_sc.HashMap) in its own worker process, created
+        with an equal share of the capacity, the hash function and any other
+        options, such as max_load or power_of_two
+        """
+        if shards is None:
+            shards = multiprocessing.cpu_count()
+        if shards < 1:
+            raise ValueError(f"shards must be at least 1, not {shards}")
+        self._shard_count = shards
+        self._connections = []
+        self._workers = []
+
+        shard_capacity = max(1, -(-capacity // shards))
+        for _ in range(shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, daemon=True,
+                                             args=(worker_connection, map_class, shard_capacity, function, options))
+            worker.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._workers.append(worker)
+
+    def __enter__(self) -> "HashMap":
+        """Return the map, for use as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Close the map at the end of a with block."""
+        self.close()
+
+    def close(self) -> None:
+        """This method stops the worker processes. The map cannot be used afterwards."""
+        for connection, worker in zip(self._connections, self._workers):
+            if worker.is_alive():
+                connection.send(None)
+            worker.join()
+            connection.close()
+        self._connections, self._workers = [], []
+
+    def _shard(self, key: str) -> int:
+        """This private method returns the index of the shard holding the given key. Keys are only routed by this
+        process, so the shard is chosen with the built-in hash, which str objects cache, rather than by hashing every
+        key twice with the map's hash function.
+
+        Args:
+            key (str): key to route
+
+        Returns:
+            int: index of the key's shard
+        """
+        return mix_hash(hash(key) & _MASK_64) % self._shard_count
+
+    def _call(self, shard: int, name: str, *args) -> object:
+        """This private method calls a method of one shard's HashMap and returns its result, raising any exception
+        the call raised.
+
+        Args:
+            shard (int): index of the shard
+            name (str): name of the HashMap method to call
+            *args: arguments of the call
+
+        Returns:
+            object: the result of the call
+        """
+        self._connections[shard].send((name, args))
+        return self._receive(shard)
+
+    def _receive(self, shard: int) -> object:
+        """This private method waits for the result of a request sent to one shard, raising any exception the
+        request raised."""
+        succeeded, result = self._connections[shard].recv()
+        if not succeeded:
+            raise result
+        return result
+
+    def _broadcast(self, name: str, arguments: list = None) -> list:
+        """This private method calls the same HashMap method on every shard, with each shard's own arguments, and
+        returns the results in shard order. Every request is sent before any result is awaited, so the shards
+        work in parallel. Shards whose arguments are None are skipped, and their result is None. Should any call
+        fail, the first exception is raised only once every shard's reply has been read, so that no reply is left
+        in a pipe to be mistaken for the result of a later request.
+
+        Args:
+            name (str): name of the HashMap method to call
+            arguments (list): tuple of arguments (or None) for each shard; by default, no arguments for all
+
+        Returns:
+            list: the result of the call on each shard
+        """
+        if arguments is None:
+            arguments = [()] * self._shard_count
+        for shard, args in enumerate(arguments):
+            if args is not None:
+                self._connections[shard].send((name, args))
+
+        # Read every reply before raising the first exception
+        results, error = [], None
+        for shard, args in enumerate(arguments):
+            result = None
+            if args is not None:
+                succeeded, result = self._connections[shard].recv()
+                if not succeeded:
+                    error = error or result
+                    result = None
+            results.append(result)
+        if error is not None:
+            raise error
+        return results
+
+    def get_size(self) -> int:
+        """This method returns the number of key/value pairs in the hash map."""
+        return sum(self._broadcast('get_size'))
+
+    def get_capacity(self) -> int:
+        """This method returns the total number of buckets of every shard."""
+        return sum(self._broadcast('get_capacity'))
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """This method updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value is replaced with the new value. Otherwise, a new key/value
+        pair is added.
+
+        Args:
+            key (str): key to be added or updated in the hash map
+            value (object): value to be stored in the hash map
+        """
+        self._call(self._shard(key), 'put', key, value)
+
+    def get(self, key: str) -> object:
+        """This method returns the value associated with the given key, or None if the key is not in the
+        hash map.
+
+        Args:
+            key (str): key of the value to be retrieved
+
+        Returns:
+            object: the value associated with the given key, or None
+        """
+        return self._call(self._shard(key), 'get', key)
+
+    def contains_key(self, key: str) -> bool:
+        """This method returns True if the given key is in the hash map, otherwise False.
+
+        Args:
+            key (str): key to be searched for
+
+        Returns:
+            bool: True if the key is present in the hash map, otherwise False
+        """
+        return self._call(self._shard(key), 'contains_key', key)
+
+    def remove(self, key: str) -> None:
+        """This method removes the given key and its associated value from the hash map. If the key is not
+        in the hash map, the method does nothing.
+
+        Args:
+            key (str): key to be removed from the hash map
+        """
+        self._call(self._shard(key), 'remove', key)
+
+    def increment(self, key: str, delta: object = 1) -> object:
+        """This method adds delta to the value associated with the given key, adding the key with delta as its
+        value if it is not in the hash map.
+
+        Args:
+            key (str): key whose value is to be incremented
+            delta (object): amount to add to the key's value
+
+        Returns:
+            object: the key's new value
+        """
+        return self._call(self._shard(key), 'increment', key, delta)
+
+    def put_many(self, items) -> None:
+        """This method puts every key/value pair of the given iterable into the hash map, as put would. The
+        pairs are split by shard, and every shard puts its batch in parallel.
+
+        Args:
+            items (iterable): (key, value) pairs to be added or updated in the hash map
+        """
+        groups = [[] for _ in range(self._shard_count)]
+        for key, value in items:
+            groups[self._shard(key)].append((key, value))
+        self._broadcast('put_many', [(group,) if group else None for group in groups])
+
+    def get_many(self, keys) -> DynamicArray:
+        """This method returns the values associated with each key of the given iterable, as get would. The
+        keys are split by shard, and every shard looks up its batch in parallel.
+
+        Args:
+            keys (iterable): keys of the values to be retrieved
+
+        Returns:
+            DynamicArray: the value associated with each key, in order, or None for keys not in the hash map
+        """
+        keys = list(keys)
+        groups = [[] for _ in range(self._shard_count)]
+        for position, key in enumerate(keys):
+            groups[self._shard(key)].append(position)
+        results = self._broadcast('get_many', [([keys[position] for position in positions],) if positions else None
+                                               for positions in groups])
+
+        # Put every value back at its key's position
+        values = [None] * len(keys)
+        for positions, found in zip(groups, results):
+            for position, value in zip(positions, found or ()):
+                values[position] = value
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """This method removes every key of the given iterable from the hash map, as remove would. The keys
+        are split by shard, and every shard removes its batch in parallel.
+
+        Args:
+            keys (iterable): keys to be removed from the hash map
+        """
+        groups = [[] for _ in range(self._shard_count)]
+        for key in keys:
+            groups[self._shard(key)].append(key)
+        self._broadcast('remove_many', [(group,) if group else None for group in groups])
+
+    def table_load(self) -> float:
+        """This method returns the load of the table: the number of key/value pairs over the total capacity."""
+        return self.get_size() / self.get_capacity()
+
+    def clear(self) -> None:
+        """This method clears every shard of the hash map."""
+        self._broadcast('clear')
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """This method returns a dynamic array where each index contains a tuple of a key/value pair stored in
+        the hash map, collected from every shard in parallel.
+
+        Returns:
+            DynamicArray: dynamic array where each index contains a tuple of a key/value pair
+        """
+        return_array = DynamicArray()
+        for pairs in self._broadcast('items'):
+            for pair in pairs:
+                return_array.append(pair)
+        return return_array
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nfailed batch, then get")
+    print("-----------------------")
+    with HashMap(11, hash_function_1, shards=4) as m:
+        m.put('5', 50)
+        try:
+            # hash_function_1 iterates over its key, so int keys fail in every shard they are sent to
+            m.put_many((i, i) for i in range(20))
+        except TypeError as exception:
+            print('put_many raised', type(exception).__name__)
+        print(m.get('5'), m.get_size())
@@ -0,0 +1,441 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap
+# Description: This program is an Open Addressing HashMap stored in a block of shared memory
+#              (multiprocessing.shared_memory), so that other processes can attach to it by name and read it directly,
+#              without sending any request to the process that owns it. Every bucket is a fixed-size record: the
+#              bucket's state (empty, live or tombstone), the full hash of its key, its value, the key's length and
+#              the key's UTF-8 bytes, padded to a fixed key size. Keys must therefore be strings of at most key_size
+#              bytes once encoded, and values are signed 64-bit integers. A header at the start of the block records
+#              the capacity, key size, size and tombstone count, so attached processes see the same table.
+#              The capacity is a power of two fixed when the table is created, and buckets are probed linearly. Keys
+#              are hashed with FNV-1a, which, unlike the built-in hash, gives every process the same hash. A removed
+#              key leaves a tombstone, which put reuses; once live entries and tombstones would pass the maximum load,
+#              the tombstones are cleared by rebuilding the table in place, and if live entries alone would pass it,
+#              put raises TableFullException.
+#              The table has a single writer: writes must not run concurrently with each other. Reads from other
+#              processes may run concurrently with writes. Every write, including a rebuild, makes a generation
+#              counter in the header odd while it runs and then even again, like a seqlock; a lookup that overlaps a
+#              write is retried, and items raises RuntimeError if the table is rebuilt or cleared while it iterates.
+
+import struct
+import sys
+from multiprocessing import shared_memory
+
+from a6_include import DynamicArray, hash_function_fnv1a, next_power_of_two
+
+# Bucket states, stored in the first byte of each record
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# Header: magic number, capacity, key size, size, tombstone count, generation and number of rebuilds
+_MAGIC = b'HMSHARE2'
+_HEADER = struct.Struct('<8sQQQQQQ')
+_SIZE_OFFSET = 24
+_TOMBSTONES_OFFSET = 32
+_GENERATION_OFFSET = 40
+_REBUILDS_OFFSET = 48
+_WORD = struct.Struct('<Q')
+
+# Leading fields of a record, read on every probe: state, key length and hash
+_PREFIX = struct.Struct('<BHQ')
+_VALUE = struct.Struct('<q')
+
+
+class TableFullException(Exception):
+    pass
+
+
+class HashMap:
+    def __init__(self, capacity: int, key_size: int = 32, max_load: float = 0.75, name: str = None) -> None:
+        """
+        Initialize new HashMap in a new block of shared memory, with room for
+        capacity buckets (rounded up to a power of two) of keys of at most
+        key_size bytes, filled to at most max_load. The block is given the
+        given name, or a generated one (see get_name).
+        Use HashMap.attach to open an existing table from another process.
+        """
+        if not 0 < max_load <= 1:
+            raise ValueError(f"max_load must be between 0 and 1, not {max_load}")
+        if not 0 < key_size <= 0xFFFF:
+            raise ValueError(f"key_size must be between 1 and 65535, not {key_size}")
+        capacity = next_power_of_two(capacity)
+
+        # A new block is zero-filled, so every bucket starts out empty
+        record_size = struct.calcsize(f'<BHQq{key_size}s')
+        memory = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size + capacity * record_size)
+        _HEADER.pack_into(memory.buf, 0, _MAGIC, capacity, key_size, 0, 0, 0, 0)
+        self._setup(memory, capacity, key_size, max_load, True)
+
+    @classmethod
+    def attach(cls, name: str, max_load: float = 0.75) -> "HashMap":
+        """This method opens an existing HashMap in the shared memory block of the given name, as created by another
+        HashMap, typically in another process. Closing the attached map does not destroy the table.
+
+        Args:
+            name (str): name of the shared memory block, as returned by get_name.
+            max_load (float): maximum load of puts made through the attached map.
+
+        Returns:
+            HashMap: a HashMap reading and writing the same table.
+        """
+        memory = cls._open(name)
+        magic, capacity, key_size, _, _, _, _ = _HEADER.unpack_from(memory.buf, 0)
+        if magic != _MAGIC:
+            memory.close()
+            raise ValueError(f"shared memory block {name!r} does not hold a HashMap")
+
+        hash_map = cls.__new__(cls)
+        hash_map._setup(memory, capacity, key_size, max_load, False)
+        return hash_map
+
+    def _setup(self, memory: shared_memory.SharedMemory, capacity: int, key_size: int, max_load: float,
+               owner: bool) -> None:
+        """This private method initializes the data members of a map over the given shared memory block.
+
+        Args:
+            memory (SharedMemory): block holding the header and the records
+            capacity (int): number of buckets, a power of two
+            key_size (int): maximum size of a key in bytes
+            max_load (float): maximum load of the table
+            owner (bool): whether this map created the block, and destroys it when closed
+        """
+        self._memory = memory
+        self._capacity = capacity
+        self._key_size = key_size
+        self._max_load = max_load
+        self._record = struct.Struct(f'<BHQq{key_size}s')
+        self._table_end = _HEADER.size + capacity * self._record.size
+        self._owner = owner
+
+    @staticmethod
+    def _open(name: str) -> shared_memory.SharedMemory:
+        """This private method attaches to an existing shared memory block. From Python 3.13, the block is not
+        tracked, so it is never destroyed when an attached process exits. Before 3.13, only processes started by
+        the creating process through multiprocessing share its resource tracker, so only they can attach safely;
+        the tracker of an unrelated process destroys the block when that process exits."""
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+        return shared_memory.SharedMemory(name=name)
+
+    def __enter__(self) -> "HashMap":
+        """Return the map, for use as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Close the map at the end of a with block, destroying the table if this map created it."""
+        self.close()
+
+    def close(self) -> None:
+        """This method detaches the map from its shared memory block. If this map created the block, the block is
+        destroyed too, and maps attached in other processes must not be used afterwards."""
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+            self._owner = False
+
+    def get_name(self) -> str:
+        """This method returns the name of the shared memory block, to be passed to HashMap.attach."""
+        return self._memory.name
+
+    def get_size(self) -> int:
+        """This method returns the number of key/value pairs in the hash map, as recorded in the shared header."""
+        return struct.unpack_from('<Q', self._memory.buf, _SIZE_OFFSET)[0]
+
+    def get_capacity(self) -> int:
+        """This method returns the number of buckets in the hash map."""
+        return self._capacity
+
+    def _tombstones(self) -> int:
+        """This private method returns the number of tombstones, as recorded in the shared header."""
+        return struct.unpack_from('<Q', self._memory.buf, _TOMBSTONES_OFFSET)[0]
+
+    def _set_counts(self, size: int, tombstones: int) -> None:
+        """This private method records the size and tombstone count in the shared header."""
+        struct.pack_into('<QQ', self._memory.buf, _SIZE_OFFSET, size, tombstones)
+
+    def _generation(self) -> int:
+        """This private method returns the generation counter, which is odd while a write is in progress."""
+        return _WORD.unpack_from(self._memory.buf, _GENERATION_OFFSET)[0]
+
+    def _stable_generation(self) -> int:
+        """This private method waits until no write is in progress and returns the generation counter."""
+        generation = self._generation()
+        while generation % 2:
+            generation = self._generation()
+        return generation
+
+    def _begin_write(self, rebuild: bool = False) -> None:
+        """This private method makes the generation counter odd before a write, counting a rebuild if the write
+        moves records, so that concurrent readers retry or stop instead of reading a table midway through it."""
+        buffer = self._memory.buf
+        if rebuild:
+            _WORD.pack_into(buffer, _REBUILDS_OFFSET, _WORD.unpack_from(buffer, _REBUILDS_OFFSET)[0] + 1)
+        _WORD.pack_into(buffer, _GENERATION_OFFSET, self._generation() + 1)
+
+    def _end_write(self) -> None:
+        """This private method makes the generation counter even again once a write is complete."""
+        _WORD.pack_into(self._memory.buf, _GENERATION_OFFSET, self._generation() + 1)
+
+    def _encode(self, key: str) -> bytes:
+        """This private method returns the UTF-8 bytes of a key, raising ValueError if they do not fit a record."""
+        data = key.encode()
+        if len(data) > self._key_size:
+            raise ValueError(f"key {key!r} is longer than {self._key_size} bytes")
+        return data
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, data: bytes, hash: int) -> tuple[int, int | None]:
+        """This private method probes for the record of the given key, reading only each bucket's state, key length
+        and hash until a candidate matches.
+
+        Args:
+            data (bytes): UTF-8 bytes of the key
+            hash (int): FNV-1a hash of the key
+
+        Returns:
+            tuple[int, int]: the offset of the key's live record, or of the empty bucket ending the probe if the key
+            is not in the hash map; and the offset of the first tombstone passed, or None
+        """
+        buffer, record_size, mask = self._memory.buf, self._record.size, self._capacity - 1
+        index = hash & mask
+        tombstone = None
+        for _ in range(self._capacity):
+            offset = _HEADER.size + index * record_size
+            state, length, bucket_hash = _PREFIX.unpack_from(buffer, offset)
+            if state == EMPTY:
+                return offset, tombstone
+            if state == TOMBSTONE:
+                if tombstone is None:
+                    tombstone = offset
+            elif bucket_hash == hash and length == len(data):
+                key_offset = offset + _PREFIX.size + _VALUE.size
+                if buffer[key_offset:key_offset + length] == data:
+                    return offset, tombstone
+            index = (index + 1) & mask
+        return None, tombstone
+
+    def _is_live(self, offset: int | None) -> bool:
+        """This private method returns True if the given offset is that of a live record."""
+        return offset is not None and self._memory.buf[offset] == LIVE
+
+    def put(self, key: str, value: int) -> None:
+        """This method updates the key/value pair in the hash map. If the given key already exists in
+        the hash map, its associated value is replaced with the new value. Otherwise, a new key/value
+        pair is added.
+
+        Args:
+            key (str): key to be added or updated, of at most key_size bytes in UTF-8.
+            value (int): signed 64-bit value to be stored.
+        """
+        data = self._encode(key)
+        hash = hash_function_fnv1a(data)
+        offset, tombstone = self._find(data, hash)
+
+        # If the key already exists, overwrite its value in place
+        if self._is_live(offset):
+            self._begin_write()
+            _VALUE.pack_into(self._memory.buf, offset + _PREFIX.size, value)
+            self._end_write()
+            return
+
+        # A new key needs room under the maximum load: clear tombstones, or fail if live entries fill the table
+        size, tombstones = self.get_size(), self._tombstones()
+        limit = self._max_load * self._capacity
+        if tombstone is None and size + tombstones + 1 > limit:
+            if size + 1 > limit:
+                raise TableFullException(f"HashMap is full: {size} entries in {self._capacity} buckets")
+            self._rebuild()
+            self.put(key, value)
+            return
+
+        # Fill the first tombstone passed, or else the empty bucket found. The state byte is written last, so a
+        # reader never sees a live record before its key and value are in place.
+        if tombstone is not None:
+            offset = tombstone
+            tombstones -= 1
+        self._begin_write()
+        self._record.pack_into(self._memory.buf, offset, EMPTY, len(data), hash, value, data)
+        self._memory.buf[offset] = LIVE
+        self._set_counts(size + 1, tombstones)
+        self._end_write()
+
+    def get(self, key: str, default: object = None) -> object:
+        """This method returns the value associated with the given key, or default if the key is not in the
+        hash map.
+
+        Args:
+            key (str): key of the value to be retrieved.
+            default (object): value to return if the key is not in the hash map.
+
+        Returns:
+            object: the value associated with the given key, or default.
+        """
+        data = key.encode()
+        if len(data) > self._key_size:
+            return default
+        hash = hash_function_fnv1a(data)
+
+        # Retry the lookup until no write overlapped it
+        while True:
+            generation = self._stable_generation()
+            offset, _ = self._find(data, hash)
+            value = default
+            if self._is_live(offset):
+                value = _VALUE.unpack_from(self._memory.buf, offset + _PREFIX.size)[0]
+            if self._generation() == generation:
+                return value
+
+    def contains_key(self, key: str) -> bool:
+        """This method returns True if the given key is in the hash map, otherwise False.
+
+        Args:
+            key (str): key to be searched for.
+
+        Returns:
+            bool: True if the key is present in the hash map, otherwise False.
+        """
+        data = key.encode()
+        if len(data) > self._key_size:
+            return False
+        hash = hash_function_fnv1a(data)
+
+        # Retry the lookup until no write overlapped it
+        while True:
+            generation = self._stable_generation()
+            found = self._is_live(self._find(data, hash)[0])
+            if self._generation() == generation:
+                return found
+
+    def remove(self, key: str) -> None:
+        """This method removes the given key and its associated value from the hash map, leaving a tombstone.
+        If the key is not in the hash map, the method does nothing.
+
+        Args:
+            key (str): key to be removed.
+        """
+        data = key.encode()
+        if len(data) > self._key_size:
+            return
+        offset, _ = self._find(data, hash_function_fnv1a(data))
+        if self._is_live(offset):
+            self._begin_write()
+            self._memory.buf[offset] = TOMBSTONE
+            self._set_counts(self.get_size() - 1, self._tombstones() + 1)
+            self._end_write()
+
+    def _rebuild(self) -> None:
+        """This private method clears every tombstone by emptying the table and putting its live records back, in
+        place. The generation counter stays odd until the table is complete again, so readers in other processes
+        wait for the rebuild instead of seeing an empty or partly rebuilt table."""
+        records = [record for record in self._records() if record[0] == LIVE]
+        self._begin_write(rebuild=True)
+        self._memory.buf[_HEADER.size:self._table_end] = bytes(self._table_end - _HEADER.size)
+        self._set_counts(0, 0)
+
+        # Each record keeps its stored hash, so no key is hashed again
+        buffer, record_size, mask = self._memory.buf, self._record.size, self._capacity - 1
+        for state, length, hash, value, data in records:
+            index = hash & mask
+            while buffer[_HEADER.size + index * record_size] != EMPTY:
+                index = (index + 1) & mask
+            self._record.pack_into(buffer, _HEADER.size + index * record_size, LIVE, length, hash, value, data)
+        self._set_counts(len(records), 0)
+        self._end_write()
+
+    def _records(self):
+        """This private generator yields every bucket's record as a (state, key length, hash, value, key bytes)
+        tuple."""
+        buffer, record = self._memory.buf, self._record
+        for index in range(self._capacity):
+            yield record.unpack_from(buffer, _HEADER.size + index * record.size)
+
+    def table_load(self) -> float:
+        """This method returns the load of the table: the number of key/value pairs over the capacity."""
+        return self.get_size() / self._capacity
+
+    def empty_buckets(self) -> int:
+        """This method returns the number of empty buckets in the hash table."""
+        # Tombstoned buckets are not empty; they still lengthen probe sequences
+        return self._capacity - self.get_size() - self._tombstones()
+
+    def items(self):
+        """This method returns a lazy iterator over the key/value pairs of the hash map, in bucket order. Each
+        record is read while no write is in progress; the iterator raises RuntimeError if the table is rebuilt or
+        cleared during the iteration.
+
+        Returns:
+            iterator: (key, value) tuples.
+        """
+        return self._items()
+
+    def _items(self):
+        """This private generator yields the key/value pair of every live record, for items."""
+        buffer, record = self._memory.buf, self._record
+        rebuilds = _WORD.unpack_from(buffer, _REBUILDS_OFFSET)[0]
+        for index in range(self._capacity):
+            # Retry the read until no write overlapped it
+            while True:
+                generation = self._stable_generation()
+                if _WORD.unpack_from(buffer, _REBUILDS_OFFSET)[0] != rebuilds:
+                    raise RuntimeError("HashMap rebuilt during iteration")
+                state, length, hash, value, data = record.unpack_from(buffer, _HEADER.size + index * record.size)
+                if self._generation() == generation:
+                    break
+            if state == LIVE:
+                yield data[:length].decode(), value
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """This method returns a dynamic array where each index contains a tuple of a key/value pair stored in
+        the hash map.
+
+        Returns:
+            DynamicArray: dynamic array where each index contains a tuple of a key/value pair.
+        """
+        return_array = DynamicArray()
+        for pair in self.items():
+            return_array.append(pair)
+        return return_array
+
+    def clear(self) -> None:
+        """This method clears the contents of the hash map without changing its capacity."""
+        self._begin_write(rebuild=True)
+        self._memory.buf[_HEADER.size:self._table_end] = bytes(self._table_end - _HEADER.size)
+        self._set_counts(0, 0)
+        self._end_write()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nempty buckets after removals")
+    print("-----------------------------")
+    with HashMap(64) as m:
+        for i in range(20):
+            m.put('key' + str(i), i)
+        print(m.empty_buckets(), m.get_size(), m.get_capacity())
+        for i in range(0, 20, 2):
+            m.remove('key' + str(i))
+        # The 10 tombstones are not empty buckets
+        print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+    print("\nreaders during a rebuild")
+    print("------------------------")
+    with HashMap(16) as m, HashMap.attach(m.get_name()) as reader:
+        for i in range(12):
+            m.put('key' + str(i), i)
+        for i in range(6):
+            m.remove('key' + str(i))
+        pairs = reader.items()
+        print(next(pairs))
+        # Filling the tombstoned buckets rebuilds the table in place: the attached reader's iteration stops, and
+        # its lookups see the rebuilt table
+        for i in range(12, 18):
+            m.put('key' + str(i), i)
+        try:
+            next(pairs)
+        except RuntimeError as exception:
+            print(exception)
+        print(reader.get('key7'), reader.get('key17'), reader.contains_key('key0'), reader.get_size())